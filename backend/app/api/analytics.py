@@ -1,54 +1,15 @@
  
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from app.db.database import get_db
-from app.services.auth_service import AuthService
+from app.api.deps import get_current_user
 from app.services.db_service import DatabaseService
-from fastapi import Header
 
 router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"])
 
-def get_current_user(authorization: str = Header(None), db: Session = Depends(get_db)):
-    """
-    Dependency to get current user from token
-    """
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated"
-        )
-    
-    # Extract token from "Bearer <token>"
-    try:
-        scheme, token = authorization.split()
-        if scheme.lower() != "bearer":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication scheme"
-            )
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token format"
-        )
-    
-    # Decode token to get username
-    username = AuthService.decode_token(token)
-    if not username:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    # Get user from database
-    user = DatabaseService.get_user_by_username(db, username)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    return user
+# Payloads here are plain dicts built from query rows, so they are returned
+# as ORJSONResponse and skip FastAPI's jsonable_encoder pass
 
 @router.get("/user")
 def get_user_analytics(
@@ -59,22 +20,8 @@ def get_user_analytics(
     Get user's personal analytics
     """
     try:
-        analytics = DatabaseService.get_user_analytics(db, current_user.id)
-        
-        # Add search history
-        search_history = DatabaseService.get_user_search_history(db, current_user.id)
-        
-        analytics["search_history"] = [
-            {
-                "keywords": sh.keywords,
-                "industry": sh.industry,
-                "num_ideas": sh.num_ideas,
-                "created_at": sh.created_at
-            }
-            for sh in search_history[:10]  # Last 10 searches
-        ]
-        
-        return analytics
+        # Counts and the last 10 searches in a single query
+        return ORJSONResponse(DatabaseService.get_user_analytics(db, current_user.id, history_limit=10))
     
     except Exception as e:
         raise HTTPException(
@@ -92,7 +39,7 @@ def get_platform_analytics(
     """
     try:
         analytics = DatabaseService.get_platform_analytics(db)
-        return analytics
+        return ORJSONResponse(analytics)
     
     except Exception as e:
         raise HTTPException(
@@ -119,7 +66,7 @@ def get_user_industry_stats(
             Idea.user_id == current_user.id
         ).group_by(Idea.industry).all()
         
-        return {
+        return ORJSONResponse({
             "industries": [
                 {
                     "industry": industry,
@@ -127,7 +74,7 @@ def get_user_industry_stats(
                 }
                 for industry, count in industry_stats
             ]
-        }
+        })
     
     except Exception as e:
         raise HTTPException(
@@ -146,23 +93,21 @@ def get_user_favorite_ideas(
     try:
         from app.models.models import Idea
         
-        favorite_ideas = db.query(Idea).filter(
+        # Only the listed columns, no ORM objects
+        favorite_ideas = db.query(
+            Idea.id,
+            Idea.title,
+            Idea.industry,
+            Idea.created_at
+        ).filter(
             Idea.user_id == current_user.id,
             Idea.is_favorite == True
         ).all()
         
-        return {
+        return ORJSONResponse({
             "favorite_count": len(favorite_ideas),
-            "favorites": [
-                {
-                    "id": idea.id,
-                    "title": idea.title,
-                    "industry": idea.industry,
-                    "created_at": idea.created_at
-                }
-                for idea in favorite_ideas
-            ]
-        }
+            "favorites": [dict(idea._mapping) for idea in favorite_ideas]
+        })
     
     except Exception as e:
         raise HTTPException(
@@ -202,7 +147,7 @@ def get_user_search_trends(
             func.count(SearchHistory.id).desc()
         ).limit(5).all()
         
-        return {
+        return ORJSONResponse({
             "popular_keywords": [
                 {"keyword": kw, "count": count}
                 for kw, count in keyword_trends
@@ -211,7 +156,7 @@ def get_user_search_trends(
                 {"industry": ind, "count": count}
                 for ind, count in industry_trends
             ]
-        }
+        })
     
     except Exception as e:
         raise HTTPException(
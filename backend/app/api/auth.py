@@ -1,43 +1,75 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from app.db.database import get_db
+from app.api.deps import get_current_user
 from app.schemas.schemas import UserCreate, User, Token
-from app.services.auth_service import AuthService
+from app.services.auth_service import AuthService, PasswordHasherBusy
 from app.services.db_service import DatabaseService
 from app.core.config import settings
 
 router = APIRouter(prefix="/api/v1/auth", tags=["auth"])
 
+def password_hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, please retry",
+        headers={"Retry-After": "1"}
+    )
+
+# bcrypt runs in the password process pool (see PasswordHasher), so these
+# handlers are async and only touch the DB through the threadpool. The
+# session's connection is released before waiting on the pool so a login
+# burst cannot exhaust the DB connection pool for other endpoints.
+
 @router.post("/register", response_model=User)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    existing_user = DatabaseService.get_user_by_username(db, user_data.username)
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+    existing_user = await run_in_threadpool(DatabaseService.get_user_by_username, db, user_data.username)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
+    db.close()
+    
+    try:
+        hashed_password = await AuthService.hash_password_async(user_data.password)
+    except PasswordHasherBusy:
+        raise password_hasher_busy()
     
-    user = DatabaseService.create_user(db, user_data)
+    user = await run_in_threadpool(DatabaseService.create_user, db, user_data, hashed_password)
     return user
 
 @router.post("/login", response_model=Token)
-def login(username: str = None, password: str = None, db: Session = Depends(get_db)):
+async def login(username: str = None, password: str = None, db: Session = Depends(get_db)):
     if not username or not password:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username and password required"
         )
     
-    user = DatabaseService.get_user_by_username(db, username)
+    user = await run_in_threadpool(DatabaseService.get_user_by_username, db, username)
+    db.close()
     
-    if not user or not AuthService.verify_password(password, user.hashed_password):
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await AuthService.verify_and_update_async(password, user.hashed_password)
+        except PasswordHasherBusy:
+            raise password_hasher_busy()
+    
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
             headers={"WWW-Authenticate": "Bearer"}
         )
     
+    # Work factor changed since this hash was made: store the rehash
+    if new_hash:
+        await run_in_threadpool(DatabaseService.update_password_hash, db, user.id, new_hash)
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = AuthService.create_access_token(
         data={"sub": user.username},
@@ -56,4 +88,17 @@ def verify_token(token: str):
             detail="Invalid token"
         )
     
-    return {"valid": True, "username": username}
\ No newline at end of file
+    return {"valid": True, "username": username}
+
+@router.post("/deactivate")
+def deactivate_account(
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Deactivate the current user's account. Its tokens stop working at once
+    on the server worker handling this request; see get_current_user for
+    the others.
+    """
+    DatabaseService.deactivate_user(db, current_user.id)
+    return {"message": "Account deactivated"}
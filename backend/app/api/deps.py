@@ -0,0 +1,67 @@
+from fastapi import Depends, Header, HTTPException, status
+from sqlalchemy.orm import Session
+from app.db.database import get_db
+from app.schemas.schemas import User
+from app.services.auth_service import AuthService, user_cache
+from app.services.db_service import DatabaseService
+
+def get_current_user(authorization: str = Header(None), db: Session = Depends(get_db)) -> User:
+    """
+    Dependency to get current user from token
+
+    Resolved users are kept in an in-process cache keyed by username, so
+    repeated requests with a valid token skip the database entirely. The
+    session is only connected on a cache miss.
+
+    The cache is per process. A deactivation invalidates it only in the
+    worker that made it: with several server workers, the others keep
+    accepting the user's tokens for up to AUTH_USER_CACHE_TTL_SECONDS.
+    """
+    if not authorization:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated"
+        )
+
+    # Extract token from "Bearer <token>"
+    try:
+        scheme, token = authorization.split()
+        if scheme.lower() != "bearer":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication scheme"
+            )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token format"
+        )
+
+    # Decode token to get username
+    username = AuthService.decode_token(token)
+    if not username:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token"
+        )
+
+    user = user_cache.get(username)
+    if user is None:
+        # Get user from database
+        db_user = DatabaseService.get_user_by_username(db, username)
+        if not db_user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+
+        user = User.model_validate(db_user)
+        user_cache.set(username, user)
+
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
+        )
+
+    return user
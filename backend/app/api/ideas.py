@@ -1,114 +1,282 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+import logging
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from starlette.background import BackgroundTask
+from typing import List, Optional
 from app.db.database import get_db
-from app.schemas.schemas import Idea, IdeaCreate, GenerationRequest
-from app.services.auth_service import AuthService
+from app.api.deps import get_current_user
+from app.core.pagination import decode_cursor, encode_cursor
+from app.schemas.schemas import (
+    BulkFavoriteRequest, BulkIdeaIds, BulkResult, BulkUpdateRequest,
+    Idea, IdeaCreate, IdeaPage, IdeaSearchPage, IdeaUpdate, GenerationRequest
+)
+from app.services.admission import GenerationAdmission, GenerationRejected
 from app.services.ai_service import AIService
 from app.services.db_service import DatabaseService
-from fastapi import Header
+from app.services.search_history_buffer import SearchHistoryBuffer
+from app.services.search_service import SearchService
+from fastapi.concurrency import run_in_threadpool
 
 router = APIRouter(prefix="/api/v1/ideas", tags=["ideas"])
 
-def get_current_user(authorization: str = Header(None), db: Session = Depends(get_db)):
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated"
-        )
-    
-    try:
-        scheme, token = authorization.split()
-        if scheme.lower() != "bearer":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication scheme"
-            )
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token format"
-        )
-    
-    username = AuthService.decode_token(token)
-    if not username:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    user = DatabaseService.get_user_by_username(db, username)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
+logger = logging.getLogger(__name__)
+
+def build_idea_create(request: GenerationRequest, idea_data: dict) -> IdeaCreate:
+    return IdeaCreate(
+        title=idea_data.get("title", "Untitled"),
+        description=idea_data.get("description", ""),
+        business_model=idea_data.get("business_model", ""),
+        target_audience=idea_data.get("target_audience", ""),
+        swot_analysis=idea_data.get("swot_analysis", ""),
+        market_potential=idea_data.get("market_potential", ""),
+        industry=request.industry,
+        keywords=request.keywords
+    )
+
+def generation_rejected(e: GenerationRejected) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=e.detail,
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+def save_generated_ideas(db: Session, user_id: int, request: GenerationRequest, generated_ideas: list) -> list:
+    ideas_data = [
+        build_idea_create(request, idea_data)
+        for idea_data in generated_ideas
+        if "error" not in idea_data
+    ]
     
-    return user
+    return DatabaseService.create_ideas_bulk(db, user_id, ideas_data)
 
 @router.post("/generate", response_model=List[Idea])
-def generate_ideas(
+async def generate_ideas(
     request: GenerationRequest,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
-        print("\n[GENERATE] Starting idea generation")
-        print(f"[GENERATE] User: {current_user.username}")
-        print(f"[GENERATE] Keywords: {request.keywords}")
-        print(f"[GENERATE] Industry: {request.industry}")
-        
-        ai_service = AIService()
-        generated_ideas = ai_service.generate_business_ideas(
-            keywords=request.keywords,
-            industry=request.industry,
-            num_ideas=request.num_ideas
+        logger.info(
+            "Starting idea generation",
+            extra={"user_id": current_user.id, "keywords": request.keywords, "industry": request.industry}
         )
         
-        saved_ideas = []
-        for idea_data in generated_ideas:
-            if "error" not in idea_data:
-                idea_create = IdeaCreate(
-                    title=idea_data.get("title", "Untitled"),
-                    description=idea_data.get("description", ""),
-                    business_model=idea_data.get("business_model", ""),
-                    target_audience=idea_data.get("target_audience", ""),
-                    swot_analysis=idea_data.get("swot_analysis", ""),
-                    market_potential=idea_data.get("market_potential", ""),
-                    industry=request.industry,
-                    keywords=request.keywords
-                )
-                
-                saved_idea = DatabaseService.create_idea(db, current_user.id, idea_create)
-                saved_ideas.append(saved_idea)
+        # Generation is awaited on the event loop; the blocking DB writes
+        # are pushed to the threadpool so they don't stall other requests.
+        # The DB connection checked out for authentication is released
+        # first so slow generations don't pin the connection pool. This is
+        # done inline: queueing it behind threadpool workers that are
+        # themselves waiting for a connection would deadlock the pool.
+        db.close()
         
-        DatabaseService.create_search_history(
-            db,
-            current_user.id,
-            request.keywords,
-            request.industry,
-            request.num_ideas
-        )
+        # Per-user rate limit and global concurrency cap (may wait in queue)
+        ticket = await GenerationAdmission.acquire(current_user.id, request.num_ideas)
+        try:
+            ai_service = AIService()
+            generated_ideas = await ai_service.generate_business_ideas_cached(
+                keywords=request.keywords,
+                industry=request.industry,
+                num_ideas=request.num_ideas
+            )
+            
+            saved_ideas = await run_in_threadpool(
+                save_generated_ideas, db, current_user.id, request, generated_ideas
+            )
+        finally:
+            ticket.release()
+        
+        # Analytics only: written behind the request by the history buffer
+        SearchHistoryBuffer.record(current_user.id, request.keywords, request.industry, request.num_ideas)
         
-        print(f"[GENERATE] SUCCESS! Generated {len(saved_ideas)} ideas\n")
+        logger.info("Saved generated ideas", extra={"user_id": current_user.id, "saved": len(saved_ideas)})
         return saved_ideas
     
+    except GenerationRejected as e:
+        raise generation_rejected(e)
+    
     except Exception as e:
-        print(f"\n[GENERATE] ERROR: {str(e)}\n")
+        logger.exception("Idea generation failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error generating ideas: {str(e)}"
         )
 
-@router.get("/", response_model=List[Idea])
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def save_streamed_idea(db: Session, user_id: int, request: GenerationRequest, idea_data: dict) -> dict:
+    saved = DatabaseService.create_ideas_bulk(db, user_id, [build_idea_create(request, idea_data)])
+    return Idea.model_validate(saved[0]).model_dump(mode="json")
+
+@router.post("/generate/stream")
+async def generate_ideas_stream(
+    request: GenerationRequest,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Generate ideas as Server-Sent Events: an ``idea`` event per idea as soon
+    as it is generated and saved (``error`` for failed ones), then a
+    ``summary`` event. Disconnecting cancels the remaining generations.
+    """
+    # Same reasoning as /generate: don't hold a pooled connection while
+    # waiting on the provider
+    db.close()
+    user_id = current_user.id
+    
+    # Admitted before the response starts so rejections are still a 429
+    try:
+        ticket = await GenerationAdmission.acquire(user_id, request.num_ideas)
+    except GenerationRejected as e:
+        raise generation_rejected(e)
+    
+    async def events():
+        started = time.perf_counter()
+        saved_ids = []
+        failed = 0
+        ideas = AIService().stream_business_ideas(request.keywords, request.industry, request.num_ideas)
+        try:
+            async for index, idea_data in ideas:
+                if "error" in idea_data:
+                    failed += 1
+                    yield sse_event("error", {"index": index, "detail": idea_data["error"]})
+                    continue
+                
+                idea = await run_in_threadpool(save_streamed_idea, db, user_id, request, idea_data)
+                saved_ids.append(idea["id"])
+                yield sse_event("idea", {"index": index, "idea": idea})
+            
+            SearchHistoryBuffer.record(user_id, request.keywords, request.industry, request.num_ideas)
+            yield sse_event("summary", {
+                "requested": request.num_ideas,
+                "saved": len(saved_ids),
+                "failed": failed,
+                "idea_ids": saved_ids,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+            })
+        except Exception as e:
+            logger.exception("Streaming idea generation failed")
+            yield sse_event("error", {"detail": f"Error generating ideas: {str(e)}"})
+        finally:
+            # Cancels outstanding generations if the client disconnected
+            await ideas.aclose()
+            ticket.release()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also releases the slot if the stream never started
+        background=BackgroundTask(ticket.release)
+    )
+
+@router.get("/", response_model=IdeaPage)
 def get_user_ideas(
-    skip: int = 0,
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    List the user's ideas, newest first. Pass ``next_cursor`` from the
+    previous response as ``cursor`` to get the next page.
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    # One extra row tells us whether there is a next page
+    ideas = DatabaseService.get_user_idea_rows(db, current_user.id, limit + 1, after)
+    
+    next_cursor = None
+    if len(ideas) > limit:
+        ideas = ideas[:limit]
+        next_cursor = encode_cursor(ideas[-1]["created_at"], ideas[-1]["id"])
+    
+    # Rows come straight from the database in the IdeaPage shape, so they
+    # are serialized directly instead of being re-validated per row
+    return ORJSONResponse({"items": ideas, "next_cursor": next_cursor})
+
+# Declared before /{idea_id} so "search" is not parsed as an idea id
+@router.get("/search", response_model=IdeaSearchPage)
+def search_ideas(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search over the user's ideas (title, description, business
+    model, SWOT analysis and keywords), best matches first
+    """
+    ideas = SearchService.search_ideas(db, current_user.id, q, skip, limit + 1)
+    
+    next_skip = None
+    if len(ideas) > limit:
+        ideas = ideas[:limit]
+        next_skip = skip + limit
+    
+    return {"items": ideas, "next_skip": next_skip}
+
+def bulk_result(idea_ids: List[int], succeeded: List[int], outcome: str) -> ORJSONResponse:
+    """Per-id outcomes in request order: ``outcome`` or ``"not_found"``"""
+    done = set(succeeded)
+    results = [
+        {"id": idea_id, "status": outcome if idea_id in done else "not_found"}
+        for idea_id in dict.fromkeys(idea_ids)
+    ]
+    return ORJSONResponse({
+        "succeeded": len(done),
+        "not_found": len(results) - len(done),
+        "results": results
+    })
+
+@router.post("/bulk-delete", response_model=BulkResult)
+def bulk_delete_ideas(
+    request: BulkIdeaIds,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete up to BULK_MAX_IDS ideas; ids that aren't the user's are reported as not_found"""
+    deleted = DatabaseService.bulk_delete_ideas(db, current_user.id, request.idea_ids)
+    return bulk_result(request.idea_ids, deleted, "deleted")
+
+@router.post("/bulk-favorite", response_model=BulkResult)
+def bulk_favorite_ideas(
+    request: BulkFavoriteRequest,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Mark (or with ``is_favorite: false`` unmark) ideas as favorites"""
+    updated = DatabaseService.bulk_set_favorite(db, current_user.id, request.idea_ids, request.is_favorite)
+    return bulk_result(request.idea_ids, updated, "updated")
+
+@router.post("/bulk-update", response_model=BulkResult)
+def bulk_update_ideas(
+    request: BulkUpdateRequest,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    ideas = DatabaseService.get_user_ideas(db, current_user.id, skip, limit)
-    return ideas
+    """Apply the same field changes to many ideas"""
+    changes = request.changes.model_dump(exclude_none=True)
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update"
+        )
+    
+    updated = DatabaseService.bulk_update_ideas(db, current_user.id, request.idea_ids, changes)
+    return bulk_result(request.idea_ids, updated, "updated")
 
 @router.get("/{idea_id}", response_model=Idea)
 def get_idea(
@@ -129,11 +297,11 @@ def get_idea(
 @router.put("/{idea_id}", response_model=Idea)
 def update_idea(
     idea_id: int,
-    update_data: dict,
+    update_data: IdeaUpdate,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    idea = DatabaseService.update_idea(db, idea_id, current_user.id, update_data)
+    idea = DatabaseService.update_idea(db, idea_id, current_user.id, update_data.model_dump(exclude_none=True))
     
     if not idea:
         raise HTTPException(
@@ -173,4 +341,4 @@ def toggle_favorite(
             detail="Idea not found"
         )
     
-    return {"idea": idea, "is_favorite": idea.is_favorite}
\ No newline at end of file
+    return {"idea": idea, "is_favorite": idea["is_favorite"]}
\ No newline at end of file
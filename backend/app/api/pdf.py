@@ -1,158 +1,230 @@
- 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+from typing import List
 from app.db.database import get_db
-from app.services.auth_service import AuthService
-from app.services.pdf_service import PDFService
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.schemas.schemas import PDFJobRequest
+from app.services.pdf_jobs import PDFJob, PDFJobManager, PDFJobRejected
 from app.services.db_service import DatabaseService
-from fastapi import Header
-import io
 
 router = APIRouter(prefix="/api/v1/pdf", tags=["pdf"])
 
-def get_current_user(authorization: str = Header(None), db: Session = Depends(get_db)):
-    """
-    Dependency to get current user from token
-    """
-    if not authorization:
+# Size of the pieces streamed to the client
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Rendering happens in the PDF process pool (see PDFJobManager). The
+# export endpoints are async and wait for their job without holding a
+# worker thread or the GIL while ReportLab runs.
+
+def pdf_service():
+    """PDFService, imported on first use so ReportLab isn't loaded at startup"""
+    from app.services.pdf_service import PDFService
+    return PDFService
+
+def pdf_attachment_headers(filename: str) -> dict:
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+def check_template(template: str):
+    if template not in pdf_service().template_names():
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown template '{template}'"
         )
-    
-    # Extract token from "Bearer <token>"
+
+def submit_job(user_id: int, idea_ids: List[int], template: str, filename: str) -> PDFJob:
     try:
-        scheme, token = authorization.split()
-        if scheme.lower() != "bearer":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication scheme"
-            )
-    except ValueError:
+        return PDFJobManager.submit(user_id, idea_ids, template, filename)
+    except PDFJobRejected as e:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token format"
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)}
         )
-    
-    # Decode token to get username
-    username = AuthService.decode_token(token)
-    if not username:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    # Get user from database
-    user = DatabaseService.get_user_by_username(db, username)
-    if not user:
+
+def check_job_succeeded(job: PDFJob, discard: bool = False):
+    """
+    Raise a 500 for a failed job. Queued jobs keep their failure for later
+    polls until the TTL sweep; inline exports pass ``discard`` since their
+    job id is never handed out.
+    """
+    if job.status == "failed":
+        if discard:
+            PDFJobManager.discard(job.id)
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error generating PDF: {job.error}"
         )
-    
-    return user
+
+def stream_file(path: str):
+    with open(path, "rb") as output:
+        while True:
+            data = output.read(STREAM_CHUNK_BYTES)
+            if not data:
+                break
+            yield data
+
+@router.get("/templates")
+def list_pdf_templates(current_user = Depends(get_current_user)):
+    """
+    List the registered PDF templates
+    """
+    return {"templates": pdf_service().template_names()}
 
 @router.get("/export/{idea_id}")
-def export_idea_to_pdf(
+async def export_idea_to_pdf(
     idea_id: int,
+    template: str = settings.PDF_DEFAULT_TEMPLATE,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Export a business idea to PDF
     """
+    check_template(template)
+
     # Get idea from database
-    idea = DatabaseService.get_idea_by_id(db, idea_id, current_user.id)
-    
+    idea = await run_in_threadpool(DatabaseService.get_idea_by_id, db, idea_id, current_user.id)
+    db.close()
+
     if not idea:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Idea not found"
         )
-    
-    try:
-        # Prepare idea data
-        idea_data = {
-            "title": idea.title,
-            "description": idea.description,
-            "business_model": idea.business_model,
-            "target_audience": idea.target_audience,
-            "swot_analysis": idea.swot_analysis,
-            "market_potential": idea.market_potential,
-            "industry": idea.industry,
-            "keywords": idea.keywords
-        }
-        
-        # Generate PDF
-        pdf_bytes = PDFService.generate_business_plan_pdf(idea_data)
-        
-        # Create filename
-        filename = f"business_plan_{idea.id}_{idea.title.replace(' ', '_')}.pdf"
-        
-        # Return PDF file
-        return FileResponse(
-            io.BytesIO(pdf_bytes),
-            media_type="application/pdf",
-            filename=filename
-        )
-    
-    except Exception as e:
+
+    # Create filename
+    filename = f"business_plan_{idea.id}_{idea.title.replace(' ', '_')}.pdf"
+
+    job = submit_job(current_user.id, [idea.id], template, filename)
+    await PDFJobManager.wait(job)
+    check_job_succeeded(job, discard=True)
+
+    # Return PDF file
+    return FileResponse(
+        job.path,
+        media_type="application/pdf",
+        filename=filename,
+        background=BackgroundTask(PDFJobManager.discard, job.id)
+    )
+
+@router.post("/export-multiple")
+async def export_multiple_ideas_to_pdf(
+    idea_ids: List[int] = Body(...),
+    template: str = settings.PDF_DEFAULT_TEMPLATE,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Export multiple ideas to a single PDF document, one section per idea
+    with a table of contents, streamed to the client
+    """
+    check_template(template)
+
+    # Titles only: the 404 check and the filename
+    toc = await run_in_threadpool(DatabaseService.get_idea_titles, db, idea_ids, current_user.id)
+    db.close()
+
+    if not toc:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error generating PDF: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No ideas found"
         )
 
-@router.post("/export-multiple")
-def export_multiple_ideas_to_pdf(
-    idea_ids: list,
+    filename = f"business_plans_combined_{len(toc)}_ideas.pdf"
+
+    job = submit_job(current_user.id, [idea_id for idea_id, _ in toc], template, filename)
+    await PDFJobManager.wait(job)
+    check_job_succeeded(job, discard=True)
+
+    return StreamingResponse(
+        stream_file(job.path),
+        media_type="application/pdf",
+        headers=pdf_attachment_headers(filename),
+        background=BackgroundTask(PDFJobManager.discard, job.id)
+    )
+
+# ===== ASYNC JOB API =====
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+def create_pdf_job(
+    job_request: PDFJobRequest,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Export multiple ideas to a single PDF document
+    Queue a PDF export (one id: business plan, several: combined document).
+    Ids that aren't the user's ideas are left out.
     """
-    try:
-        # Get all ideas
-        ideas = []
-        for idea_id in idea_ids:
-            idea = DatabaseService.get_idea_by_id(db, idea_id, current_user.id)
-            if idea:
-                ideas.append(idea)
-        
-        if not ideas:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No ideas found"
-            )
-        
-        # Generate combined PDF for first idea (can be extended for multiple)
-        idea_data = {
-            "title": f"Business Plans - {len(ideas)} Ideas",
-            "description": f"Combined business plan document with {len(ideas)} startup ideas",
-            "business_model": "See individual ideas below",
-            "target_audience": "See individual ideas below",
-            "swot_analysis": "See individual ideas below",
-            "market_potential": "See individual ideas below",
-            "industry": ", ".join([idea.industry for idea in ideas if idea.industry]),
-            "keywords": ", ".join([idea.keywords for idea in ideas if idea.keywords])
-        }
-        
-        # Generate PDF
-        pdf_bytes = PDFService.generate_business_plan_pdf(idea_data)
-        
-        # Create filename
-        filename = f"business_plans_combined_{len(ideas)}_ideas.pdf"
-        
-        # Return PDF file
-        return FileResponse(
-            io.BytesIO(pdf_bytes),
-            media_type="application/pdf",
-            filename=filename
+    check_template(job_request.template)
+
+    if not job_request.idea_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="idea_ids must not be empty"
         )
-    
-    except Exception as e:
+
+    # Resolved before queueing, so unknown ids don't take a render slot
+    idea_ids = [idea_id for idea_id, _ in DatabaseService.get_idea_titles(db, job_request.idea_ids, current_user.id)]
+    db.close()
+
+    if not idea_ids:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error generating PDF: {str(e)}"
-        )
\ No newline at end of file
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No ideas found"
+        )
+
+    if len(idea_ids) == 1:
+        filename = f"business_plan_{idea_ids[0]}.pdf"
+    else:
+        filename = f"business_plans_combined_{len(idea_ids)}_ideas.pdf"
+
+    job = submit_job(current_user.id, idea_ids, job_request.template, filename)
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}")
+def get_pdf_job(
+    job_id: str,
+    current_user = Depends(get_current_user)
+):
+    """
+    Poll the status of a PDF export job
+    """
+    job = PDFJobManager.get(job_id, current_user.id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}/download")
+def download_pdf_job(
+    job_id: str,
+    current_user = Depends(get_current_user)
+):
+    """
+    Download the result of a finished PDF export job
+    """
+    job = PDFJobManager.get(job_id, current_user.id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    check_job_succeeded(job)
+
+    if job.status != "done":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status}"
+        )
+
+    return FileResponse(job.path, media_type="application/pdf", filename=job.filename)
@@ -10,14 +10,125 @@ class Settings:
     API_V1_STR: str = "/api/v1"
     
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # Size DB_POOL_SIZE + DB_MAX_OVERFLOW against the threads that use the
+    # pool in one worker process (AnyIO threadpool, 40 by default)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
     SECRET_KEY: str = os.getenv("SECRET_KEY")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
+    AUTH_USER_CACHE_SIZE: int = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+    AUTH_USER_CACHE_TTL_SECONDS: float = float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "60"))
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+    PASSWORD_HASH_NICENESS: int = int(os.getenv("PASSWORD_HASH_NICENESS", "10"))
+    # Entry count x max token length bounds the verified-token cache memory
+    JWT_CACHE_MAX_ENTRIES: int = int(os.getenv("JWT_CACHE_MAX_ENTRIES", "50000"))
+    JWT_CACHE_MAX_TOKEN_LENGTH: int = int(os.getenv("JWT_CACHE_MAX_TOKEN_LENGTH", "1024"))
+    JWT_CACHE_DEFAULT_TTL_SECONDS: float = float(os.getenv("JWT_CACHE_DEFAULT_TTL_SECONDS", "300"))
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
+
+    # Logging (LOG_LEVELS / LOG_SAMPLE_RATES: "logger=value,logger=value")
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_SAMPLE_RATES: str = os.getenv("LOG_SAMPLE_RATES", "")
+
     DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
+    BACKEND_HOST: str = os.getenv("BACKEND_HOST", "0.0.0.0")
     BACKEND_PORT: int = int(os.getenv("BACKEND_PORT", "8000"))
     FRONTEND_PORT: int = int(os.getenv("FRONTEND_PORT", "5000"))
     BACKEND_CORS_ORIGINS: list = ["http://localhost:5000", "http://localhost:3000"]
 
+    # AI generation
+    AI_PROVIDER: str = os.getenv("AI_PROVIDER", "mock")
+    LLM_API_URL: str = os.getenv("LLM_API_URL", "https://api.openai.com/v1")
+    LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-3.5-turbo")
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    LLM_MAX_CONNECTIONS: int = int(os.getenv("LLM_MAX_CONNECTIONS", "200"))
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "50"))
+    AI_MOCK_LATENCY_MS: float = float(os.getenv("AI_MOCK_LATENCY_MS", "0"))
+    AI_MOCK_JITTER_MS: float = float(os.getenv("AI_MOCK_JITTER_MS", "0"))
+    GENERATION_CACHE_SIZE: int = int(os.getenv("GENERATION_CACHE_SIZE", "1024"))
+    GENERATION_CACHE_TTL_SECONDS: float = float(os.getenv("GENERATION_CACHE_TTL_SECONDS", "3600"))
+
+    # Generation admission control (rate and burst are in ideas, per user)
+    GENERATION_MAX_IDEAS: int = int(os.getenv("GENERATION_MAX_IDEAS", "10"))
+    GENERATION_RATE_PER_MINUTE: float = float(os.getenv("GENERATION_RATE_PER_MINUTE", "60"))
+    GENERATION_BURST: float = float(os.getenv("GENERATION_BURST", "30"))
+    GENERATION_MAX_CONCURRENCY: int = int(os.getenv("GENERATION_MAX_CONCURRENCY", "32"))
+    GENERATION_MAX_QUEUE: int = int(os.getenv("GENERATION_MAX_QUEUE", "64"))
+    GENERATION_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("GENERATION_QUEUE_TIMEOUT_SECONDS", "30"))
+    ADMISSION_STORE_URL: str = os.getenv("ADMISSION_STORE_URL", "")
+
+    # Analytics (rollups fold pending deltas, and reconcile with the source tables)
+    ANALYTICS_FOLD_SECONDS: float = float(os.getenv("ANALYTICS_FOLD_SECONDS", "5"))
+    ANALYTICS_RECONCILE_SECONDS: float = float(os.getenv("ANALYTICS_RECONCILE_SECONDS", "300"))
+
+    # Bulk idea operations (ids per request)
+    BULK_MAX_IDS: int = int(os.getenv("BULK_MAX_IDS", "10000"))
+
+    # Search history write-behind buffer
+    SEARCH_HISTORY_FLUSH_MS: float = float(os.getenv("SEARCH_HISTORY_FLUSH_MS", "250"))
+    SEARCH_HISTORY_BATCH_SIZE: int = int(os.getenv("SEARCH_HISTORY_BATCH_SIZE", "500"))
+    SEARCH_HISTORY_QUEUE_SIZE: int = int(os.getenv("SEARCH_HISTORY_QUEUE_SIZE", "10000"))
+
+    # Prefork serving (run.py). With WEB_CONCURRENCY > 1 or
+    # WORKER_MAX_REQUESTS > 0 a preloaded master forks the workers. Every
+    # worker has its own DB pool (sized per worker, above); the process
+    # pools and admission limits in NODE_WIDE_LIMITS are for the whole
+    # node and each worker gets a share of them.
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    WORKER_MAX_REQUESTS: int = int(os.getenv("WORKER_MAX_REQUESTS", "0"))
+    WORKER_MAX_REQUESTS_JITTER: int = int(os.getenv("WORKER_MAX_REQUESTS_JITTER", "0"))
+    WORKER_GRACEFUL_TIMEOUT_SECONDS: float = float(os.getenv("WORKER_GRACEFUL_TIMEOUT_SECONDS", "30"))
+    WORKER_BOOT_TIMEOUT_SECONDS: float = float(os.getenv("WORKER_BOOT_TIMEOUT_SECONDS", "60"))
+
+    # Search (in-process index used on databases without native full-text search)
+    SEARCH_INDEX_TTL_SECONDS: float = float(os.getenv("SEARCH_INDEX_TTL_SECONDS", "300"))
+    SEARCH_INDEX_MAX_USERS: int = int(os.getenv("SEARCH_INDEX_MAX_USERS", "1000"))
+
+    # PDF rendering farm
+    PDF_DEFAULT_TEMPLATE: str = os.getenv("PDF_DEFAULT_TEMPLATE", "letter")
+    PDF_RENDER_WORKERS: int = int(os.getenv("PDF_RENDER_WORKERS", str(os.cpu_count() or 1)))
+    PDF_JOB_QUEUE_DEPTH: int = int(os.getenv("PDF_JOB_QUEUE_DEPTH", "64"))
+    PDF_JOBS_PER_USER: int = int(os.getenv("PDF_JOBS_PER_USER", "4"))
+    PDF_JOB_TTL_SECONDS: float = float(os.getenv("PDF_JOB_TTL_SECONDS", "900"))
+    # Job state and output files, shared by all server workers on the host
+    # (default: a pdf_jobs directory under the system temp directory)
+    PDF_JOB_DIR: str = os.getenv("PDF_JOB_DIR") or None
+
+    NODE_WIDE_LIMITS = (
+        "PASSWORD_HASH_WORKERS",
+        "PASSWORD_HASH_MAX_QUEUE",
+        "GENERATION_MAX_CONCURRENCY",
+        "GENERATION_MAX_QUEUE",
+        "PDF_RENDER_WORKERS",
+        "PDF_JOB_QUEUE_DEPTH",
+        "PDF_JOBS_PER_USER",
+    )
+    # In-process token buckets; a shared ADMISSION_STORE_URL already
+    # enforces the node-wide rate
+    NODE_WIDE_RATES = ("GENERATION_RATE_PER_MINUTE", "GENERATION_BURST")
+
+    def share_among_workers(self, workers: int):
+        """
+        Scale the node-wide pool sizes and limits down to one of
+        ``workers`` worker processes (at least one of each). Per-user limits
+        then hold approximately, as a user's requests spread over workers.
+        """
+        for name in self.NODE_WIDE_LIMITS:
+            value = getattr(self, name)
+            if value > 0:
+                setattr(self, name, max(1, value // workers))
+        if not self.ADMISSION_STORE_URL or self.ADMISSION_STORE_URL.startswith("memory://"):
+            for name in self.NODE_WIDE_RATES:
+                setattr(self, name, getattr(self, name) / workers)
+
 settings = Settings()
\ No newline at end of file
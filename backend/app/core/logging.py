@@ -0,0 +1,213 @@
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from app.core.config import settings
+
+# Correlates every log record emitted while handling one request
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed via ``extra=``
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "request_id"}
+
+def parse_mapping(value: str) -> Dict[str, str]:
+    """Parse ``"a=1,b=2"`` settings strings"""
+    pairs = (item.split("=", 1) for item in value.split(",") if "=" in item)
+    return {key.strip(): val.strip() for key, val in pairs}
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, including fields passed via ``extra=``"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id (runs in the caller's context)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of DEBUG/INFO records from noisy loggers.
+
+    ``rates`` maps logger name prefixes to the fraction kept; warnings and
+    errors are never sampled out.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        # Longest prefix first so the most specific rate wins
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                if random.random() < rate:
+                    return True
+                self.sampled_out += 1
+                return False
+        return True
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller: records are handed to the
+    listener thread through a bounded queue and dropped (and counted) when
+    it is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback here, while args and exc_info
+        # are still valid, but leave the formatting to the listener
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class RequestIdMiddleware:
+    """
+    Pure ASGI middleware that assigns each request an id (or reuses the
+    client's ``X-Request-ID``) for log correlation and echoes it back.
+    """
+
+    HEADER = b"x-request-id"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == self.HEADER:
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(self.HEADER, request_id.encode("latin-1"))]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+
+class LogSystem:
+    """
+    Process-wide logging setup: root logger -> bounded queue -> listener
+    thread -> stdout.
+
+    ``setup(background=False)`` writes to stdout directly instead, for
+    processes that must not run extra threads (a pre-forking master).
+    Setup is per process: a forked child calling ``setup`` replaces the
+    copy it inherited, whose listener thread did not survive the fork.
+    """
+
+    handler: Optional[logging.Handler] = None
+    listener: Optional[QueueListener] = None
+    sampler: Optional[SamplingFilter] = None
+    pid: Optional[int] = None
+
+    @classmethod
+    def setup(cls, background: bool = True):
+        if cls.handler is not None:
+            if cls.pid == os.getpid():
+                return
+            logging.getLogger().removeHandler(cls.handler)
+            cls.handler = cls.listener = None
+        cls.pid = os.getpid()
+
+        output = logging.StreamHandler(sys.stdout)
+        if settings.LOG_FORMAT == "json":
+            output.setFormatter(JSONFormatter())
+        else:
+            output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+
+        if background:
+            cls.handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+        else:
+            cls.handler = output
+        cls.handler.addFilter(RequestIdFilter())
+        cls.sampler = SamplingFilter({
+            name: float(rate) for name, rate in parse_mapping(settings.LOG_SAMPLE_RATES).items()
+        })
+        cls.handler.addFilter(cls.sampler)
+
+        root = logging.getLogger()
+        root.setLevel(settings.LOG_LEVEL.upper())
+        root.addHandler(cls.handler)
+        for name, level in parse_mapping(settings.LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level.upper())
+
+        if background:
+            cls.listener = QueueListener(cls.handler.queue, output, respect_handler_level=True)
+            cls.listener.start()
+
+    @classmethod
+    def shutdown(cls):
+        """Flush queued records and stop the listener thread"""
+        if cls.listener is not None:
+            cls.listener.stop()
+            cls.listener = None
+        if cls.handler is not None:
+            logging.getLogger().removeHandler(cls.handler)
+            cls.handler = None
+
+    @classmethod
+    def stats(cls) -> dict:
+        if cls.handler is None:
+            return {"enabled": False}
+        if cls.listener is None:
+            return {"enabled": True, "background": False, "sampled_out": cls.sampler.sampled_out}
+        return {
+            "enabled": True,
+            "queued": cls.handler.queue.qsize(),
+            "dropped": cls.handler.dropped,
+            "sampled_out": cls.sampler.sampled_out,
+        }
@@ -0,0 +1,191 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event
+
+# Latency buckets (seconds) for request and SQL time histograms
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Statements-per-request buckets
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# [statement count, seconds] for the request being handled. The list is
+# shared (not copied) with threadpool workers, which run in a copy of the
+# request's context.
+_request_sql: ContextVar[Optional[list]] = ContextVar("request_sql", default=None)
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Histogram:
+    """Prometheus-style cumulative histogram with labels"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series: Dict[Tuple, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values: Tuple, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # Per-bucket counts (last slot is +Inf), then sum
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_number(bound)
+                labels = _format_labels(self.labels, label_values, 'le="%s"' % le)
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, label_values)} {values[-1]!r}"
+            yield f"{self.name}_count{_format_labels(self.labels, label_values)} {cumulative}"
+
+class Counter:
+    """Prometheus counter (or gauge, via ``kind``) with labels"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), kind: str = "counter"):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.kind = kind
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values: Tuple = (), amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, label_values: Tuple = (), amount: float = 1):
+        self.inc(label_values, -amount)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} {self.kind}"
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {_format_number(value)}"
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Counter(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled",
+    ("method",),
+    kind="gauge",
+)
+REQUEST_SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements",
+    "SQL statements executed per HTTP request",
+    ("method", "route"),
+    QUERY_COUNT_BUCKETS,
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "http_request_sql_duration_seconds",
+    "Time spent executing SQL per HTTP request",
+    ("method", "route"),
+    LATENCY_BUCKETS,
+)
+SQL_STATEMENTS = Counter(
+    "sql_statements_total",
+    "SQL statements executed (including outside requests)",
+)
+SQL_SECONDS = Counter(
+    "sql_statement_duration_seconds_total",
+    "Total time spent executing SQL statements",
+)
+
+METRICS = [REQUEST_LATENCY, REQUESTS_IN_FLIGHT, REQUEST_SQL_STATEMENTS, REQUEST_SQL_SECONDS, SQL_STATEMENTS, SQL_SECONDS]
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, in-flight requests and SQL
+    usage per route template (e.g. ``/api/v1/ideas/{idea_id}``, so ids
+    don't explode the label cardinality).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        sql = [0, 0.0]
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = _request_sql.set(sql)
+        REQUESTS_IN_FLIGHT.inc((method,))
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec((method,))
+            _request_sql.reset(token)
+
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.observe((method, path, status_code), elapsed)
+            REQUEST_SQL_STATEMENTS.observe((method, path), sql[0])
+            REQUEST_SQL_SECONDS.observe((method, path), sql[1])
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_start
+    SQL_STATEMENTS.inc()
+    SQL_SECONDS.inc(amount=elapsed)
+    sql = _request_sql.get()
+    if sql is not None:
+        sql[0] += 1
+        sql[1] += elapsed
+
+def instrument_engine(engine):
+    """Count and time every statement executed through ``engine``"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def render_metrics(extra_gauges: Optional[Dict[str, float]] = None) -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for name, value in (extra_gauges or {}).items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {_format_number(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,56 @@
+"""
+Explicit schema creation step.
+
+Importing the application no longer touches the database; create the
+tables once per database before starting the server:
+
+    python -m app.db.init_db
+
+Safe to re-run: it also applies the schema additions that ``create_all``
+does not make to tables that already exist, and brings the analytics
+rollups up to date with the data.
+"""
+from sqlalchemy import text
+from app.db.database import Base, engine
+
+# Indexes added to models after their table first shipped; create_all
+# only creates indexes together with a new table
+ADDED_INDEXES = [
+    "ix_ideas_user_id_created_at_id",
+    "ix_search_history_user_id_created_at",
+]
+
+def init_db(bind=None):
+    """Create all tables (and their indexes) that don't exist yet, then upgrade existing ones"""
+    # Registers every model on Base.metadata
+    import app.models.models  # noqa: F401
+
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    upgrade_schema(bind)
+    seed_rollups(bind)
+
+def upgrade_schema(bind):
+    """Idempotently add columns and indexes introduced after a table was first created"""
+    from app.models.models import POSTGRES_SEARCH_DDL
+
+    indexes = {index.name: index for table in Base.metadata.tables.values() for index in table.indexes}
+    for name in ADDED_INDEXES:
+        indexes[name].create(bind, checkfirst=True)
+
+    if bind.dialect.name == "postgresql":
+        with bind.begin() as connection:
+            for statement in POSTGRES_SEARCH_DDL:
+                connection.execute(text(statement))
+
+def seed_rollups(bind):
+    """Build the analytics rollups (new databases, or ones that predate them)"""
+    from sqlalchemy.orm import Session
+    from app.services.db_service import DatabaseService
+
+    with Session(bind) as db:
+        DatabaseService.reconcile_platform_stats(db)
+
+if __name__ == "__main__":
+    init_db()
+    print("Database tables created")
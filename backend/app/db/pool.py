@@ -0,0 +1,145 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+class PoolMetrics:
+    """
+    Counters for one connection pool, updated from the pool hooks.
+
+    ``checkout_wait_*`` is the time spent waiting for a connection (queue
+    wait plus connecting when the pool grows), which is what tells you the
+    pool is too small for the number of worker threads.
+    """
+
+    # Upper bounds (ms) of the checkout wait histogram buckets
+    WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.peak_overflow = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_buckets = [0] * (len(self.WAIT_BUCKETS_MS) + 1)
+
+    def record_wait(self, wait_ms: float, overflow: int):
+        with self._lock:
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            for i, bound in enumerate(self.WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+            else:
+                self.wait_buckets[-1] += 1
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def on_checkout(self, *args):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def on_checkin(self, *args):
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(0, self.in_use - 1)
+
+    def on_connect(self, *args):
+        with self._lock:
+            self.connects += 1
+
+    def on_close(self, *args):
+        with self._lock:
+            self.closes += 1
+
+    def on_invalidate(self, *args):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sum(self.wait_buckets)
+            buckets = {f"le_{bound}ms": count for bound, count in zip(self.WAIT_BUCKETS_MS, self.wait_buckets)}
+            buckets["gt_{}ms".format(self.WAIT_BUCKETS_MS[-1])] = self.wait_buckets[-1]
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "peak_overflow": self.peak_overflow,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "closes": self.closes,
+                "invalidations": self.invalidations,
+                "checkout_wait_avg_ms": round(self.wait_total_ms / waits, 3) if waits else 0.0,
+                "checkout_wait_max_ms": round(self.wait_max_ms, 3),
+                "checkout_wait_buckets": buckets,
+            }
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long each checkout waits for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_wait((time.perf_counter() - start) * 1000, self.overflow())
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        # Keep counting across engine.dispose()
+        pool.metrics = self.metrics
+        return pool
+
+def instrument_pool(engine):
+    """Attach the PoolMetrics event hooks (no-op for non-instrumented pools)"""
+    metrics = getattr(engine.pool, "metrics", None)
+    if metrics is None:
+        return
+    event.listen(engine, "checkout", metrics.on_checkout)
+    event.listen(engine, "checkin", metrics.on_checkin)
+    event.listen(engine, "connect", metrics.on_connect)
+    event.listen(engine, "close", metrics.on_close)
+    event.listen(engine, "invalidate", metrics.on_invalidate)
+
+def pool_status(engine) -> dict:
+    """Current pool sizing plus the PoolMetrics counters"""
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            # QueuePool.overflow() is negative while the pool is not yet full
+            "open_connections": pool.size() + pool.overflow(),
+            "overflow": max(0, pool.overflow()),
+        })
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
@@ -1,12 +1,20 @@
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
 from app.core.config import settings
-from app.db.database import engine, Base
-from app.models.models import User, Idea, SearchHistory
+from app.core.logging import LogSystem, RequestIdMiddleware
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.db.database import engine
+from app.db.pool import pool_status
 from app.api import auth, ideas, pdf, analytics
-
-# Create all database tables
-Base.metadata.create_all(bind=engine)
+from app.services.admission import GenerationAdmission
+from app.services.ai_service import AIService, HTTPProvider
+from app.services.analytics_rollups import RollupReconciler
+from app.services.pdf_jobs import PDFJobManager
+from app.services.search_history_buffer import SearchHistoryBuffer
+from app.services.auth_service import PasswordHasher, token_cache, user_cache
 
 # Create FastAPI application
 app = FastAPI(
@@ -24,12 +32,81 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(RequestIdMiddleware)
+
+# Added last so it is the outermost middleware and times the whole stack
+app.add_middleware(MetricsMiddleware)
+
 # Include API routers
 app.include_router(auth.router)
 app.include_router(ideas.router)
 app.include_router(pdf.router)
 app.include_router(analytics.router)
 
+@app.on_event("startup")
+def start_logging():
+    """
+    Structured logging through a background listener thread (a no-op when
+    the runner already set it up in this process)
+    """
+    LogSystem.setup()
+
+@app.on_event("startup")
+async def start_rollup_reconciler():
+    """
+    Start the periodic analytics rollup fold and reconcile job
+    """
+    RollupReconciler.start()
+
+@app.on_event("shutdown")
+async def stop_rollup_reconciler():
+    """
+    Stop the analytics rollup fold and reconcile job
+    """
+    await RollupReconciler.stop()
+
+@app.on_event("shutdown")
+async def close_llm_client():
+    """
+    Close the pooled LLM HTTP client
+    """
+    await HTTPProvider.close_client()
+
+@app.on_event("shutdown")
+async def close_admission_store():
+    """
+    Close the connection to a shared rate limit store
+    """
+    await GenerationAdmission.close_store()
+
+@app.on_event("shutdown")
+def shutdown_password_hasher():
+    """
+    Stop the password hashing process pool
+    """
+    PasswordHasher.shutdown()
+
+@app.on_event("shutdown")
+def shutdown_pdf_jobs():
+    """
+    Stop the PDF rendering pool and remove job files
+    """
+    PDFJobManager.shutdown()
+
+@app.on_event("shutdown")
+def flush_search_history():
+    """
+    Write out buffered search history and stop its writer thread
+    """
+    SearchHistoryBuffer.shutdown()
+
+@app.on_event("shutdown")
+def shutdown_logging():
+    """
+    Flush queued log records and stop the log listener thread
+    """
+    LogSystem.shutdown()
+
 # Health check endpoint
 @app.get("/health")
 def health_check():
@@ -42,6 +119,67 @@ def health_check():
         "version": settings.VERSION
     }
 
+# Readiness endpoint
+@app.get("/ready")
+def readiness_check():
+    """
+    Readiness check: database round trip plus connection pool statistics
+    """
+    start = time.perf_counter()
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        database = {"status": "ok", "latency_ms": round((time.perf_counter() - start) * 1000, 3)}
+        ready = True
+    except Exception as e:
+        database = {"status": "error", "detail": str(e)}
+        ready = False
+    
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ready" if ready else "unavailable",
+            "database": database,
+            "pool": pool_status(engine)
+        }
+    )
+
+# Prometheus metrics endpoint
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Request latency, in-flight, SQL, connection pool, search history
+    buffer and generation admission metrics in the Prometheus text format
+    """
+    pool = pool_status(engine)
+    gauges = {
+        f"db_pool_{name}": value
+        for name, value in pool.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+    gauges.update({
+        f"search_history_{name}": value
+        for name, value in SearchHistoryBuffer.stats().items()
+    })
+    gauges.update({
+        f"generation_admission_{name}": value
+        for name, value in GenerationAdmission.stats().items()
+    })
+    return PlainTextResponse(render_metrics(gauges), media_type="text/plain; version=0.0.4")
+
+# Cache statistics endpoint
+@app.get("/health/caches")
+def cache_stats():
+    """
+    Hit/miss counters for the in-process caches
+    """
+    return {
+        "auth_users": user_cache.stats(),
+        "verified_tokens": token_cache.stats(),
+        "generations": AIService.cache_stats(),
+        "logging": LogSystem.stats()
+    }
+
 # Root endpoint
 @app.get("/")
 def read_root():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -37,6 +37,24 @@ class Idea(Base):
     # Relationships
     owner = relationship("User", back_populates="ideas")
 
+# Keyset pagination of a user's ideas by (created_at, id)
+Index("ix_ideas_user_id_created_at_id", Idea.user_id, Idea.created_at, Idea.id)
+
+# Full-text search on PostgreSQL: a generated, weighted tsvector with a GIN
+# index. It is not mapped on the model, so other dialects (which use the
+# in-process index in search_service) never see it. Applied by
+# init_db.upgrade_schema, idempotently, so existing tables get it too.
+POSTGRES_SEARCH_DDL = (
+    "ALTER TABLE ideas ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(keywords, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(business_model, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(swot_analysis, '')), 'C')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_ideas_search_vector ON ideas USING GIN (search_vector)",
+)
+
 class SearchHistory(Base):
     __tablename__ = "search_history"
     
@@ -48,4 +66,40 @@ class SearchHistory(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    user = relationship("User", back_populates="search_history") 
+    user = relationship("User", back_populates="search_history")
+
+# Latest-N history per user (analytics) without scanning or sorting
+Index(
+    "ix_search_history_user_id_created_at",
+    SearchHistory.user_id,
+    SearchHistory.created_at.desc()
+)
+
+class PlatformStats(Base):
+    """Single-row rollup of platform totals (id is always 1)"""
+    __tablename__ = "platform_stats"
+    
+    id = Column(Integer, primary_key=True)
+    total_users = Column(Integer, nullable=False, default=0)
+    total_ideas = Column(Integer, nullable=False, default=0)
+    reconciled_at = Column(DateTime)
+
+class IndustryStats(Base):
+    """Rollup of idea counts per industry ('' stands for no industry)"""
+    __tablename__ = "industry_stats"
+    
+    industry = Column(String(100), primary_key=True)
+    idea_count = Column(Integer, nullable=False, default=0, index=True)
+
+class StatsDelta(Base):
+    """
+    Pending change to the rollups above, appended by writers in their own
+    transaction and folded into the rollups by the reconciler. A row with
+    a NULL industry changes only the platform totals.
+    """
+    __tablename__ = "stats_deltas"
+    
+    id = Column(Integer, primary_key=True)
+    industry = Column(String(100))
+    users = Column(Integer, nullable=False, default=0)
+    ideas = Column(Integer, nullable=False, default=0)
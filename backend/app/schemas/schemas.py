@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+from app.core.config import settings
 
 # User Schemas
 class UserBase(BaseModel):
@@ -42,11 +43,53 @@ class Idea(IdeaBase):
     class Config:
         from_attributes = True
 
+class IdeaUpdate(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    business_model: Optional[str] = None
+    target_audience: Optional[str] = None
+    swot_analysis: Optional[str] = None
+    market_potential: Optional[str] = None
+    industry: Optional[str] = None
+    keywords: Optional[str] = None
+
+class IdeaPage(BaseModel):
+    items: List[Idea]
+    next_cursor: Optional[str] = None
+
+class IdeaSearchPage(BaseModel):
+    items: List[Idea]
+    next_skip: Optional[int] = None
+
+# Bulk Idea Operations
+class BulkIdeaIds(BaseModel):
+    idea_ids: List[int] = Field(..., min_length=1, max_length=settings.BULK_MAX_IDS)
+
+class BulkFavoriteRequest(BulkIdeaIds):
+    is_favorite: bool = True
+
+class BulkUpdateRequest(BulkIdeaIds):
+    changes: IdeaUpdate
+
+class BulkItemResult(BaseModel):
+    id: int
+    status: str
+
+class BulkResult(BaseModel):
+    succeeded: int
+    not_found: int
+    results: List[BulkItemResult]
+
 # Generation Request
 class GenerationRequest(BaseModel):
     keywords: str
     industry: str
-    num_ideas: int = 1
+    num_ideas: int = Field(1, ge=1, le=settings.GENERATION_MAX_IDEAS)
+
+# PDF Export Jobs
+class PDFJobRequest(BaseModel):
+    idea_ids: List[int]
+    template: str = settings.PDF_DEFAULT_TEMPLATE
 
 # Token
 class Token(BaseModel):
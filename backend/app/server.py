@@ -0,0 +1,406 @@
+"""
+Pre-forking production server.
+
+The master process imports the application once (preload), binds the
+listening socket and forks ``workers`` uvicorn processes that all accept
+from it, so one node uses every core instead of a single event loop.
+Pages loaded before the fork (the app, ReportLab with the compiled PDF
+templates, jose, passlib) are shared copy-on-write by the workers.
+
+Each worker warms up (DB pool connections, a render per PDF template, the
+bcrypt context and a JWT round trip) before it starts accepting, and tells
+the master when it is serving. The master:
+
+- respawns workers that exit, which is how ``max_requests`` recycling
+  works: a worker stops accepting after its request budget, drains and
+  exits, and a fresh one is forked in its place;
+- on SIGHUP replaces the workers one at a time, each old worker being
+  stopped only once its replacement is serving (rolling restart). Code
+  and settings are preloaded, so picking up a new release still needs a
+  full restart;
+- on SIGTERM / SIGINT stops the workers gracefully (in-flight requests get
+  ``graceful_timeout`` seconds) and exits.
+
+Process pools (bcrypt, PDF rendering) and admission limits are configured
+for the whole node; before forking, the master divides them among the
+workers (``Settings.share_among_workers``).
+
+The master runs no threads and holds no DB connections, so nothing
+half-locked or shared crosses a fork.
+"""
+import importlib
+import logging
+import os
+import random
+import select
+import signal
+import socket
+import time
+from typing import Dict, List, Optional
+
+import uvicorn
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.logging import LogSystem
+from app.db.database import engine
+from app.services.analytics_rollups import RollupReconciler
+
+logger = logging.getLogger(__name__)
+
+# Imported by the master so their pages are shared by every worker
+PRELOAD_MODULES = ["app.services.pdf_service", "jose.jwt", "passlib.context"]
+
+# A worker that fails faster than this after being forked is respawned
+# with a delay, so a broken deploy does not fork in a tight loop
+MIN_WORKER_UPTIME_SECONDS = 5.0
+RESPAWN_DELAY_SECONDS = 1.0
+
+def warm_up():
+    """
+    Do the first-request work of a worker up front: open the DB pool's
+    steady-state connections, render each PDF template once and build the
+    bcrypt and JWT machinery. Failures are logged, not fatal; /ready
+    reports a database that is still down.
+    """
+    start = time.perf_counter()
+
+    connections = []
+    try:
+        for _ in range(max(1, settings.DB_POOL_SIZE)):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    except Exception:
+        logger.warning("Connection pool priming failed", exc_info=True)
+    finally:
+        # Back into the pool, where they stay open for the first requests
+        for connection in connections:
+            connection.close()
+
+    from app.services.auth_service import AuthService
+    from app.services.pdf_service import IDEA_FIELDS, PDFService
+    from app.services import password_worker
+
+    try:
+        sample = {field: "Warm-up" for field in IDEA_FIELDS}
+        for name in PDFService.template_names():
+            PDFService.generate_business_plan_pdf(sample, template=name)
+    except Exception:
+        logger.warning("PDF warm-up failed", exc_info=True)
+
+    # Password hash processes fork from this worker and inherit the context
+    password_worker.get_context(settings.BCRYPT_ROUNDS)
+    try:
+        from jose import jwt
+
+        token = AuthService.create_access_token({"sub": "warm-up"})
+        jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except Exception:
+        logger.warning("JWT warm-up failed", exc_info=True)
+
+    logger.info(
+        "Worker warmed up",
+        extra={"pid": os.getpid(), "warmup_ms": round((time.perf_counter() - start) * 1000, 1)}
+    )
+
+class WorkerServer(uvicorn.Server):
+    """uvicorn server that reports to the master once it is accepting"""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets: Optional[List[socket.socket]] = None):
+        await super().startup(sockets=sockets)
+        try:
+            if not self.should_exit:
+                os.write(self.ready_fd, b"1")
+        finally:
+            os.close(self.ready_fd)
+
+class Worker:
+    """A forked worker process, as tracked by the master"""
+
+    def __init__(self, pid: int, ready_fd: int, slot: int):
+        self.pid = pid
+        # 0..workers-1; a replacement takes over the slot of the worker it replaces
+        self.slot = slot
+        self.ready_fd: Optional[int] = ready_fd
+        self.ready = False
+        self.retiring = False
+        self.started_at = time.monotonic()
+
+class PreforkServer:
+    """Master process of the pre-forking server (see the module docstring)"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        workers: int,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        graceful_timeout: float = 30.0,
+        boot_timeout: float = 60.0,
+        log_level: str = "info",
+        backlog: int = 2048,
+    ):
+        self.host = host
+        self.port = port
+        self.num_workers = max(1, workers)
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.boot_timeout = boot_timeout
+        self.log_level = log_level
+        self.backlog = backlog
+
+        self.app = None
+        self.sock: Optional[socket.socket] = None
+        self.workers: Dict[int, Worker] = {}
+        self.signals: List[int] = []
+        self.stopping = False
+        self.respawn_at = 0.0
+        self.wakeup_r = self.wakeup_w = -1
+
+    # ----- master -----
+
+    def run(self):
+        self.preload()
+        self.sock = self.bind()
+        self.wakeup_r, self.wakeup_w = os.pipe()
+        os.set_blocking(self.wakeup_r, False)
+        os.set_blocking(self.wakeup_w, False)
+        # Signals arriving while the master sits in select() wake it up
+        signal.set_wakeup_fd(self.wakeup_w)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, self.handle_signal)
+
+        logger.info("Master started", extra={
+            "pid": os.getpid(),
+            "address": f"{self.host}:{self.port}",
+            "workers": self.num_workers,
+            "max_requests": self.max_requests,
+        })
+        try:
+            while not self.stopping:
+                self.maintain()
+                self.wait(1.0)
+                self.reap()
+                self.process_signals()
+        finally:
+            self.stop()
+
+    def preload(self):
+        # No threads or open connections may be inherited by the workers:
+        # the master logs straight to stdout, and the pool init_db used is emptied
+        LogSystem.setup(background=False)
+        engine.dispose()
+        # Process pools and admission limits are sized for the node
+        settings.share_among_workers(self.num_workers)
+
+        from app.main import app
+
+        for module in PRELOAD_MODULES:
+            importlib.import_module(module)
+        self.app = app
+
+    def bind(self) -> socket.socket:
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(self.backlog)
+        sock.set_inheritable(True)
+        return sock
+
+    def handle_signal(self, signum, frame):
+        self.signals.append(signum)
+
+    def process_signals(self):
+        while self.signals:
+            signum = self.signals.pop(0)
+            if signum in (signal.SIGTERM, signal.SIGINT):
+                logger.info("Master stopping", extra={"signal": signal.Signals(signum).name})
+                self.stopping = True
+                return
+            if signum == signal.SIGHUP:
+                self.rolling_restart()
+            # SIGCHLD only wakes the master up; reap() collects the exits
+
+    def maintain(self):
+        """Fork workers until the configured number are running"""
+        taken = {worker.slot for worker in self.workers.values() if not worker.retiring}
+        if len(taken) < self.num_workers and time.monotonic() >= self.respawn_at:
+            for slot in range(self.num_workers):
+                if slot not in taken:
+                    self.spawn(slot)
+
+    def wait(self, timeout: float):
+        booting = {worker.ready_fd: worker for worker in self.workers.values() if worker.ready_fd is not None}
+        try:
+            readable, _, _ = select.select([self.wakeup_r, *booting], [], [], timeout)
+        except InterruptedError:
+            return
+        for fd in readable:
+            if fd == self.wakeup_r:
+                try:
+                    while os.read(self.wakeup_r, 512):
+                        pass
+                except BlockingIOError:
+                    pass
+                continue
+            worker = booting[fd]
+            # One byte once serving; EOF means it died while booting
+            if os.read(fd, 1):
+                worker.ready = True
+                logger.info("Worker ready", extra={
+                    "pid": worker.pid,
+                    "boot_ms": round((time.monotonic() - worker.started_at) * 1000, 1),
+                })
+            os.close(fd)
+            worker.ready_fd = None
+
+    def reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            worker = self.workers.pop(pid, None)
+            if worker is None:
+                continue
+            if worker.ready_fd is not None:
+                os.close(worker.ready_fd)
+            exit_code = os.waitstatus_to_exitcode(status)
+            uptime = time.monotonic() - worker.started_at
+            extra = {"pid": pid, "exit_code": exit_code, "uptime_s": round(uptime, 1)}
+            if worker.retiring or self.stopping:
+                logger.info("Worker stopped", extra=extra)
+            elif exit_code == 0:
+                # A clean exit without being asked to: the request budget ran out
+                logger.info("Worker recycled", extra=extra)
+            else:
+                logger.warning("Worker died", extra=extra)
+                if uptime < MIN_WORKER_UPTIME_SECONDS:
+                    self.respawn_at = time.monotonic() + RESPAWN_DELAY_SECONDS
+
+    def rolling_restart(self):
+        old_workers = [worker for worker in self.workers.values() if not worker.retiring]
+        logger.info("Rolling restart", extra={"workers": len(old_workers)})
+        for old in old_workers:
+            if old.pid not in self.workers:
+                # Exited meanwhile; maintain() replaces it
+                continue
+            new = self.spawn(old.slot)
+            if not self.wait_until_ready(new):
+                if not self.stopping:
+                    logger.error("Replacement worker did not start; rolling restart aborted", extra={"pid": new.pid})
+                    self.retire(new)
+                return
+            self.retire(old)
+        logger.info("Rolling restart complete")
+
+    def wait_until_ready(self, worker: Worker) -> bool:
+        deadline = time.monotonic() + self.boot_timeout
+        while not worker.ready:
+            remaining = deadline - time.monotonic()
+            if worker.pid not in self.workers or remaining <= 0:
+                return False
+            if signal.SIGTERM in self.signals or signal.SIGINT in self.signals:
+                # Leave the stop to the main loop
+                self.stopping = True
+                return False
+            self.wait(min(remaining, 1.0))
+            self.reap()
+        return True
+
+    def retire(self, worker: Worker):
+        worker.retiring = True
+        self.kill(worker.pid, signal.SIGTERM)
+
+    def kill(self, pid: int, signum: int):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def stop(self):
+        self.stopping = True
+        for worker in self.workers.values():
+            self.retire(worker)
+        # Workers get the graceful timeout to drain, plus time to run shutdown hooks
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self.workers and time.monotonic() < deadline:
+            self.wait(0.1)
+            self.reap()
+        for pid in list(self.workers):
+            logger.warning("Worker killed after the graceful timeout", extra={"pid": pid})
+            self.kill(pid, signal.SIGKILL)
+        while self.workers:
+            pid, _ = os.waitpid(-1, 0)
+            self.workers.pop(pid, None)
+        if self.sock is not None:
+            self.sock.close()
+        logger.info("Master stopped")
+
+    # ----- worker -----
+
+    def spawn(self, slot: int) -> Worker:
+        ready_r, ready_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                os.close(ready_r)
+                self.run_worker(ready_w, slot)
+            except BaseException:
+                logger.exception("Worker failed")
+                exit_code = 1
+            finally:
+                # Never return into the master's loop
+                LogSystem.shutdown()
+                os._exit(exit_code)
+
+        os.close(ready_w)
+        worker = Worker(pid, ready_r, slot)
+        self.workers[pid] = worker
+        return worker
+
+    def run_worker(self, ready_fd: int, slot: int):
+        # uvicorn installs its own SIGINT / SIGTERM handlers; reloads are the master's
+        signal.set_wakeup_fd(-1)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+            signal.signal(signum, signal.SIG_DFL)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        os.close(self.wakeup_r)
+        os.close(self.wakeup_w)
+        for worker in self.workers.values():
+            if worker.ready_fd is not None:
+                os.close(worker.ready_fd)
+        self.workers = {}
+
+        # Fresh per-process state: jitter, pool, log listener thread
+        # (replacing the master's direct handler, before warm-up logs)
+        random.seed()
+        engine.dispose(close=False)
+        LogSystem.setup()
+        # Periodic jobs that need only one process run in the first slot
+        RollupReconciler.enabled = slot == 0
+
+        warm_up()
+
+        limit_max_requests = None
+        if self.max_requests > 0:
+            # Jitter keeps the workers from all recycling at the same moment
+            limit_max_requests = self.max_requests + random.randint(0, max(0, self.max_requests_jitter))
+        config = uvicorn.Config(
+            self.app,
+            log_level=self.log_level,
+            limit_max_requests=limit_max_requests,
+            timeout_graceful_shutdown=self.graceful_timeout,
+        )
+        WorkerServer(config, ready_fd).run(sockets=[self.sock])
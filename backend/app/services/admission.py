@@ -0,0 +1,294 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class GenerationRejected(Exception):
+    """Raised when a generation is not admitted (rate limited or overloaded)"""
+
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+# ===== TOKEN BUCKET STORES =====
+
+class BucketStore:
+    """
+    Backend holding the per-user token buckets.
+
+    ``take`` refills the bucket at ``rate`` tokens per second up to
+    ``capacity``, then removes ``cost`` tokens if there are enough. It
+    returns 0 when the tokens were taken, otherwise the seconds until the
+    bucket will hold ``cost`` tokens (nothing is taken in that case). A
+    negative cost always succeeds: ``refund`` relies on it.
+    """
+
+    name = "base"
+
+    async def take(self, key: str, cost: float, rate: float, capacity: float) -> float:
+        raise NotImplementedError
+
+    async def refund(self, key: str, amount: float, rate: float, capacity: float):
+        """Give back tokens taken for a request that did not run (the next take caps them at ``capacity``)"""
+        await self.take(key, -amount, rate, capacity)
+
+    async def close(self):
+        pass
+
+class MemoryBucketStore(BucketStore):
+    """Buckets in this process (prefork workers each get a share of the rate, see ``Settings.share_among_workers``)"""
+
+    name = "memory"
+
+    # Above this many buckets, full (idle) ones are dropped
+    MAX_BUCKETS = 10000
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, cost: float, rate: float, capacity: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.MAX_BUCKETS:
+                self._prune(now, rate, capacity)
+        return wait
+
+    def _prune(self, now: float, rate: float, capacity: float):
+        self._buckets = {
+            key: (tokens, updated)
+            for key, (tokens, updated) in self._buckets.items()
+            if tokens + (now - updated) * rate < capacity
+        }
+
+class RedisBucketStore(BucketStore):
+    """
+    Buckets in Redis, shared by every worker and host using the same
+    server. The refill-and-take runs as one Lua script on Redis' clock,
+    so it is atomic and independent of worker clock skew.
+    """
+
+    name = "redis"
+
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    local wait = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+    else
+        wait = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str, prefix: str = "admission:"):
+        # Optional dependency: only deployments sharing limits need redis
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("ADMISSION_STORE_URL points at Redis but the 'redis' package is not installed") from e
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+        self.script = self.client.register_script(self.SCRIPT)
+
+    async def take(self, key: str, cost: float, rate: float, capacity: float) -> float:
+        wait = await self.script(keys=[self.prefix + key], args=[rate, capacity, cost])
+        return float(wait)
+
+    async def close(self):
+        await self.client.close()
+
+def build_store(url: str) -> BucketStore:
+    """Store for ``ADMISSION_STORE_URL``: empty or ``memory://`` for in-process, ``redis://`` / ``rediss://`` for Redis"""
+    if not url or url.startswith("memory://"):
+        return MemoryBucketStore()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBucketStore(url)
+    raise ValueError(f"Unsupported ADMISSION_STORE_URL scheme: {url.split('://')[0]}")
+
+# ===== ADMISSION CONTROL =====
+
+class AdmissionTicket:
+    """An admitted generation's concurrency slot; release() is idempotent"""
+
+    def __init__(self):
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            GenerationAdmission.release_slot()
+
+class GenerationAdmission:
+    """
+    Admission control for idea generation.
+
+    A request is admitted in two steps:
+
+    1. Per-user token bucket, weighted by ``num_ideas``: each user may
+       generate ``GENERATION_RATE_PER_MINUTE`` ideas per minute with bursts
+       of up to ``GENERATION_BURST``. Buckets live in the configured
+       ``BucketStore`` (in-process by default, Redis to share them across
+       workers).
+    2. Concurrency cap: at most ``GENERATION_MAX_CONCURRENCY`` generations
+       run at once. Further requests wait in a FIFO queue of at most
+       ``GENERATION_MAX_QUEUE`` for up to ``GENERATION_QUEUE_TIMEOUT_SECONDS``.
+       Both are node-wide: prefork workers each enforce a share.
+
+    Requests that fail either step raise ``GenerationRejected``. If the
+    bucket store is unreachable, requests are admitted (fail open) so a
+    Redis outage does not take generation down with it.
+    """
+
+    _store: Optional[BucketStore] = None
+    _active = 0
+    _waiters: Deque[asyncio.Future] = deque()
+
+    admitted = 0
+    rate_limited = 0
+    rejected_busy = 0
+    timed_out = 0
+    store_errors = 0
+
+    @classmethod
+    def get_store(cls) -> BucketStore:
+        if cls._store is None:
+            cls._store = build_store(settings.ADMISSION_STORE_URL)
+        return cls._store
+
+    @classmethod
+    def set_store(cls, store: BucketStore):
+        """Plug in a custom bucket store"""
+        cls._store = store
+
+    @classmethod
+    async def close_store(cls):
+        if cls._store is not None:
+            await cls._store.close()
+            cls._store = None
+
+    @classmethod
+    async def acquire(cls, user_id: int, num_ideas: int) -> AdmissionTicket:
+        # Reject on a full queue before spending the user's tokens
+        cls._check_queue()
+        cost = await cls._take_tokens(user_id, num_ideas)
+        try:
+            await cls._acquire_slot()
+        except GenerationRejected:
+            # Nothing ran, so a retry after "busy" isn't rate limited for it
+            await cls._refund_tokens(user_id, cost)
+            raise
+        cls.admitted += 1
+        return AdmissionTicket()
+
+    @classmethod
+    def release_slot(cls):
+        # Hand the slot straight to the next waiter, if any
+        while cls._waiters:
+            waiter = cls._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        cls._active -= 1
+
+    @classmethod
+    def _check_queue(cls):
+        if cls._active >= settings.GENERATION_MAX_CONCURRENCY and len(cls._waiters) >= settings.GENERATION_MAX_QUEUE:
+            cls.rejected_busy += 1
+            raise GenerationRejected("Too many generations in progress, please retry", retry_after=1)
+
+    @classmethod
+    async def _take_tokens(cls, user_id: int, num_ideas: int) -> float:
+        """Take the request's tokens; returns how many were taken"""
+        rate = settings.GENERATION_RATE_PER_MINUTE / 60
+        if rate <= 0:
+            return 0
+        capacity = settings.GENERATION_BURST
+        # A request larger than the bucket costs a full bucket
+        cost = min(num_ideas, capacity)
+        try:
+            wait = await cls.get_store().take(f"user:{user_id}", cost, rate, capacity)
+        except Exception:
+            cls.store_errors += 1
+            logger.warning("Admission store unavailable, admitting request", exc_info=True)
+            return 0
+        if wait > 0:
+            cls.rate_limited += 1
+            raise GenerationRejected("Generation rate limit exceeded", retry_after=max(1, math.ceil(wait)))
+        return cost
+
+    @classmethod
+    async def _refund_tokens(cls, user_id: int, cost: float):
+        if not cost:
+            return
+        try:
+            await cls.get_store().refund(
+                f"user:{user_id}", cost, settings.GENERATION_RATE_PER_MINUTE / 60, settings.GENERATION_BURST
+            )
+        except Exception:
+            cls.store_errors += 1
+            logger.warning("Admission store unavailable, tokens not refunded", exc_info=True)
+
+    @classmethod
+    async def _acquire_slot(cls):
+        if cls._active < settings.GENERATION_MAX_CONCURRENCY and not cls._waiters:
+            cls._active += 1
+            return
+        # Re-checked: the queue may have filled while the tokens were taken
+        cls._check_queue()
+
+        waiter = asyncio.get_running_loop().create_future()
+        cls._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, settings.GENERATION_QUEUE_TIMEOUT_SECONDS)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up: pass it on
+                cls.release_slot()
+            else:
+                try:
+                    cls._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(e, asyncio.TimeoutError):
+                cls.timed_out += 1
+                raise GenerationRejected("Timed out waiting for a generation slot", retry_after=1)
+            raise
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {
+            "active": cls._active,
+            "waiting": len(cls._waiters),
+            "admitted": cls.admitted,
+            "rate_limited": cls.rate_limited,
+            "rejected_busy": cls.rejected_busy,
+            "timed_out": cls.timed_out,
+            "store_errors": cls.store_errors,
+        }
@@ -1,16 +1,50 @@
+import asyncio
 import json
+import logging
+import random
+import re
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple
 
-class AIService:
-    def __init__(self):
-        print("[AI_SERVICE] Using MOCK mode (no OpenAI calls)")
-    
-    def generate_business_ideas(self, keywords: str, industry: str, num_ideas: int) -> list:
-        """Generate mock business ideas for testing"""
-        print(f"\n[AI_SERVICE] Generating {num_ideas} MOCK ideas")
-        print(f"[AI_SERVICE] Keywords: {keywords}")
-        print(f"[AI_SERVICE] Industry: {industry}")
-        
-        mock_ideas = [
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+IDEA_FIELDS = [
+    "title",
+    "description",
+    "business_model",
+    "target_audience",
+    "swot_analysis",
+    "market_potential",
+]
+
+
+class AIProvider:
+    """
+    Base class for async idea generation backends.
+
+    A provider produces one idea per call; ``AIService`` handles fan-out
+    when more than one idea is requested.
+    """
+
+    name = "base"
+
+    async def generate_idea(self, keywords: str, industry: str, index: int) -> dict:
+        raise NotImplementedError
+
+
+class MockProvider(AIProvider):
+    """Offline provider returning canned ideas (no network calls)"""
+
+    name = "mock"
+
+    @staticmethod
+    def mock_ideas(keywords: str, industry: str) -> list:
+        return [
             {
                 "title": f"AI-Powered {industry} Platform",
                 "description": f"An innovative {industry} solution using {keywords}. This platform leverages artificial intelligence to provide personalized solutions for professionals.",
@@ -39,6 +73,229 @@ class AIService:
                 "keywords": keywords
             }
         ]
-        
-        print(f"[AI_SERVICE] Generated {len(mock_ideas[:num_ideas])} ideas successfully\n")
-        return mock_ideas[:num_ideas]
\ No newline at end of file
+
+    def __init__(self, latency_ms: Optional[float] = None, jitter_ms: Optional[float] = None):
+        # Simulated per-idea generation time (for streaming/load tests)
+        self.latency_ms = settings.AI_MOCK_LATENCY_MS if latency_ms is None else latency_ms
+        self.jitter_ms = settings.AI_MOCK_JITTER_MS if jitter_ms is None else jitter_ms
+
+    async def generate_idea(self, keywords: str, industry: str, index: int) -> dict:
+        delay_ms = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+        ideas = self.mock_ideas(keywords, industry)
+        idea = dict(ideas[index % len(ideas)])
+        # Past the canned ideas, number the repeats so titles stay distinct
+        repeat = index // len(ideas)
+        if repeat:
+            idea["title"] = f"{idea['title']} ({repeat + 1})"
+        return idea
+
+
+class HTTPProvider(AIProvider):
+    """
+    Provider for an OpenAI-compatible chat completions endpoint.
+
+    All instances share one pooled ``httpx.AsyncClient`` so keep-alive
+    connections to the LLM backend are reused across requests.
+    """
+
+    name = "http"
+
+    _client: Optional["httpx.AsyncClient"] = None
+
+    @classmethod
+    def get_client(cls) -> "httpx.AsyncClient":
+        if cls._client is None or cls._client.is_closed:
+            # Only deployments using this provider pay for importing httpx
+            import httpx
+
+            headers = {}
+            if settings.OPENAI_API_KEY:
+                headers["Authorization"] = f"Bearer {settings.OPENAI_API_KEY}"
+            cls._client = httpx.AsyncClient(
+                base_url=settings.LLM_API_URL,
+                headers=headers,
+                timeout=httpx.Timeout(settings.LLM_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+            )
+        return cls._client
+
+    @classmethod
+    async def close_client(cls):
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
+    @staticmethod
+    def build_messages(keywords: str, industry: str, index: int) -> list:
+        prompt = (
+            f"Generate business idea #{index + 1} for the {industry} industry "
+            f"based on these keywords: {keywords}. "
+            f"Respond with a single JSON object with the keys: {', '.join(IDEA_FIELDS)}."
+        )
+        return [
+            {"role": "system", "content": "You are a startup consultant. Always answer with valid JSON."},
+            {"role": "user", "content": prompt},
+        ]
+
+    async def generate_idea(self, keywords: str, industry: str, index: int) -> dict:
+        response = await self.get_client().post(
+            "/chat/completions",
+            json={
+                "model": settings.LLM_MODEL,
+                "messages": self.build_messages(keywords, industry, index),
+                "temperature": 0.8,
+            },
+        )
+        response.raise_for_status()
+        content = response.json()["choices"][0]["message"]["content"]
+        idea = json.loads(content)
+        idea.setdefault("keywords", keywords)
+        return idea
+
+
+PROVIDERS = {
+    MockProvider.name: MockProvider,
+    HTTPProvider.name: HTTPProvider,
+}
+
+
+# Generated ideas by normalized request (see AIService.generation_key)
+generation_cache = TTLCache(
+    maxsize=settings.GENERATION_CACHE_SIZE,
+    ttl=settings.GENERATION_CACHE_TTL_SECONDS,
+)
+
+
+class AIService:
+    # Generations currently running, so identical concurrent requests
+    # share one upstream call instead of each starting their own
+    _inflight: Dict[Tuple, asyncio.Task] = {}
+    coalesced = 0
+
+    def __init__(self, provider: Optional[AIProvider] = None):
+        self.provider = provider or PROVIDERS[settings.AI_PROVIDER]()
+        logger.debug("Using %s provider", self.provider.name)
+
+    async def generate_business_ideas_async(self, keywords: str, industry: str, num_ideas: int) -> List[dict]:
+        """
+        Generate ideas concurrently, one provider call per idea.
+
+        A failed call is reported as ``{"error": ...}`` in its slot so the
+        other ideas are still returned.
+        """
+        logger.info(
+            "Generating ideas",
+            extra={"provider": self.provider.name, "keywords": keywords, "industry": industry, "num_ideas": num_ideas},
+        )
+
+        results = await asyncio.gather(
+            *[self.provider.generate_idea(keywords, industry, i) for i in range(num_ideas)],
+            return_exceptions=True,
+        )
+
+        ideas = []
+        for result in results:
+            if isinstance(result, Exception):
+                ideas.append({"error": str(result)})
+            else:
+                ideas.append(result)
+
+        failed = sum(1 for idea in ideas if "error" in idea)
+        logger.info("Generated ideas", extra={"generated": len(ideas) - failed, "failed": failed})
+        return ideas
+
+    def generation_key(self, keywords: str, industry: str, num_ideas: int) -> Tuple:
+        """Cache key: case, whitespace and keyword order don't matter"""
+        terms = sorted({term for term in re.split(r"[\s,;]+", keywords.lower()) if term})
+        return (
+            self.provider.name,
+            " ".join(terms),
+            " ".join(industry.lower().split()),
+            num_ideas,
+        )
+
+    async def generate_business_ideas_cached(self, keywords: str, industry: str, num_ideas: int) -> List[dict]:
+        """
+        ``generate_business_ideas_async`` behind the generation cache.
+
+        Concurrent identical requests are coalesced onto a single
+        generation. Results with failed slots are not cached. Callers get
+        their own copies of the idea dicts.
+        """
+        key = self.generation_key(keywords, industry, num_ideas)
+        ideas = generation_cache.get(key)
+        if ideas is None:
+            task = self._inflight.get(key)
+            # Tasks are bound to their event loop (the sync wrapper runs its own)
+            if task is not None and task.get_loop() is asyncio.get_running_loop():
+                AIService.coalesced += 1
+            else:
+                task = asyncio.ensure_future(self._generate_and_cache(key, keywords, industry, num_ideas))
+                AIService._inflight[key] = task
+            # Shielded: one caller going away must not cancel the
+            # generation the others are waiting on
+            ideas = await asyncio.shield(task)
+        return [dict(idea) for idea in ideas]
+
+    async def _generate_and_cache(self, key: Tuple, keywords: str, industry: str, num_ideas: int) -> List[dict]:
+        try:
+            ideas = await self.generate_business_ideas_async(keywords, industry, num_ideas)
+            if not any("error" in idea for idea in ideas):
+                generation_cache.set(key, ideas)
+            return ideas
+        finally:
+            AIService._inflight.pop(key, None)
+
+    async def stream_business_ideas(self, keywords: str, industry: str, num_ideas: int) -> AsyncIterator[Tuple[int, dict]]:
+        """
+        Yield ``(index, idea)`` as each idea finishes, in completion order.
+
+        Failed calls are yielded as ``{"error": ...}`` like in
+        ``generate_business_ideas_async``. Closing the iterator early (e.g.
+        the client went away) cancels the generations still running. A
+        complete, error-free run is stored in the generation cache, and a
+        cached result is replayed immediately.
+        """
+        key = self.generation_key(keywords, industry, num_ideas)
+        cached = generation_cache.get(key)
+        if cached is not None:
+            for index, idea in enumerate(cached):
+                yield index, dict(idea)
+            return
+
+        async def generate(index: int) -> Tuple[int, dict]:
+            try:
+                return index, await self.provider.generate_idea(keywords, industry, index)
+            except Exception as e:
+                return index, {"error": str(e)}
+
+        tasks = [asyncio.ensure_future(generate(i)) for i in range(num_ideas)]
+        ideas: List[Optional[dict]] = [None] * num_ideas
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, idea = await next_done
+                ideas[index] = idea
+                yield index, dict(idea)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if not any("error" in idea for idea in ideas):
+            generation_cache.set(key, ideas)
+
+    @classmethod
+    def cache_stats(cls) -> dict:
+        return {
+            **generation_cache.stats(),
+            "coalesced": cls.coalesced,
+            "inflight": len(cls._inflight),
+        }
+
+    def generate_business_ideas(self, keywords: str, industry: str, num_ideas: int) -> list:
+        """Synchronous wrapper for callers outside the event loop"""
+        return asyncio.run(self.generate_business_ideas_async(keywords, industry, num_ideas))
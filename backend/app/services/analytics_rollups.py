@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.services.db_service import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+class RollupReconciler:
+    """
+    Background task maintaining the analytics rollups.
+
+    Every ``ANALYTICS_FOLD_SECONDS`` it folds the deltas recorded by
+    writers into platform_stats/industry_stats; every
+    ``ANALYTICS_RECONCILE_SECONDS`` it also corrects drift against the
+    source tables (e.g. rows changed outside the app).
+
+    Folds are safe to run concurrently. Two reconciles at once could both
+    record the same correction (until the next one), so the prefork server
+    runs this task in its first worker only.
+    """
+
+    enabled = True
+    _task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def reconcile(full: bool):
+        db = SessionLocal()
+        try:
+            if full:
+                DatabaseService.reconcile_platform_stats(db)
+            else:
+                DatabaseService.fold_stats_deltas(db)
+        finally:
+            db.close()
+
+    @classmethod
+    async def run(cls):
+        reconciled_at = None
+        while True:
+            now = time.monotonic()
+            full = settings.ANALYTICS_RECONCILE_SECONDS > 0 and (
+                reconciled_at is None or now - reconciled_at >= settings.ANALYTICS_RECONCILE_SECONDS
+            )
+            try:
+                await run_in_threadpool(cls.reconcile, full)
+                if full:
+                    reconciled_at = now
+            except Exception:
+                logger.exception("Rollup reconcile failed" if full else "Rollup fold failed")
+            await asyncio.sleep(settings.ANALYTICS_FOLD_SECONDS)
+
+    @classmethod
+    def start(cls):
+        if cls.enabled and settings.ANALYTICS_FOLD_SECONDS > 0 and cls._task is None:
+            cls._task = asyncio.create_task(cls.run())
+
+    @classmethod
+    async def stop(cls):
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
@@ -1,24 +1,137 @@
  
+import asyncio
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from typing import Optional, Tuple
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.services import password_worker
+
+logger = logging.getLogger(__name__)
+
+# Authenticated users resolved by get_current_user, keyed by username.
+# Per-process: other workers only see a deactivation once their TTL expires.
+user_cache = TTLCache(
+    maxsize=settings.AUTH_USER_CACHE_SIZE,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
+
+# Claims of already-verified tokens. Each entry expires at the token's own
+# ``exp`` claim, so a cached token is never accepted past its lifetime.
+token_cache = TTLCache(
+    maxsize=settings.JWT_CACHE_MAX_ENTRIES,
+    ttl=settings.JWT_CACHE_DEFAULT_TTL_SECONDS
+)
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing queue is full"""
+
+
+class PasswordHasher:
+    """
+    Bounded process pool for bcrypt work.
+
+    Hashing runs in separate processes so a burst of logins cannot starve
+    the event loop or the request threadpool. At most
+    ``PASSWORD_HASH_MAX_QUEUE`` jobs may be pending; beyond that callers
+    get ``PasswordHasherBusy`` instead of queueing indefinitely.
+    """
+    
+    _executor: Optional[ProcessPoolExecutor] = None
+    _pending = 0
+    _lock = threading.Lock()
+    
+    @classmethod
+    def get_executor(cls) -> ProcessPoolExecutor:
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    initializer=password_worker.init_worker,
+                    initargs=(settings.PASSWORD_HASH_NICENESS,)
+                )
+            return cls._executor
+    
+    @classmethod
+    def submit(cls, fn, *args):
+        executor = cls.get_executor()
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # A hash process died (e.g. OOM-killed), which breaks the whole
+            # pool; replace it unless another caller already did
+            logger.warning("Password hashing pool broken, restarting it")
+            with cls._lock:
+                if cls._executor is executor:
+                    cls._executor = None
+            executor.shutdown(wait=False)
+            return cls.get_executor().submit(fn, *args)
+    
+    @classmethod
+    def shutdown(cls):
+        with cls._lock:
+            if cls._executor is not None:
+                # Waits for the hash processes to exit (see PDFJobManager.shutdown)
+                cls._executor.shutdown(wait=True, cancel_futures=True)
+                cls._executor = None
+    
+    @classmethod
+    async def run(cls, fn, *args):
+        with cls._lock:
+            if cls._pending >= settings.PASSWORD_HASH_MAX_QUEUE:
+                raise PasswordHasherBusy()
+            cls._pending += 1
+        try:
+            return await asyncio.wrap_future(cls.submit(fn, *args))
+        finally:
+            with cls._lock:
+                cls._pending -= 1
+    
+    @classmethod
+    def stats(cls) -> dict:
+        return {
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "pending": cls._pending,
+            "max_queue": settings.PASSWORD_HASH_MAX_QUEUE
+        }
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 class AuthService:
     @staticmethod
     def hash_password(password: str) -> str:
-        return pwd_context.hash(password)
+        return password_worker.get_context(settings.BCRYPT_ROUNDS).hash(password)
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+        return password_worker.get_context(settings.BCRYPT_ROUNDS).verify(plain_password, hashed_password)
+    
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """Hash a password in the password process pool"""
+        return await PasswordHasher.run(
+            password_worker.hash_password, password, settings.BCRYPT_ROUNDS
+        )
+    
+    @staticmethod
+    async def verify_and_update_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password in the password process pool.
+        
+        Returns ``(valid, new_hash)``; ``new_hash`` is set when the stored
+        hash was made with a different work factor than ``BCRYPT_ROUNDS``.
+        """
+        return await PasswordHasher.run(
+            password_worker.verify_and_update, plain_password, hashed_password, settings.BCRYPT_ROUNDS
+        )
     
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+        # jose is imported on first use to keep worker startup light
+        from jose import jwt
+        
         to_encode = data.copy()
         if expires_delta:
             expire = datetime.utcnow() + expires_delta
@@ -30,12 +143,33 @@ class AuthService:
         return encoded_jwt
     
     @staticmethod
-    def decode_token(token: str) -> Optional[str]:
+    def decode_claims(token: str) -> Optional[dict]:
+        """
+        Verify a token and return its claims, using the verified-token cache
+        """
+        payload = token_cache.get(token)
+        if payload is not None:
+            return payload
+        
+        from jose import JWTError, jwt
+        
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-            username: str = payload.get("sub")
-            if username is None:
-                return None
-            return username
         except JWTError:
-            return None
\ No newline at end of file
+            return None
+        
+        # Oversized tokens are still accepted, just never cached
+        if len(token) <= settings.JWT_CACHE_MAX_TOKEN_LENGTH:
+            exp = payload.get("exp")
+            token_cache.set(token, payload, expires_at=float(exp) if exp is not None else None)
+        return payload
+    
+    @staticmethod
+    def decode_token(token: str) -> Optional[str]:
+        payload = AuthService.decode_claims(token)
+        if payload is None:
+            return None
+        username: str = payload.get("sub")
+        if username is None:
+            return None
+        return username
\ No newline at end of file
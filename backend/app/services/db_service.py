@@ -1,29 +1,90 @@
  
+from collections import Counter
+from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models.models import User, Idea, SearchHistory
+from sqlalchemy import case, delete, false, func, insert, select, true, tuple_, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.models import User, Idea, SearchHistory, PlatformStats, IndustryStats, StatsDelta
 from app.schemas.schemas import IdeaCreate, UserCreate
-from app.services.auth_service import AuthService
-from typing import List, Optional
+from app.services.auth_service import AuthService, user_cache
+from app.services.search_service import SearchService
+from typing import Iterator, List, Optional, Tuple
+
+# Columns of schemas.Idea, for reads that skip building ORM objects
+IDEA_COLUMNS = [
+    Idea.id,
+    Idea.user_id,
+    Idea.title,
+    Idea.description,
+    Idea.business_model,
+    Idea.target_audience,
+    Idea.swot_analysis,
+    Idea.market_potential,
+    Idea.industry,
+    Idea.keywords,
+    Idea.is_favorite,
+    Idea.created_at,
+    Idea.updated_at,
+]
+
+# Columns a user may change on an existing idea
+IDEA_UPDATABLE_FIELDS = (
+    "title",
+    "description",
+    "business_model",
+    "target_audience",
+    "swot_analysis",
+    "market_potential",
+    "industry",
+    "keywords",
+)
+
+# Ids per bulk statement, kept under SQLite's bound-parameter limit
+BULK_CHUNK_SIZE = 900
 
 class DatabaseService:
     
     # ===== USER OPERATIONS =====
     
     @staticmethod
-    def create_user(db: Session, user_data: UserCreate) -> User:
-        """Create a new user"""
-        hashed_password = AuthService.hash_password(user_data.password)
+    def create_user(db: Session, user_data: UserCreate, hashed_password: Optional[str] = None) -> User:
+        """Create a new user (pass ``hashed_password`` if it was already hashed)"""
+        if hashed_password is None:
+            hashed_password = AuthService.hash_password(user_data.password)
         db_user = User(
             username=user_data.username,
             email=user_data.email,
             hashed_password=hashed_password
         )
         db.add(db_user)
+        DatabaseService._record_stats_delta(db, users=1)
         db.commit()
         db.refresh(db_user)
+        user_cache.invalidate(db_user.username)
         return db_user
     
+    @staticmethod
+    def deactivate_user(db: Session, user_id: int) -> Optional[User]:
+        """Deactivate a user and drop them from the auth cache"""
+        db_user = db.query(User).filter(User.id == user_id).first()
+        
+        if db_user:
+            db_user.is_active = False
+            db.commit()
+            db.refresh(db_user)
+            user_cache.invalidate(db_user.username)
+        
+        return db_user
+    
+    @staticmethod
+    def update_password_hash(db: Session, user_id: int, hashed_password: str):
+        """Replace a user's stored password hash (used for rehash-on-login)"""
+        db.query(User).filter(User.id == user_id).update(
+            {User.hashed_password: hashed_password},
+            synchronize_session=False
+        )
+        db.commit()
+    
     @staticmethod
     def get_user_by_username(db: Session, username: str) -> Optional[User]:
         """Get user by username"""
@@ -51,14 +112,88 @@ class DatabaseService:
             keywords=idea_data.keywords
         )
         db.add(db_idea)
+        DatabaseService._record_idea_stats(db, Counter([idea_data.industry]))
         db.commit()
         db.refresh(db_idea)
+        SearchService.on_ideas_saved(db, [db_idea])
         return db_idea
     
     @staticmethod
-    def get_user_ideas(db: Session, user_id: int, skip: int = 0, limit: int = 10) -> List[Idea]:
-        """Get all ideas for a user"""
-        return db.query(Idea).filter(Idea.user_id == user_id).offset(skip).limit(limit).all()
+    def create_ideas_bulk(
+        db: Session,
+        user_id: int,
+        ideas_data: List[IdeaCreate]
+    ) -> List[Idea]:
+        """
+        Create several ideas in one transaction. Uses a multi-row
+        INSERT ... RETURNING where the dialect supports it, so the returned
+        rows are fully populated without a per-row refresh.
+        """
+        rows = [
+            {"user_id": user_id, **idea_data.model_dump()}
+            for idea_data in ideas_data
+        ]
+        
+        db_ideas = []
+        if rows:
+            if db.get_bind().dialect.insert_executemany_returning:
+                db_ideas = list(db.scalars(insert(Idea).returning(Idea, sort_by_parameter_order=True), rows))
+            else:
+                db_ideas = [Idea(**row) for row in rows]
+                db.add_all(db_ideas)
+                db.flush()
+        
+        DatabaseService._record_idea_stats(db, Counter(row["industry"] for row in rows))
+        DatabaseService._commit_without_expire(db)
+        SearchService.on_ideas_saved(db, db_ideas)
+        return db_ideas
+    
+    @staticmethod
+    def _commit_without_expire(db: Session):
+        """Commit while keeping already-loaded attributes (skips the refresh round trips)"""
+        expire_on_commit = db.expire_on_commit
+        db.expire_on_commit = False
+        try:
+            db.commit()
+        finally:
+            db.expire_on_commit = expire_on_commit
+    
+    @staticmethod
+    def get_user_ideas(
+        db: Session,
+        user_id: int,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Idea]:
+        """
+        Get a page of a user's ideas, newest first.
+        
+        Keyset pagination: ``after`` is the (created_at, id) of the last idea
+        on the previous page, so every page is an index range scan on
+        (user_id, created_at, id) regardless of depth.
+        """
+        return db.scalars(DatabaseService._user_ideas_page(select(Idea), user_id, limit, after)).all()
+    
+    @staticmethod
+    def get_user_idea_rows(
+        db: Session,
+        user_id: int,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[dict]:
+        """
+        ``get_user_ideas`` as plain dicts read straight from the row tuples,
+        for responses serialized without ORM objects or pydantic validation
+        """
+        stmt = DatabaseService._user_ideas_page(select(*IDEA_COLUMNS), user_id, limit, after)
+        return [dict(row) for row in db.execute(stmt).mappings()]
+    
+    @staticmethod
+    def _user_ideas_page(stmt, user_id: int, limit: int, after: Optional[Tuple[datetime, int]]):
+        stmt = stmt.where(Idea.user_id == user_id)
+        if after is not None:
+            stmt = stmt.where(tuple_(Idea.created_at, Idea.id) < tuple_(*after))
+        return stmt.order_by(Idea.created_at.desc(), Idea.id.desc()).limit(limit)
     
     @staticmethod
     def get_idea_by_id(db: Session, idea_id: int, user_id: int) -> Optional[Idea]:
@@ -69,50 +204,192 @@ class DatabaseService:
         ).first()
     
     @staticmethod
-    def update_idea(db: Session, idea_id: int, user_id: int, update_data: dict) -> Optional[Idea]:
-        """Update an idea"""
-        db_idea = db.query(Idea).filter(
-            Idea.id == idea_id,
+    def get_idea_titles(db: Session, idea_ids: List[int], user_id: int) -> List[Tuple[int, str]]:
+        """Get (id, title) for the user's ideas among ``idea_ids`` in one IN query"""
+        return db.query(Idea.id, Idea.title).filter(
+            Idea.id.in_(idea_ids),
             Idea.user_id == user_id
-        ).first()
+        ).order_by(Idea.id).all()
+    
+    @staticmethod
+    def iter_ideas_by_ids(db: Session, idea_ids: List[int], user_id: int, chunk_size: int = 50) -> Iterator[List[Idea]]:
+        """Stream the user's ideas among ``idea_ids`` in chunks from a single IN query"""
+        result = db.execute(
+            select(Idea).where(
+                Idea.id.in_(idea_ids),
+                Idea.user_id == user_id
+            ).order_by(Idea.id).execution_options(yield_per=chunk_size)
+        )
+        for chunk in result.scalars().partitions():
+            yield chunk
+            # Drop the chunk from the identity map so memory stays bounded
+            for idea in chunk:
+                db.expunge(idea)
+    
+    @staticmethod
+    def update_idea(db: Session, idea_id: int, user_id: int, update_data: dict) -> Optional[dict]:
+        """
+        Update an idea in one UPDATE ... RETURNING; returns the updated row.
         
-        if db_idea:
-            for key, value in update_data.items():
-                if hasattr(db_idea, key) and value is not None:
-                    setattr(db_idea, key, value)
-            db.commit()
-            db.refresh(db_idea)
+        Only ``IDEA_UPDATABLE_FIELDS`` with a non-None value are applied.
+        """
+        values = {
+            key: value for key, value in update_data.items()
+            if key in IDEA_UPDATABLE_FIELDS and value is not None
+        }
+        if not values:
+            row = db.execute(
+                select(*IDEA_COLUMNS).where(Idea.id == idea_id, Idea.user_id == user_id)
+            ).mappings().first()
+            return dict(row) if row else None
         
-        return db_idea
+        industry_deltas = Counter()
+        if "industry" in values:
+            # The rollups need the industry the idea is moving out of
+            old_industry = DatabaseService._select_for_update(
+                db, select(Idea.industry).where(Idea.id == idea_id, Idea.user_id == user_id)
+            ).first()
+            if old_industry is not None:
+                industry_deltas[old_industry.industry] -= 1
+                industry_deltas[values["industry"]] += 1
+        
+        rows = DatabaseService._mutate_ideas(db, update(Idea).values(**values), user_id, [idea_id], IDEA_COLUMNS)
+        if not rows:
+            db.rollback()
+            return None
+        
+        DatabaseService._record_idea_stats(db, industry_deltas)
+        db.commit()
+        SearchService.on_ideas_saved(db, rows)
+        return dict(rows[0]._mapping)
     
     @staticmethod
     def delete_idea(db: Session, idea_id: int, user_id: int) -> bool:
-        """Delete an idea"""
-        db_idea = db.query(Idea).filter(
-            Idea.id == idea_id,
-            Idea.user_id == user_id
-        ).first()
+        """Delete an idea in one DELETE ... RETURNING"""
+        rows = DatabaseService._mutate_ideas(db, delete(Idea), user_id, [idea_id], [Idea.industry])
+        if not rows:
+            db.rollback()
+            return False
         
-        if db_idea:
-            db.delete(db_idea)
-            db.commit()
-            return True
-        return False
+        DatabaseService._record_idea_stats(db, Counter({rows[0].industry: -1}))
+        db.commit()
+        SearchService.on_ideas_deleted(db, user_id, [idea_id])
+        return True
     
     @staticmethod
-    def toggle_favorite(db: Session, idea_id: int, user_id: int) -> Optional[Idea]:
-        """Toggle favorite status of an idea"""
-        db_idea = db.query(Idea).filter(
-            Idea.id == idea_id,
-            Idea.user_id == user_id
-        ).first()
+    def toggle_favorite(db: Session, idea_id: int, user_id: int) -> Optional[dict]:
+        """
+        Toggle favorite status of an idea; returns the updated row.
         
-        if db_idea:
-            db_idea.is_favorite = not db_idea.is_favorite
-            db.commit()
-            db.refresh(db_idea)
+        The flip happens in SQL (``is_favorite = is_favorite IS NOT TRUE``), so
+        concurrent toggles can't overwrite each other.
+        """
+        # IS NOT TRUE rather than NOT, so a NULL flag toggles to true
+        stmt = update(Idea).values(is_favorite=Idea.is_favorite.is_not(True))
+        rows = DatabaseService._mutate_ideas(db, stmt, user_id, [idea_id], IDEA_COLUMNS)
+        if not rows:
+            db.rollback()
+            return None
         
-        return db_idea
+        db.commit()
+        return dict(rows[0]._mapping)
+    
+    # ===== BULK IDEA OPERATIONS =====
+    # Each chunk of ids is one UPDATE/DELETE scoped to the user, returning
+    # the rows it touched; the whole request is a single transaction.
+    
+    @staticmethod
+    def bulk_delete_ideas(db: Session, user_id: int, idea_ids: List[int]) -> List[int]:
+        """Delete the user's ideas among ``idea_ids``; returns the ids deleted"""
+        deleted = []
+        industry_deltas = Counter()
+        for chunk in DatabaseService._id_chunks(idea_ids):
+            rows = DatabaseService._mutate_ideas(db, delete(Idea), user_id, chunk, [Idea.id, Idea.industry])
+            for row in rows:
+                deleted.append(row.id)
+                industry_deltas[row.industry] -= 1
+    
+        DatabaseService._record_idea_stats(db, industry_deltas)
+        db.commit()
+        SearchService.on_ideas_deleted(db, user_id, deleted)
+        return deleted
+    
+    @staticmethod
+    def bulk_set_favorite(db: Session, user_id: int, idea_ids: List[int], is_favorite: bool) -> List[int]:
+        """Set ``is_favorite`` on the user's ideas among ``idea_ids``; returns the ids updated"""
+        updated = []
+        stmt = update(Idea).values(is_favorite=is_favorite)
+        for chunk in DatabaseService._id_chunks(idea_ids):
+            updated.extend(row.id for row in DatabaseService._mutate_ideas(db, stmt, user_id, chunk, [Idea.id]))
+        db.commit()
+        return updated
+    
+    @staticmethod
+    def bulk_update_ideas(db: Session, user_id: int, idea_ids: List[int], changes: dict) -> List[int]:
+        """
+        Apply the same field changes to the user's ideas among ``idea_ids``;
+        returns the ids updated. Only ``IDEA_UPDATABLE_FIELDS`` with a
+        non-None value are applied.
+        """
+        values = {
+            key: value for key, value in changes.items()
+            if key in IDEA_UPDATABLE_FIELDS and value is not None
+        }
+        if not values:
+            return []
+    
+        updated_rows = []
+        industry_deltas = Counter()
+        stmt = update(Idea).values(**values)
+        for chunk in DatabaseService._id_chunks(idea_ids):
+            if "industry" in values:
+                # Moving ideas between industries: the rollups need the old
+                # industry of each row, which UPDATE ... RETURNING can't give.
+                # Counted here rather than with GROUP BY, which PostgreSQL
+                # does not allow together with FOR UPDATE.
+                old = DatabaseService._select_for_update(
+                    db, select(Idea.id, Idea.industry).where(
+                        Idea.user_id == user_id,
+                        Idea.id.in_(chunk)
+                    )
+                ).all()
+                for industry, count in Counter(row.industry for row in old).items():
+                    industry_deltas[industry] -= count
+                    industry_deltas[values["industry"]] += count
+            updated_rows.extend(DatabaseService._mutate_ideas(db, stmt, user_id, chunk, IDEA_COLUMNS))
+    
+        DatabaseService._record_idea_stats(db, industry_deltas)
+        db.commit()
+        SearchService.on_ideas_saved(db, updated_rows)
+        return [row.id for row in updated_rows]
+    
+    @staticmethod
+    def _id_chunks(idea_ids: List[int]) -> Iterator[List[int]]:
+        # Deduplicated, in request order
+        unique_ids = list(dict.fromkeys(idea_ids))
+        for start in range(0, len(unique_ids), BULK_CHUNK_SIZE):
+            yield unique_ids[start:start + BULK_CHUNK_SIZE]
+    
+    @staticmethod
+    def _mutate_ideas(db: Session, stmt, user_id: int, idea_ids: List[int], columns: list) -> list:
+        """
+        Run an UPDATE/DELETE on the user's ideas among ``idea_ids`` and
+        return ``columns`` of the affected rows (post-update values) via
+        RETURNING. Dialects without RETURNING read the rows in a separate
+        SELECT: before a DELETE, after an UPDATE.
+        """
+        conditions = (Idea.user_id == user_id, Idea.id.in_(idea_ids))
+        stmt = stmt.where(*conditions).execution_options(synchronize_session=False)
+        dialect = db.get_bind().dialect
+        if dialect.delete_returning if stmt.is_delete else dialect.update_returning:
+            return db.execute(stmt.returning(*columns)).all()
+        
+        if stmt.is_delete:
+            rows = db.execute(select(*columns).where(*conditions).with_for_update()).all()
+            db.execute(stmt)
+            return rows
+        db.execute(stmt)
+        return db.execute(select(*columns).where(*conditions)).all()
     
     # ===== SEARCH HISTORY OPERATIONS =====
     
@@ -129,6 +406,13 @@ class DatabaseService:
         db.commit()
         return search
     
+    @staticmethod
+    def create_search_history_bulk(db: Session, rows: List[dict]):
+        """Insert many search history rows in one executemany INSERT"""
+        if rows:
+            db.execute(insert(SearchHistory), rows)
+            db.commit()
+    
     @staticmethod
     def get_user_search_history(db: Session, user_id: int) -> List[SearchHistory]:
         """Get user's search history"""
@@ -139,36 +423,225 @@ class DatabaseService:
     # ===== ANALYTICS OPERATIONS =====
     
     @staticmethod
-    def get_user_analytics(db: Session, user_id: int) -> dict:
-        """Get user analytics"""
-        total_ideas = db.query(func.count(Idea.id)).filter(Idea.user_id == user_id).scalar()
-        favorite_ideas = db.query(func.count(Idea.id)).filter(
-            Idea.user_id == user_id,
-            Idea.is_favorite == True
-        ).scalar()
+    def get_user_analytics(db: Session, user_id: int, history_limit: int = 10) -> dict:
+        """
+        Get user analytics and the latest search history in one round trip.
+        
+        Idea totals come from a single conditional aggregate; the history is
+        limited in SQL (served by the (user_id, created_at DESC) index) and
+        LEFT JOINed onto the counts so a user without history still gets
+        one row.
+        """
+        counts = select(
+            func.count(Idea.id).label("total_ideas"),
+            func.coalesce(
+                func.sum(case((Idea.is_favorite == True, 1), else_=0)), 0
+            ).label("favorite_ideas")
+        ).where(Idea.user_id == user_id).subquery()
+        
+        history = select(
+            SearchHistory.keywords,
+            SearchHistory.industry,
+            SearchHistory.num_ideas,
+            SearchHistory.created_at
+        ).where(
+            SearchHistory.user_id == user_id
+        ).order_by(SearchHistory.created_at.desc()).limit(history_limit).subquery()
+        
+        rows = db.execute(
+            select(counts, history).select_from(
+                counts.outerjoin(history, true())
+            ).order_by(history.c.created_at.desc())
+        ).all()
         
         return {
-            "total_ideas": total_ideas,
-            "favorite_ideas": favorite_ideas,
-            "user_id": user_id
+            "total_ideas": rows[0].total_ideas,
+            "favorite_ideas": rows[0].favorite_ideas,
+            "user_id": user_id,
+            "search_history": [
+                {
+                    "keywords": row.keywords,
+                    "industry": row.industry,
+                    "num_ideas": row.num_ideas,
+                    "created_at": row.created_at
+                }
+                for row in rows
+                if row.created_at is not None
+            ]
         }
     
     @staticmethod
     def get_platform_analytics(db: Session) -> dict:
-        """Get platform-wide analytics"""
-        total_users = db.query(func.count(User.id)).scalar()
-        total_ideas = db.query(func.count(Idea.id)).scalar()
+        """
+        Get platform-wide analytics from the precomputed rollups plus the
+        deltas not folded into them yet (each read in one statement, so a
+        concurrent fold is never half seen)
+        """
+        total_users, total_ideas = db.execute(select(
+            func.coalesce(select(PlatformStats.total_users).where(PlatformStats.id == 1).scalar_subquery(), 0)
+            + func.coalesce(select(func.sum(StatsDelta.users)).scalar_subquery(), 0),
+            func.coalesce(select(PlatformStats.total_ideas).where(PlatformStats.id == 1).scalar_subquery(), 0)
+            + func.coalesce(select(func.sum(StatsDelta.ideas)).scalar_subquery(), 0)
+        )).one()
         
         # Most popular industries
-        popular_industries = db.query(
-            Idea.industry,
-            func.count(Idea.id).label('count')
-        ).group_by(Idea.industry).order_by(func.count(Idea.id).desc()).limit(5).all()
+        counts = union_all(
+            select(IndustryStats.industry, IndustryStats.idea_count),
+            select(StatsDelta.industry, StatsDelta.ideas).where(StatsDelta.industry.is_not(None))
+        ).subquery()
+        idea_count = func.sum(counts.c.idea_count)
+        popular_industries = db.execute(
+            select(counts.c.industry, idea_count)
+            .group_by(counts.c.industry)
+            .having(idea_count > 0)
+            .order_by(idea_count.desc())
+            .limit(5)
+        ).all()
         
         return {
             "total_users": total_users,
             "total_ideas": total_ideas,
             "popular_industries": [
-                {"industry": ind[0], "count": ind[1]} for ind in popular_industries
+                {"industry": ind[0] or None, "count": ind[1]} for ind in popular_industries
             ]
-        }
\ No newline at end of file
+        }
+    
+    # ===== ANALYTICS ROLLUPS =====
+    # platform_stats / industry_stats hold the analytics counters. Writers
+    # don't update them: they append their changes to stats_deltas in the
+    # same transaction (plain inserts, which don't wait on each other), and
+    # the reconciler folds the deltas into the rollups every few seconds.
+    # Readers add the pending deltas to the rollups, so counts stay exact.
+    
+    @staticmethod
+    def _record_stats_delta(db: Session, users: int = 0, ideas: int = 0):
+        """Record a change to the platform totals only"""
+        db.execute(insert(StatsDelta).values(industry=None, users=users, ideas=ideas))
+    
+    @staticmethod
+    def _record_idea_stats(db: Session, industry_deltas: Counter):
+        """Record per-industry idea count deltas (their sum goes to the platform total)"""
+        deltas = Counter()
+        for industry, delta in industry_deltas.items():
+            deltas[industry or ""] += delta
+        rows = [
+            {"industry": industry, "users": 0, "ideas": delta}
+            for industry, delta in deltas.items() if delta
+        ]
+        if rows:
+            db.execute(insert(StatsDelta), rows)
+    
+    @staticmethod
+    def _select_for_update(db: Session, stmt):
+        """
+        Run ``stmt`` with FOR UPDATE. SQLite ignores FOR UPDATE, so there a
+        no-op write first takes its database write lock: concurrent
+        read-then-write transactions then read in turn.
+        """
+        if db.get_bind().dialect.name == "sqlite":
+            db.execute(update(StatsDelta).where(false()).values(users=StatsDelta.users))
+        return db.execute(stmt.with_for_update())
+    
+    @staticmethod
+    def _upsert_increment(db: Session, model, key: dict, increments: dict):
+        """INSERT key + increments, or add the increments to the existing row"""
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = dialect_insert(model).values(**key, **increments)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(key),
+                set_={
+                    column: getattr(model, column) + stmt.excluded[column]
+                    for column in increments
+                }
+            )
+            db.execute(stmt)
+            return
+        
+        conditions = [getattr(model, column) == value for column, value in key.items()]
+        result = db.execute(
+            update(model).where(*conditions).values({
+                column: getattr(model, column) + delta
+                for column, delta in increments.items()
+            })
+        )
+        if result.rowcount == 0:
+            db.execute(insert(model).values(**key, **increments))
+    
+    @staticmethod
+    def fold_stats_deltas(db: Session) -> int:
+        """
+        Move the pending deltas into the rollups in one transaction; returns
+        how many were folded. Deltas are claimed with DELETE ... RETURNING,
+        so concurrent folds never apply one twice.
+        """
+        rows = db.execute(
+            delete(StatsDelta).returning(StatsDelta.industry, StatsDelta.users, StatsDelta.ideas)
+        ).all()
+        if not rows:
+            db.rollback()
+            return 0
+        
+        users = ideas = 0
+        industries = Counter()
+        for row in rows:
+            users += row.users
+            ideas += row.ideas
+            if row.industry is not None:
+                industries[row.industry] += row.ideas
+        
+        if users or ideas:
+            DatabaseService._upsert_increment(
+                db, PlatformStats, {"id": 1}, {"total_users": users, "total_ideas": ideas}
+            )
+        for industry, delta in industries.items():
+            if delta:
+                DatabaseService._upsert_increment(db, IndustryStats, {"industry": industry}, {"idea_count": delta})
+        # Industries left without ideas
+        db.execute(delete(IndustryStats).where(IndustryStats.idea_count == 0))
+        db.commit()
+        return len(rows)
+    
+    @staticmethod
+    def reconcile_platform_stats(db: Session):
+        """
+        Correct drift between the rollups and the users and ideas tables,
+        then fold.
+        
+        Each comparison is one statement, so the source counts, rollups and
+        pending deltas are read from the same snapshot, without locks. The
+        difference is recorded as a correction delta, which adds up with
+        concurrent writers' deltas instead of overwriting them.
+        """
+        users_drift, ideas_drift = db.execute(select(
+            select(func.count(User.id)).scalar_subquery()
+            - func.coalesce(select(PlatformStats.total_users).where(PlatformStats.id == 1).scalar_subquery(), 0)
+            - func.coalesce(select(func.sum(StatsDelta.users)).scalar_subquery(), 0),
+            select(func.count(Idea.id)).scalar_subquery()
+            - func.coalesce(select(PlatformStats.total_ideas).where(PlatformStats.id == 1).scalar_subquery(), 0)
+            - func.coalesce(select(func.sum(StatsDelta.ideas)).scalar_subquery(), 0)
+        )).one()
+        
+        industry = func.coalesce(Idea.industry, "")
+        counts = union_all(
+            select(industry, func.count(Idea.id)).group_by(industry),
+            select(IndustryStats.industry, -IndustryStats.idea_count),
+            select(StatsDelta.industry, -StatsDelta.ideas).where(StatsDelta.industry.is_not(None))
+        ).subquery()
+        industry_column, drift_column = counts.c
+        drift = func.sum(drift_column)
+        industry_drift = Counter(dict(db.execute(
+            select(industry_column, drift).group_by(industry_column).having(drift != 0)
+        ).all()))
+        
+        # The industry corrections carry their part of the ideas drift
+        ideas_drift -= sum(industry_drift.values())
+        if users_drift or ideas_drift:
+            DatabaseService._record_stats_delta(db, users=users_drift, ideas=ideas_drift)
+        DatabaseService._record_idea_stats(db, industry_drift)
+        db.commit()
+        
+        DatabaseService.fold_stats_deltas(db)
+        db.execute(update(PlatformStats).where(PlatformStats.id == 1).values(reconciled_at=datetime.utcnow()))
+        db.commit()
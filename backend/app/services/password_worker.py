@@ -0,0 +1,41 @@
+"""
+Functions executed inside the password hashing process pool.
+
+Kept free of app imports so it stays cheap to load in worker processes.
+passlib is only imported when a hashing context is first needed.
+"""
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+def init_worker(niceness: int):
+    """Lower worker priority so hashing yields CPU to request handling"""
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+
+
+@lru_cache(maxsize=None)
+def get_context(rounds: int) -> "CryptContext":
+    from passlib.context import CryptContext
+
+    # Pinning min/max to the configured rounds makes any hash with a
+    # different work factor "need update", in both directions.
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds
+    )
+
+
+def hash_password(password: str, rounds: int) -> str:
+    return get_context(rounds).hash(password)
+
+
+def verify_and_update(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    return get_context(rounds).verify_and_update(password, hashed_password)
@@ -0,0 +1,299 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sweeps list the whole job directory, so polls don't each run one
+SWEEP_INTERVAL_SECONDS = 30.0
+
+# ===== JOB STATE =====
+# A job is two files in the job directory: ``<id>.json`` with its state and
+# ``<id>.pdf`` with the output. Every server worker (and the render process)
+# reads and writes the same files, so a job can be polled and downloaded
+# from any worker, and outlives the worker that accepted it.
+
+JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+def job_dir() -> str:
+    path = settings.PDF_JOB_DIR or os.path.join(tempfile.gettempdir(), "pdf_jobs")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class PDFJob:
+    FIELDS = ("id", "user_id", "template", "filename", "status", "error", "created_at", "finished_at", "pid")
+
+    def __init__(self, user_id: int, template: str, filename: str, **state):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.template = template
+        self.filename = filename
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        # Server worker that holds the job's future
+        self.pid = os.getpid()
+        self.__dict__.update(state)
+        self.future: Optional[Future] = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(job_dir(), f"{self.id}.pdf")
+
+    @property
+    def state_path(self) -> str:
+        return os.path.join(job_dir(), f"{self.id}.json")
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def save(self):
+        # Written aside and renamed, so readers never see a partial file
+        temp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as output:
+            json.dump({field: getattr(self, field) for field in self.FIELDS}, output)
+        os.replace(temp_path, self.state_path)
+
+    @classmethod
+    def load(cls, job_id: str) -> Optional["PDFJob"]:
+        if not JOB_ID_PATTERN.fullmatch(job_id):
+            return None
+        try:
+            with open(os.path.join(job_dir(), f"{job_id}.json")) as state_file:
+                state = json.load(state_file)
+        except (OSError, ValueError):
+            return None
+        job = cls(**state)
+        if job.active and job.pid != os.getpid() and not process_alive(job.pid):
+            # Killed before it could record the outcome
+            job.status = "failed"
+            job.error = "Server worker exited before the job finished"
+        return job
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "filename": self.filename,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+# ===== WORKER PROCESS SIDE =====
+
+def init_worker():
+    """Drop DB connections inherited from the parent process on fork"""
+    from app.db.database import engine
+    engine.dispose(close=False)
+
+def render_export(job_id: str, user_id: int, idea_ids: List[int], template: str, output_path: str) -> int:
+    """
+    Render one or more of a user's ideas to ``output_path``.
+
+    Runs inside the rendering pool. A single id produces the regular
+    business plan; several ids produce the combined document. Returns the
+    number of ideas rendered.
+    """
+    from app.db.database import SessionLocal
+    from app.services.db_service import DatabaseService
+    from app.services.pdf_service import PDFService
+
+    job = PDFJob.load(job_id)
+    if job is not None:
+        job.status = "running"
+        job.save()
+
+    db = SessionLocal()
+    try:
+        if len(idea_ids) == 1:
+            idea = DatabaseService.get_idea_by_id(db, idea_ids[0], user_id)
+            if not idea:
+                raise LookupError("Idea not found")
+            pdf_bytes = PDFService.generate_business_plan_pdf(PDFService.idea_to_dict(idea), template)
+            with open(output_path, "wb") as output:
+                output.write(pdf_bytes)
+            return 1
+
+        toc = DatabaseService.get_idea_titles(db, idea_ids, user_id)
+        if not toc:
+            raise LookupError("No ideas found")
+        idea_chunks = (
+            [PDFService.idea_to_dict(idea) for idea in chunk]
+            for chunk in DatabaseService.iter_ideas_by_ids(db, [idea_id for idea_id, _ in toc], user_id)
+        )
+        with open(output_path, "wb") as output:
+            PDFService.get_template(template).render_combined(toc, idea_chunks, output)
+        return len(toc)
+    finally:
+        db.close()
+
+# ===== API PROCESS SIDE =====
+
+class PDFJobRejected(Exception):
+    """Raised when a job cannot be queued (per-user limit or queue full)"""
+
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+class PDFJobManager:
+    """
+    Process-pool PDF rendering farm.
+
+    ReportLab rendering is CPU-bound pure Python, so it runs in a pool of
+    ``PDF_RENDER_WORKERS`` processes instead of the request threadpool.
+    Admission is bounded per user (``PDF_JOBS_PER_USER``) and globally
+    (``PDF_JOB_QUEUE_DEPTH``); rejected jobs raise ``PDFJobRejected``.
+    All three are node-wide: prefork workers each get a share.
+
+    Job state is kept in ``PDF_JOB_DIR`` (see ``PDFJob``), so any server
+    worker can report on and serve any job. Finished jobs, failed ones
+    included, are kept for ``PDF_JOB_TTL_SECONDS`` and swept on submit and
+    poll.
+    """
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    # Unfinished jobs accepted by this server worker
+    _active: Dict[str, PDFJob] = {}
+    _lock = threading.Lock()
+    _swept_at = 0.0
+
+    @classmethod
+    def get_executor(cls) -> ProcessPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ProcessPoolExecutor(
+                max_workers=settings.PDF_RENDER_WORKERS,
+                initializer=init_worker
+            )
+        return cls._executor
+
+    @classmethod
+    def submit(cls, user_id: int, idea_ids: List[int], template: str, filename: str) -> PDFJob:
+        cls.sweep()
+        with cls._lock:
+            active = list(cls._active.values())
+            if len(active) >= settings.PDF_JOB_QUEUE_DEPTH:
+                raise PDFJobRejected("PDF rendering queue is full", retry_after=5)
+            if sum(1 for job in active if job.user_id == user_id) >= settings.PDF_JOBS_PER_USER:
+                raise PDFJobRejected("Too many PDF exports in progress", retry_after=2)
+
+            job = PDFJob(user_id, template, filename)
+            job.save()
+            args = (job.id, user_id, idea_ids, template, job.path)
+            try:
+                job.future = cls.get_executor().submit(render_export, *args)
+            except BrokenProcessPool:
+                # A render process died (e.g. OOM-killed), which breaks the
+                # whole pool; its jobs have failed, start a fresh one
+                logger.warning("PDF rendering pool broken, restarting it")
+                cls._executor.shutdown(wait=False)
+                cls._executor = None
+                job.future = cls.get_executor().submit(render_export, *args)
+            cls._active[job.id] = job
+        # Runs before any waiter is woken, so ``job`` is up to date by then
+        job.future.add_done_callback(lambda future: cls._finish(job, future))
+        return job
+
+    @classmethod
+    def _finish(cls, job: PDFJob, future: Future):
+        job.finished_at = time.time()
+        if future.cancelled():
+            job.status, job.error = "failed", "Cancelled"
+        elif future.exception() is not None:
+            job.status, job.error = "failed", str(future.exception())
+        else:
+            job.status = "done"
+        try:
+            job.save()
+        except OSError:
+            logger.exception("Could not record PDF job state", extra={"job_id": job.id})
+        with cls._lock:
+            cls._active.pop(job.id, None)
+
+    @classmethod
+    async def wait(cls, job: PDFJob) -> PDFJob:
+        """Wait for a job without blocking the event loop"""
+        try:
+            await asyncio.wrap_future(job.future)
+        except Exception:
+            pass
+        return job
+
+    @classmethod
+    def get(cls, job_id: str, user_id: int) -> Optional[PDFJob]:
+        cls.sweep()
+        job = PDFJob.load(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    @classmethod
+    def discard(cls, job_id: str):
+        directory = job_dir()
+        for name in (f"{job_id}.pdf", f"{job_id}.json"):
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+    @classmethod
+    def sweep(cls):
+        """
+        Drop jobs (and their files) finished more than PDF_JOB_TTL_SECONDS
+        ago, or whose worker died that long after creating them. Runs at
+        most every SWEEP_INTERVAL_SECONDS per process.
+        """
+        now = time.time()
+        if now - cls._swept_at < SWEEP_INTERVAL_SECONDS:
+            return
+        cls._swept_at = now
+        cutoff = now - settings.PDF_JOB_TTL_SECONDS
+        for name in os.listdir(job_dir()):
+            job_id, extension = os.path.splitext(name)
+            if extension != ".json":
+                continue
+            job = PDFJob.load(job_id)
+            if job is not None and not job.active and (job.finished_at or job.created_at) < cutoff:
+                cls.discard(job_id)
+
+    @classmethod
+    def shutdown(cls):
+        if cls._executor is not None:
+            # Queued jobs are rendered before the worker exits, so they
+            # survive recycling and rolling restarts. Also waits for the
+            # render processes: prefork workers leave with os._exit, which
+            # skips the interpreter's own wait and would orphan them
+            cls._executor.shutdown(wait=True)
+            cls._executor = None
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {
+            "workers": settings.PDF_RENDER_WORKERS,
+            "active": len(cls._active),
+            "retained": sum(1 for name in os.listdir(job_dir()) if name.endswith(".json")),
+            "queue_depth": settings.PDF_JOB_QUEUE_DEPTH,
+        }
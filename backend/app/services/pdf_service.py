@@ -1,115 +1,236 @@
- 
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
+from reportlab.platypus.flowables import Flowable
 from reportlab.lib import colors
 from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import io
+from app.core.config import settings
+
+# Idea attributes bound into a business plan
+IDEA_FIELDS = (
+    "title",
+    "description",
+    "business_model",
+    "target_audience",
+    "swot_analysis",
+    "market_potential",
+    "industry",
+    "keywords",
+)
+
+# (heading, idea field, space after the section in inches)
+SECTIONS = [
+    ("Business Description", "description", 0.2),
+    ("Business Model", "business_model", 0.2),
+    ("Target Audience", "target_audience", 0.2),
+    ("SWOT Analysis", "swot_analysis", 0.2),
+    ("Market Potential", "market_potential", 0.3),
+    ("Keywords", "keywords", None),
+]
+
+class OutlineEntry(Flowable):
+    """Zero-size flowable that bookmarks its page and adds a PDF outline entry"""
+
+    def __init__(self, key: str, title: str):
+        super().__init__()
+        self.key = key
+        self.title = title
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        self.canv.bookmarkPage(self.key)
+        self.canv.addOutlineEntry(self.title, self.key, level=0)
+
+class FlowableStream(list):
+    """
+    Flowable list that refills itself from an iterator of chunks.
+
+    ReportLab's build loop consumes flowables from the front of a list while
+    ``len(flowables)`` is non-zero; refilling on demand lets a document be
+    laid out chunk by chunk instead of materialising every flowable first.
+    """
+
+    def __init__(self, chunks: Iterator[list]):
+        super().__init__()
+        self._chunks = iter(chunks)
+
+    def __len__(self):
+        while not list.__len__(self):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self.extend(chunk)
+        return list.__len__(self)
+
+class PDFTemplate:
+    """
+    A compiled business plan layout.
+
+    Styles and the section layout are built once when the template is
+    created. Flowables are created per render: ReportLab mutates them
+    during layout (e.g. when one is pushed to the next frame), so a
+    flowable must never be shared between documents.
+    """
+
+    def __init__(self, name: str, pagesize: tuple, margin: float = 0.5*inch):
+        self.name = name
+        self.pagesize = pagesize
+        self.margin = margin
 
-class PDFService:
-    @staticmethod
-    def generate_business_plan_pdf(idea_data: dict) -> bytes:
-        """
-        Generate a professional PDF business plan
-        """
-        # Create PDF buffer
-        pdf_buffer = io.BytesIO()
-        
-        # Create PDF document
-        doc = SimpleDocTemplate(
-            pdf_buffer,
-            pagesize=letter,
-            rightMargin=0.5*inch,
-            leftMargin=0.5*inch,
-            topMargin=0.5*inch,
-            bottomMargin=0.5*inch
-        )
-        
-        # Container for PDF elements
-        elements = []
-        
         # Get styles
-        styles = getSampleStyleSheet()
-        
+        self.styles = getSampleStyleSheet()
+
         # Custom styles
-        title_style = ParagraphStyle(
+        self.title_style = ParagraphStyle(
             'CustomTitle',
-            parent=styles['Heading1'],
+            parent=self.styles['Heading1'],
             fontSize=24,
             textColor=colors.HexColor('#1f2937'),
             spaceAfter=12,
             alignment=1  # Center alignment
         )
-        
-        heading_style = ParagraphStyle(
+
+        self.heading_style = ParagraphStyle(
             'CustomHeading',
-            parent=styles['Heading2'],
+            parent=self.styles['Heading2'],
             fontSize=14,
             textColor=colors.HexColor('#374151'),
             spaceAfter=6,
             spaceBefore=12
         )
-        
-        body_style = ParagraphStyle(
+
+        self.body_style = ParagraphStyle(
             'CustomBody',
-            parent=styles['BodyText'],
+            parent=self.styles['BodyText'],
             fontSize=11,
             textColor=colors.HexColor('#4b5563'),
             spaceAfter=6,
             alignment=4  # Justify alignment
         )
-        
-        # Title
-        title = Paragraph(f"<b>{idea_data.get('title', 'Business Plan')}</b>", title_style)
-        elements.append(title)
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Metadata
+
+        self.metadata_style = self.styles['Normal']
+
+        # (heading markup, idea field, space after in points)
+        self.sections = [
+            (f"<b>{heading}</b>", field, space_after*inch if space_after else None)
+            for heading, field, space_after in SECTIONS
+        ]
+
+    def create_document(self, buffer) -> SimpleDocTemplate:
+        return SimpleDocTemplate(
+            buffer,
+            pagesize=self.pagesize,
+            rightMargin=self.margin,
+            leftMargin=self.margin,
+            topMargin=self.margin,
+            bottomMargin=self.margin
+        )
+
+    def build_flowables(self, idea_data: dict, date_generated: Optional[str] = None) -> list:
+        """Bind an idea's fields to the compiled layout"""
+        if date_generated is None:
+            date_generated = datetime.now().strftime("%B %d, %Y")
+
+        elements = [
+            Paragraph(f"<b>{idea_data.get('title') or 'Business Plan'}</b>", self.title_style),
+            Spacer(1, 0.2*inch),
+            Paragraph(
+                f"Generated on: {date_generated} | Industry: {idea_data.get('industry') or 'N/A'}",
+                self.metadata_style
+            ),
+            Spacer(1, 0.3*inch),
+        ]
+
+        for heading, field, space_after in self.sections:
+            elements.append(Paragraph(heading, self.heading_style))
+            elements.append(Paragraph(idea_data.get(field) or 'N/A', self.body_style))
+            if space_after is not None:
+                elements.append(Spacer(1, space_after))
+
+        return elements
+
+    def render(self, idea_data: dict) -> bytes:
+        pdf_buffer = io.BytesIO()
+        doc = self.create_document(pdf_buffer)
+        doc.build(self.build_flowables(idea_data))
+        return pdf_buffer.getvalue()
+
+    def build_contents(self, toc: List[Tuple[int, str]], date_generated: str) -> list:
+        """Cover page with a linked table of contents"""
+        elements = [
+            Paragraph(f"<b>Business Plans - {len(toc)} Ideas</b>", self.title_style),
+            Spacer(1, 0.2*inch),
+            Paragraph(f"Generated on: {date_generated}", self.metadata_style),
+            Spacer(1, 0.3*inch),
+            Paragraph("<b>Table of Contents</b>", self.heading_style),
+        ]
+        for number, (idea_id, title) in enumerate(toc, start=1):
+            elements.append(Paragraph(
+                f'{number}. <a href="#idea-{idea_id}" color="#1d4ed8">{title or "Untitled"}</a>',
+                self.body_style
+            ))
+        return elements
+
+    def render_combined(self, toc: List[Tuple[int, str]], idea_chunks: Iterable[List[dict]], output):
+        """
+        Render a combined business plan, one section per idea, into ``output``.
+
+        ``toc`` holds ``(id, title)`` for every idea in document order, and
+        ``idea_chunks`` yields the full idea dicts (including ``id``) in the
+        same order, so only one chunk of ideas is in memory at a time.
+        """
         date_generated = datetime.now().strftime("%B %d, %Y")
-        metadata_text = f"Generated on: {date_generated} | Industry: {idea_data.get('industry', 'N/A')}"
-        metadata = Paragraph(metadata_text, styles['Normal'])
-        elements.append(metadata)
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Business Description
-        elements.append(Paragraph("<b>Business Description</b>", heading_style))
-        description = Paragraph(idea_data.get('description', 'N/A'), body_style)
-        elements.append(description)
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Business Model
-        elements.append(Paragraph("<b>Business Model</b>", heading_style))
-        business_model = Paragraph(idea_data.get('business_model', 'N/A'), body_style)
-        elements.append(business_model)
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Target Audience
-        elements.append(Paragraph("<b>Target Audience</b>", heading_style))
-        target_audience = Paragraph(idea_data.get('target_audience', 'N/A'), body_style)
-        elements.append(target_audience)
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # SWOT Analysis
-        elements.append(Paragraph("<b>SWOT Analysis</b>", heading_style))
-        swot = Paragraph(idea_data.get('swot_analysis', 'N/A'), body_style)
-        elements.append(swot)
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Market Potential
-        elements.append(Paragraph("<b>Market Potential</b>", heading_style))
-        market = Paragraph(idea_data.get('market_potential', 'N/A'), body_style)
-        elements.append(market)
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Keywords
-        elements.append(Paragraph("<b>Keywords</b>", heading_style))
-        keywords = Paragraph(idea_data.get('keywords', 'N/A'), body_style)
-        elements.append(keywords)
-        
-        # Build PDF
-        doc.build(elements)
-        
-        # Get PDF bytes
-        pdf_buffer.seek(0)
-        return pdf_buffer.getvalue()
\ No newline at end of file
+
+        def chunks():
+            yield self.build_contents(toc, date_generated)
+            for ideas in idea_chunks:
+                elements = []
+                for idea_data in ideas:
+                    elements.append(PageBreak())
+                    elements.append(OutlineEntry(f"idea-{idea_data['id']}", idea_data.get('title') or 'Untitled'))
+                    elements.extend(self.build_flowables(idea_data, date_generated))
+                yield elements
+
+        doc = self.create_document(output)
+        doc.build(FlowableStream(chunks()))
+
+class PDFService:
+    _templates: Dict[str, PDFTemplate] = {}
+
+    DEFAULT_TEMPLATE = settings.PDF_DEFAULT_TEMPLATE
+
+    @staticmethod
+    def register_template(template: PDFTemplate):
+        """Register a compiled template under its name"""
+        PDFService._templates[template.name] = template
+
+    @staticmethod
+    def get_template(name: Optional[str] = None) -> PDFTemplate:
+        """Get a registered template (raises KeyError for unknown names)"""
+        return PDFService._templates[name or PDFService.DEFAULT_TEMPLATE]
+
+    @staticmethod
+    def template_names() -> List[str]:
+        return sorted(PDFService._templates)
+
+    @staticmethod
+    def idea_to_dict(idea) -> dict:
+        """Extract the fields rendered into a business plan from an Idea row"""
+        data = {field: getattr(idea, field) for field in IDEA_FIELDS}
+        data["id"] = idea.id
+        return data
+
+    @staticmethod
+    def generate_business_plan_pdf(idea_data: dict, template: Optional[str] = None) -> bytes:
+        """
+        Generate a professional PDF business plan
+        """
+        return PDFService.get_template(template).render(idea_data)
+
+PDFService.register_template(PDFTemplate("letter", letter))
+PDFService.register_template(PDFTemplate("a4", A4))
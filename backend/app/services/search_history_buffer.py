@@ -0,0 +1,132 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.services.db_service import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+# Queued by shutdown() behind the pending records
+_STOP = object()
+
+class SearchHistoryBuffer:
+    """
+    Write-behind buffer for search history rows.
+
+    Request handlers only enqueue a row (never blocking; when the bounded
+    queue is full the row is dropped and counted). A background thread
+    writes them with one multi-row INSERT per batch, flushing every
+    ``SEARCH_HISTORY_FLUSH_MS`` or as soon as ``SEARCH_HISTORY_BATCH_SIZE``
+    rows are waiting. Rows become visible to analytics after at most one
+    flush interval.
+    """
+
+    _queue: Optional[queue.Queue] = None
+    _thread: Optional[threading.Thread] = None
+    _lock = threading.Lock()
+
+    buffered = 0
+    dropped = 0
+    flushed = 0
+    failed = 0
+    flushes = 0
+
+    @classmethod
+    def start(cls):
+        with cls._lock:
+            if cls._thread is not None:
+                return
+            cls._queue = queue.Queue(maxsize=settings.SEARCH_HISTORY_QUEUE_SIZE)
+            cls._thread = threading.Thread(
+                target=cls._run, args=(cls._queue,), name="search-history-writer", daemon=True
+            )
+            cls._thread.start()
+
+    @classmethod
+    def record(cls, user_id: int, keywords: str, industry: str, num_ideas: int) -> bool:
+        """Queue one search history row; returns False if it was dropped"""
+        if cls._thread is None:
+            cls.start()
+        row = {
+            "user_id": user_id,
+            "keywords": keywords,
+            "industry": industry,
+            "num_ideas": num_ideas,
+            # Stamped now, not at flush time, so history keeps request order
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            cls._queue.put_nowait(row)
+        except queue.Full:
+            cls.dropped += 1
+            return False
+        cls.buffered += 1
+        return True
+
+    @classmethod
+    def shutdown(cls, timeout: float = 10.0):
+        """Flush everything queued so far and stop the writer thread"""
+        with cls._lock:
+            thread, rows = cls._thread, cls._queue
+            cls._thread = None
+        if thread is None:
+            return
+        rows.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Search history writer did not finish flushing", extra={"queued": rows.qsize()})
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {
+            "queued": cls._queue.qsize() if cls._queue is not None else 0,
+            "buffered": cls.buffered,
+            "dropped": cls.dropped,
+            "flushed": cls.flushed,
+            "failed": cls.failed,
+            "flushes": cls.flushes,
+        }
+
+    @classmethod
+    def _run(cls, rows: queue.Queue):
+        interval = settings.SEARCH_HISTORY_FLUSH_MS / 1000
+        batch_size = settings.SEARCH_HISTORY_BATCH_SIZE
+        stopping = False
+        while not stopping:
+            row = rows.get()
+            if row is _STOP:
+                break
+            # The first row opens the batch; fill it until it is full or
+            # the flush interval has passed
+            batch = [row]
+            deadline = time.monotonic() + interval
+            while len(batch) < batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = rows.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+            cls._flush(batch)
+
+    @classmethod
+    def _flush(cls, batch: List[dict]):
+        db = SessionLocal()
+        try:
+            DatabaseService.create_search_history_bulk(db, batch)
+            cls.flushed += len(batch)
+            cls.flushes += 1
+        except Exception:
+            cls.failed += len(batch)
+            logger.exception("Search history flush failed", extra={"rows": len(batch)})
+        finally:
+            db.close()
@@ -0,0 +1,224 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.models import Idea
+
+# Indexed idea fields and their weight in ranking
+SEARCH_FIELDS = {
+    "title": 3,
+    "keywords": 3,
+    "description": 2,
+    "business_model": 1,
+    "swot_analysis": 1,
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the to with".split()
+)
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+def document_terms(idea) -> Counter:
+    """Weighted term frequencies of an idea (ORM object or row)"""
+    terms = Counter()
+    for field, weight in SEARCH_FIELDS.items():
+        for token in tokenize(getattr(idea, field)):
+            terms[token] += weight
+    return terms
+
+class _UserIndex:
+    """BM25 inverted index over one user's ideas"""
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_terms: Dict[int, Counter] = {}
+        self.doc_length: Dict[int, int] = {}
+        self.total_length = 0
+
+    def add(self, idea_id: int, terms: Counter):
+        self.remove(idea_id)
+        self.doc_terms[idea_id] = terms
+        self.doc_length[idea_id] = sum(terms.values())
+        self.total_length += self.doc_length[idea_id]
+        for token, tf in terms.items():
+            self.postings.setdefault(token, {})[idea_id] = tf
+
+    def remove(self, idea_id: int):
+        terms = self.doc_terms.pop(idea_id, None)
+        if terms is None:
+            return
+        self.total_length -= self.doc_length.pop(idea_id)
+        for token in terms:
+            docs = self.postings.get(token)
+            if docs is not None:
+                docs.pop(idea_id, None)
+                if not docs:
+                    del self.postings[token]
+
+    def apply(self, changes: Iterable[Tuple[int, Optional[Counter]]]):
+        """Apply ``(idea_id, terms)`` changes; ``terms`` None removes the idea"""
+        for idea_id, terms in changes:
+            if terms is None:
+                self.remove(idea_id)
+            else:
+                self.add(idea_id, terms)
+
+    def search(self, terms: List[str]) -> List[Tuple[int, float]]:
+        n_docs = len(self.doc_terms)
+        if not n_docs:
+            return []
+        avg_length = self.total_length / n_docs
+        scores: Dict[int, float] = {}
+        for token in set(terms):
+            docs = self.postings.get(token)
+            if not docs:
+                continue
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for idea_id, tf in docs.items():
+                length = self.doc_length[idea_id]
+                norm = tf * (self.K1 + 1) / (tf + self.K1 * (1 - self.B + self.B * length / avg_length))
+                scores[idea_id] = scores.get(idea_id, 0.0) + idf * norm
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+class InvertedIndex:
+    """
+    In-process full-text index used where the database has no native
+    full-text search (SQLite in dev/test).
+
+    Indexes are built per user on their first search and then kept current
+    by the DatabaseService write paths. Writes made by other processes are
+    picked up when a user's index is rebuilt after SEARCH_INDEX_TTL_SECONDS.
+    At most SEARCH_INDEX_MAX_USERS indexes are kept (least recently
+    searched evicted first).
+
+    A build reads the user's ideas outside the lock, so writes reported
+    while it runs are recorded and replayed onto the new index before it is
+    published; otherwise a write committed just after the build's SELECT
+    would be missing until the next rebuild.
+    """
+
+    def __init__(self):
+        self._users = TTLCache(maxsize=settings.SEARCH_INDEX_MAX_USERS, ttl=settings.SEARCH_INDEX_TTL_SECONDS)
+        # user_id -> [running builds, writes seen meanwhile as (idea_id, terms or None)]
+        self._builds: Dict[int, list] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session, user_id: int) -> _UserIndex:
+        index = self._users.get(user_id)
+        if index is not None:
+            return index
+
+        with self._lock:
+            build = self._builds.setdefault(user_id, [0, []])
+            build[0] += 1
+        index = _UserIndex()
+        built = False
+        try:
+            columns = [Idea.id] + [getattr(Idea, field) for field in SEARCH_FIELDS]
+            for row in db.execute(select(*columns).where(Idea.user_id == user_id)):
+                index.add(row.id, document_terms(row))
+            built = True
+        finally:
+            with self._lock:
+                build[0] -= 1
+                if not build[0]:
+                    del self._builds[user_id]
+                if built:
+                    # A concurrent build may have published first; it has
+                    # been kept current since, so it wins
+                    current = self._users.get(user_id)
+                    if current is None:
+                        index.apply(build[1])
+                        self._users.set(user_id, index)
+                        current = index
+        return current
+
+    def _apply(self, user_id: int, changes: List[Tuple[int, Optional[Counter]]]):
+        with self._lock:
+            index = self._users.get(user_id)
+            build = self._builds.get(user_id)
+            if build is not None:
+                build[1].extend(changes)
+            if index is not None:
+                index.apply(changes)
+
+    def index_ideas(self, ideas: Iterable[Idea]):
+        by_user: Dict[int, list] = {}
+        for idea in ideas:
+            by_user.setdefault(idea.user_id, []).append((idea.id, document_terms(idea)))
+        for user_id, changes in by_user.items():
+            self._apply(user_id, changes)
+
+    def remove_ideas(self, user_id: int, idea_ids: Iterable[int]):
+        self._apply(user_id, [(idea_id, None) for idea_id in idea_ids])
+
+    def search(self, db: Session, user_id: int, query: str) -> List[Tuple[int, float]]:
+        terms = tokenize(query)
+        if not terms:
+            return []
+        index = self._load(db, user_id)
+        with self._lock:
+            return index.search(terms)
+
+    def clear(self):
+        self._users.clear()
+
+inverted_index = InvertedIndex()
+
+class SearchService:
+    @staticmethod
+    def uses_native_search(db: Session) -> bool:
+        return db.get_bind().dialect.name == "postgresql"
+
+    @staticmethod
+    def search_ideas(db: Session, user_id: int, query: str, skip: int = 0, limit: int = 10) -> List[Idea]:
+        """Ranked full-text search over a user's ideas"""
+        if SearchService.uses_native_search(db):
+            # Generated ideas.search_vector column with a GIN index (see models)
+            tsquery = func.websearch_to_tsquery("english", query)
+            vector = literal_column("ideas.search_vector")
+            return list(db.scalars(
+                select(Idea).where(
+                    Idea.user_id == user_id,
+                    vector.op("@@")(tsquery)
+                ).order_by(
+                    func.ts_rank(vector, tsquery).desc(),
+                    Idea.id.desc()
+                ).offset(skip).limit(limit)
+            ))
+
+        ranked = inverted_index.search(db, user_id, query)[skip:skip + limit]
+        if not ranked:
+            return []
+        ideas = {
+            idea.id: idea
+            for idea in db.query(Idea).filter(
+                Idea.id.in_([idea_id for idea_id, _ in ranked]),
+                Idea.user_id == user_id
+            )
+        }
+        return [ideas[idea_id] for idea_id, _ in ranked if idea_id in ideas]
+
+    @staticmethod
+    def on_ideas_saved(db: Session, ideas: Iterable[Idea]):
+        """Keep the in-process index current after ideas are created/updated"""
+        if not SearchService.uses_native_search(db):
+            inverted_index.index_ideas(ideas)
+
+    @staticmethod
+    def on_ideas_deleted(db: Session, user_id: int, idea_ids: Iterable[int]):
+        if not SearchService.uses_native_search(db):
+            inverted_index.remove_ideas(user_id, idea_ids)
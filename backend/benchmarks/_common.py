@@ -0,0 +1,110 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite database so they can be
+executed offline from the ``backend`` directory:
+
+    python -m benchmarks.<name>
+"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def configure_sqlite_env(path: str = None) -> str:
+    """Point the app at a fresh SQLite file. Must run before importing ``app``."""
+    if path is None:
+        fd, path = tempfile.mkstemp(prefix="bench_", suffix=".db")
+        os.close(fd)
+        os.remove(path)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    return path
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_http(url: str, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+def start_process(args: list, env: dict = None, ready_url: str = None) -> subprocess.Popen:
+    """Start a Python module as a subprocess and wait until it answers HTTP"""
+    proc = subprocess.Popen(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **(env or {})},
+    )
+    if ready_url:
+        try:
+            wait_for_http(ready_url)
+        except Exception:
+            proc.terminate()
+            raise
+    return proc
+
+
+def init_database(env: dict = None):
+    """Create the schema (``python -m app.db.init_db``) in a subprocess"""
+    subprocess.run(
+        [sys.executable, "-m", "app.db.init_db"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **(env or {})},
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def start_app(port: int, env: dict = None) -> subprocess.Popen:
+    """Create the schema, then boot ``app.main:app`` under uvicorn on the given port"""
+    init_database(env)
+    return start_process(
+        ["-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        ready_url=f"http://127.0.0.1:{port}/health",
+    )
+
+
+def stop_process(proc: subprocess.Popen):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def register_and_login(base_url: str, username: str, password: str = "benchmark") -> str:
+    """Create a user (if needed) and return a bearer token"""
+    httpx.post(f"{base_url}/api/v1/auth/register", json={"username": username, "password": password})
+    response = httpx.post(
+        f"{base_url}/api/v1/auth/login",
+        params={"username": username, "password": password},
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def percentile(samples: list, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
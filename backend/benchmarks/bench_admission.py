@@ -0,0 +1,123 @@
+"""
+Generation admission control under overload.
+
+Boots the app with the mock provider (``--latency-ms`` per idea) and a
+small admission budget, then runs two phases:
+
+1. One user floods ``--flood`` concurrent 5-idea requests while
+   ``--light-users`` other users each send a few 1-idea requests. The
+   flood should mostly get 429 (rate limited) while the light users are
+   all served with about one generation's latency.
+2. ``--users`` users each send one request at the same moment, more than
+   the concurrency cap plus the wait queue can hold. The overflow should
+   get 429 (busy) immediately and the admitted requests complete in waves
+   of ``--max-concurrency``.
+
+Usage:
+    python -m benchmarks.bench_admission --latency-ms 200 --max-concurrency 4 --max-queue 4
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+import httpx
+
+from benchmarks._common import configure_sqlite_env, free_port, percentile, register_and_login, start_app, stop_process
+
+
+async def generate(client: httpx.AsyncClient, token: str, keywords: str, num_ideas: int) -> tuple:
+    start = time.perf_counter()
+    response = await client.post(
+        "/api/v1/ideas/generate",
+        json={"keywords": keywords, "industry": "Education", "num_ideas": num_ideas},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    return response.status_code, response.headers.get("retry-after"), (time.perf_counter() - start) * 1000
+
+
+def summarize(label: str, results: list):
+    codes = Counter(code for code, _, _ in results)
+    served = [ms for code, _, ms in results if code == 200]
+    retry_after = sorted({int(value) for code, value, _ in results if value})
+    line = f"{label:<16} {dict(codes)}"
+    if served:
+        line += f"  served p50 {statistics.median(served):7.1f} ms  max {max(served):7.1f} ms"
+    if retry_after:
+        line += f"  Retry-After {retry_after[0]}-{retry_after[-1]} s"
+    print(line)
+
+
+async def flood_phase(client, flood_token: str, light_tokens: list, flood: int):
+    async def light_user(n: int, token: str) -> list:
+        results = []
+        for i in range(3):
+            await asyncio.sleep(0.05)
+            results.append(await generate(client, token, f"light {n} {i}", 1))
+        return results
+
+    flood_results, *light_results = await asyncio.gather(
+        asyncio.gather(*[generate(client, flood_token, f"flood {i}", 5) for i in range(flood)]),
+        *[light_user(n, token) for n, token in enumerate(light_tokens)],
+    )
+    summarize("flooding user", flood_results)
+    summarize("light users", [result for results in light_results for result in results])
+
+
+async def stampede_phase(client, tokens: list):
+    results = await asyncio.gather(*[generate(client, token, f"stampede {n}", 1) for n, token in enumerate(tokens)])
+    summarize("stampede", results)
+    served = [ms for code, _, ms in results if code == 200]
+    rejected = [ms for code, _, ms in results if code == 429]
+    if rejected:
+        print(f"{'':<16} rejections answered in p95 {percentile(rejected, 95):.1f} ms; slowest admitted {max(served):.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=int, default=200)
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--max-queue", type=int, default=4)
+    parser.add_argument("--rate-per-minute", type=int, default=60)
+    parser.add_argument("--burst", type=int, default=10)
+    parser.add_argument("--flood", type=int, default=50)
+    parser.add_argument("--light-users", type=int, default=3)
+    parser.add_argument("--users", type=int, default=16)
+    args = parser.parse_args()
+
+    configure_sqlite_env()
+    port = free_port()
+    app = start_app(port, env={
+        "AI_PROVIDER": "mock",
+        "AI_MOCK_LATENCY_MS": str(args.latency_ms),
+        "LOG_LEVEL": "WARNING",
+        "GENERATION_MAX_CONCURRENCY": str(args.max_concurrency),
+        "GENERATION_MAX_QUEUE": str(args.max_queue),
+        "GENERATION_RATE_PER_MINUTE": str(args.rate_per_minute),
+        "GENERATION_BURST": str(args.burst),
+    })
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        tokens = [register_and_login(base_url, f"admission_{n}") for n in range(max(args.users, args.light_users + 1))]
+
+        async def run():
+            limits = httpx.Limits(max_connections=args.flood + args.users)
+            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+                print(f"phase 1: one user floods {args.flood} x 5 ideas (burst {args.burst}, {args.rate_per_minute}/min)")
+                await flood_phase(client, tokens[0], tokens[1:args.light_users + 1], args.flood)
+                print(f"phase 2: {args.users} users at once (cap {args.max_concurrency}, queue {args.max_queue})")
+                # Fresh users so phase 1 spent no tokens of theirs
+                await stampede_phase(client, [register_and_login(base_url, f"stampede_{n}") for n in range(args.users)])
+                metrics = (await client.get("/metrics")).text
+            for line in metrics.splitlines():
+                if line.startswith("generation_admission_"):
+                    print(f"  {line}")
+
+        asyncio.run(run())
+    finally:
+        stop_process(app)
+
+
+if __name__ == "__main__":
+    main()
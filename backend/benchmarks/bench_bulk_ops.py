@@ -0,0 +1,94 @@
+"""
+Bulk idea operations vs the per-id endpoints' service calls.
+
+Seeds one user, then favorites and deletes ``--ids`` ideas all at once
+(``bulk_set_favorite`` / ``bulk_delete_ideas``) and ``--single`` other
+ideas one id at a time (``toggle_favorite`` / ``delete_idea``, what a
+client looping over the single-idea endpoints does). Reports wall time
+and SQL statements, both in total and per id.
+
+Usage:
+    python -m benchmarks.bench_bulk_ops --ids 10000 --single 500
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from benchmarks._common import configure_sqlite_env
+
+configure_sqlite_env()
+
+from sqlalchemy import event, insert, select  # noqa: E402
+
+from app.db.database import SessionLocal, engine  # noqa: E402
+from app.db.init_db import init_db  # noqa: E402
+from app.models.models import Idea, User  # noqa: E402
+from app.services.db_service import DatabaseService  # noqa: E402
+
+statements = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def count_statement(*args):
+    global statements
+    statements += 1
+
+
+def seed(user_id: int, count: int) -> list:
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Idea), [
+            {
+                "user_id": user_id,
+                "title": f"Idea {i}",
+                "description": "Seeded for bulk operations benchmark",
+                "industry": ("Education", "Fintech", "Health")[i % 3],
+                "created_at": start + timedelta(seconds=i),
+                "updated_at": start + timedelta(seconds=i),
+            }
+            for i in range(count)
+        ])
+        return list(conn.scalars(select(Idea.id).where(Idea.user_id == user_id).order_by(Idea.id)))
+
+
+def measure(label: str, count: int, fn):
+    global statements
+    statements = 0
+    db = SessionLocal()
+    start = time.perf_counter()
+    try:
+        fn(db)
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<28} {count:6d} ids {elapsed * 1000:9.1f} ms {statements:6d} statements"
+        f" | {elapsed / count * 1e6:8.1f} us/id {statements / count:6.2f} statements/id"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ids", type=int, default=10000)
+    parser.add_argument("--single", type=int, default=500)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    user = User(username="bulk_bench", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    ids = seed(user_id, args.ids + args.single)
+    bulk, one_by_one = ids[:args.ids], ids[args.ids:]
+
+    measure("favorite, bulk", len(bulk), lambda db: DatabaseService.bulk_set_favorite(db, user_id, bulk, True))
+    measure("favorite, one id at a time", len(one_by_one), lambda db: [DatabaseService.toggle_favorite(db, i, user_id) for i in one_by_one])
+    measure("delete, bulk", len(bulk), lambda db: DatabaseService.bulk_delete_ideas(db, user_id, bulk))
+    measure("delete, one id at a time", len(one_by_one), lambda db: [DatabaseService.delete_idea(db, i, user_id) for i in one_by_one])
+
+
+if __name__ == "__main__":
+    main()
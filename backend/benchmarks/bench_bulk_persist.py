@@ -0,0 +1,97 @@
+"""
+Commits and latency per generate call: per-row vs bulk persistence.
+
+Compares the old path (``create_idea`` per idea + ``create_search_history``,
+one commit each) with ``DatabaseService.create_ideas_bulk`` (one
+transaction, multi-row INSERT ... RETURNING) plus a
+``SearchHistoryBuffer`` record, whose batched flushes (a few commits per
+run) are counted too.
+
+Usage:
+    python -m benchmarks.bench_bulk_persist --iterations 50
+"""
+import argparse
+import time
+
+from benchmarks._common import configure_sqlite_env
+
+configure_sqlite_env()
+
+from sqlalchemy import event  # noqa: E402
+
+from app.db.database import SessionLocal, engine  # noqa: E402
+from app.db.init_db import init_db  # noqa: E402
+from app.models.models import User  # noqa: E402
+from app.schemas.schemas import IdeaCreate  # noqa: E402
+from app.services.ai_service import MockProvider  # noqa: E402
+from app.services.db_service import DatabaseService  # noqa: E402
+from app.services.search_history_buffer import SearchHistoryBuffer  # noqa: E402
+
+commits = 0
+
+
+@event.listens_for(engine, "commit")
+def count_commit(conn):
+    global commits
+    commits += 1
+
+
+def make_ideas(n: int) -> list:
+    templates = MockProvider.mock_ideas("ai, automation", "Education")
+    return [
+        IdeaCreate(**{**templates[i % len(templates)], "industry": "Education"})
+        for i in range(n)
+    ]
+
+
+def per_row(db, user_id: int, ideas: list):
+    saved = [DatabaseService.create_idea(db, user_id, idea) for idea in ideas]
+    DatabaseService.create_search_history(db, user_id, "ai, automation", "Education", len(ideas))
+    return [idea.id for idea in saved]
+
+
+def bulk(db, user_id: int, ideas: list):
+    saved = DatabaseService.create_ideas_bulk(db, user_id, ideas)
+    SearchHistoryBuffer.record(user_id, "ai, automation", "Education", len(ideas))
+    return [idea.id for idea in saved]
+
+
+def measure(fn, user_id: int, n: int, iterations: int):
+    global commits
+    ideas = make_ideas(n)
+    commits = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        db = SessionLocal()
+        try:
+            fn(db, user_id, ideas)
+        finally:
+            db.close()
+    elapsed = time.perf_counter() - start
+    return commits / iterations, elapsed / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    user = User(username="bench_bulk", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    print(f"{'num_ideas':>9} | {'per-row commits':>15} {'per-row ms':>10} | {'bulk commits':>12} {'bulk ms':>8}")
+    for n in (1, 3, 10, 50):
+        row_commits, row_ms = measure(per_row, user_id, n, args.iterations)
+        bulk_commits, bulk_ms = measure(bulk, user_id, n, args.iterations)
+        print(f"{n:>9} | {row_commits:>15.1f} {row_ms:>10.2f} | {bulk_commits:>12.1f} {bulk_ms:>8.2f}")
+
+    SearchHistoryBuffer.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Concurrent /ideas/generate benchmark against the stub LLM server.
+
+Boots the stub LLM and the app (HTTP provider) on local ports, then fires
+``--concurrency`` simultaneous generate calls. With the async pipeline the
+wall time should stay close to one stub round trip, instead of growing in
+steps of the threadpool size.
+
+Requests use distinct keywords so each one reaches the stub; pass
+``--identical`` to send the same request and exercise the generation
+cache / in-flight coalescing instead (the stub then sees one generation).
+
+Usage:
+    python -m benchmarks.bench_generation_concurrency --concurrency 200 --num-ideas 3 [--identical]
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks._common import (
+    configure_sqlite_env,
+    free_port,
+    percentile,
+    register_and_login,
+    start_app,
+    start_process,
+    stop_process,
+)
+
+
+async def fire(base_url: str, token: str, concurrency: int, num_ideas: int, identical: bool) -> list:
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=120) as client:
+        async def one(i: int):
+            keywords = "ai, automation" if identical else f"ai, automation, run{i}"
+            payload = {"keywords": keywords, "industry": "Education", "num_ideas": num_ideas}
+            start = time.perf_counter()
+            response = await client.post("/api/v1/ideas/generate", json=payload)
+            response.raise_for_status()
+            if len(response.json()) != num_ideas:
+                raise RuntimeError(f"expected {num_ideas} ideas, got {response.text[:200]}")
+            return time.perf_counter() - start
+
+        return await asyncio.gather(*[one(i) for i in range(concurrency)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--num-ideas", type=int, default=3)
+    parser.add_argument("--latency-ms", type=int, default=500)
+    parser.add_argument("--identical", action="store_true", help="send identical requests (cache / coalescing path)")
+    args = parser.parse_args()
+
+    db_path = configure_sqlite_env()
+    stub_port, app_port = free_port(), free_port()
+
+    stub = start_process(
+        ["-m", "benchmarks.stub_llm_server", "--port", str(stub_port), "--latency-ms", str(args.latency_ms)],
+        ready_url=f"http://127.0.0.1:{stub_port}/docs",
+    )
+    app = start_app(app_port, env={
+        "AI_PROVIDER": "http",
+        "LLM_API_URL": f"http://127.0.0.1:{stub_port}/v1",
+        # One user fires every request at once: admit them all
+        "GENERATION_RATE_PER_MINUTE": "0",
+        "GENERATION_MAX_CONCURRENCY": str(args.concurrency),
+    })
+    try:
+        base_url = f"http://127.0.0.1:{app_port}"
+        token = register_and_login(base_url, "bench_generation")
+
+        start = time.perf_counter()
+        latencies = asyncio.run(fire(base_url, token, args.concurrency, args.num_ideas, args.identical))
+        wall = time.perf_counter() - start
+
+        print(f"requests:     {len(latencies)} x num_ideas={args.num_ideas} (stub latency {args.latency_ms} ms)")
+        print(f"wall time:    {wall:.2f} s")
+        print(f"throughput:   {len(latencies) / wall:.1f} req/s")
+        print(f"p50 / p99:    {percentile(latencies, 50) * 1000:.0f} / {percentile(latencies, 99) * 1000:.0f} ms")
+        print(f"generations:  {httpx.get(f'{base_url}/health/caches').json()['generations']}")
+    finally:
+        stop_process(app)
+        stop_process(stub)
+        print(f"database:     {db_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Single-idea mutations: latency and concurrent toggle correctness.
+
+Compares the previous load-mutate-commit-refresh implementations of
+update / toggle favorite / delete (kept here as ``legacy_*``) with the
+single-statement ``DatabaseService`` methods: median latency and SQL
+statements per call.
+
+Then ``--threads`` threads toggle the same idea ``--toggles`` times each,
+every toggle in its own session. Atomic toggles are totally ordered, so
+the values they return alternate: as many ``true`` as ``false`` results
+(one more ``true`` for an odd total) and a final state matching the
+parity. Any excess is a lost update. Exits non-zero if the current
+implementation loses one.
+
+Usage:
+    python -m benchmarks.bench_idea_mutations --calls 500 --threads 8 --toggles 100
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+
+from benchmarks._common import configure_sqlite_env
+
+configure_sqlite_env()
+
+from sqlalchemy import event, insert, select  # noqa: E402
+
+from app.db.database import SessionLocal, engine  # noqa: E402
+from app.db.init_db import init_db  # noqa: E402
+from app.models.models import Idea, User  # noqa: E402
+from app.services.db_service import DatabaseService  # noqa: E402
+
+statements = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def count_statement(*args):
+    global statements
+    statements += 1
+
+
+def legacy_update_idea(db, idea_id: int, user_id: int, update_data: dict):
+    db_idea = db.query(Idea).filter(Idea.id == idea_id, Idea.user_id == user_id).first()
+    if db_idea:
+        for key, value in update_data.items():
+            if hasattr(db_idea, key) and value is not None:
+                setattr(db_idea, key, value)
+        db.commit()
+        db.refresh(db_idea)
+    return db_idea
+
+
+def legacy_toggle_favorite(db, idea_id: int, user_id: int):
+    db_idea = db.query(Idea).filter(Idea.id == idea_id, Idea.user_id == user_id).first()
+    if db_idea:
+        db_idea.is_favorite = not db_idea.is_favorite
+        db.commit()
+        db.refresh(db_idea)
+    return db_idea
+
+
+def legacy_delete_idea(db, idea_id: int, user_id: int) -> bool:
+    db_idea = db.query(Idea).filter(Idea.id == idea_id, Idea.user_id == user_id).first()
+    if db_idea:
+        db.delete(db_idea)
+        DatabaseService._record_idea_stats(db, Counter({db_idea.industry: -1}))
+        db.commit()
+        return True
+    return False
+
+
+def seed(user_id: int, count: int) -> list:
+    with engine.begin() as conn:
+        conn.execute(insert(Idea), [
+            {
+                "user_id": user_id,
+                "title": f"Idea {i}",
+                "description": "A long description of the idea. " * 40,
+                "business_model": "Subscription model with tiered pricing. " * 20,
+                "swot_analysis": "Strengths, weaknesses, opportunities and threats. " * 20,
+                "industry": "Education",
+                "is_favorite": False,
+            }
+            for i in range(count)
+        ])
+        return list(conn.scalars(select(Idea.id).where(Idea.user_id == user_id).order_by(Idea.id.desc()).limit(count)))
+
+
+def latency(label: str, fn, idea_ids: list):
+    global statements
+    samples = []
+    statements = 0
+    db = SessionLocal()
+    try:
+        for idea_id in idea_ids:
+            start = time.perf_counter()
+            fn(db, idea_id)
+            samples.append((time.perf_counter() - start) * 1e6)
+    finally:
+        db.close()
+    print(f"{label:<24} {statistics.median(samples):8.1f} us/call (median) {statements / len(idea_ids):5.1f} statements/call")
+
+
+def toggle_race(toggle, user_id: int, idea_id: int, threads: int, toggles: int) -> int:
+    """Toggle one idea from many threads; returns the number of lost updates"""
+    results = Counter()
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(toggles):
+            db = SessionLocal()
+            try:
+                idea = toggle(db, idea_id, user_id)
+                value = idea["is_favorite"] if isinstance(idea, dict) else idea.is_favorite
+            finally:
+                db.close()
+            with lock:
+                results[value] += 1
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    db = SessionLocal()
+    final = db.get(Idea, idea_id).is_favorite
+    db.close()
+    total = threads * toggles
+    lost = abs(results[True] - results[False] - total % 2)
+    if final != bool(total % 2):
+        lost = max(lost, 1)
+    return lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--toggles", type=int, default=100)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    user = User(username="mutation_bench", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    changes = {"title": "Renamed idea", "keywords": "renamed"}
+    print(f"latency, {args.calls} calls each")
+    latency("update, legacy", lambda db, i: legacy_update_idea(db, i, user_id, changes), seed(user_id, args.calls))
+    latency("update", lambda db, i: DatabaseService.update_idea(db, i, user_id, changes), seed(user_id, args.calls))
+    latency("toggle, legacy", lambda db, i: legacy_toggle_favorite(db, i, user_id), seed(user_id, args.calls))
+    latency("toggle", lambda db, i: DatabaseService.toggle_favorite(db, i, user_id), seed(user_id, args.calls))
+    latency("delete, legacy", lambda db, i: legacy_delete_idea(db, i, user_id), seed(user_id, args.calls))
+    latency("delete", lambda db, i: DatabaseService.delete_idea(db, i, user_id), seed(user_id, args.calls))
+
+    print(f"concurrent toggles, {args.threads} threads x {args.toggles}")
+    legacy_lost = toggle_race(legacy_toggle_favorite, user_id, seed(user_id, 1)[0], args.threads, args.toggles)
+    lost = toggle_race(DatabaseService.toggle_favorite, user_id, seed(user_id, 1)[0], args.threads, args.toggles)
+    print(f"lost updates, legacy:    {legacy_lost}")
+    print(f"lost updates:            {lost}")
+
+    if lost:
+        print("FAIL: concurrent toggles lost updates")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
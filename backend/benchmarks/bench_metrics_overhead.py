@@ -0,0 +1,97 @@
+"""
+Per-request overhead of MetricsMiddleware and the SQL statement hooks.
+
+Drives a trivial ASGI app directly (no server, no sockets) with and
+without ``MetricsMiddleware`` and reports the difference per request,
+then times ``SELECT 1`` on an in-memory SQLite engine with and without
+the cursor-execute hooks. Exits non-zero if the middleware costs more
+than ``--budget-us`` per request.
+
+Usage:
+    python -m benchmarks.bench_metrics_overhead --requests 200000 --budget-us 50
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from benchmarks._common import configure_sqlite_env
+
+configure_sqlite_env()
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from app.core.metrics import MetricsMiddleware, instrument_engine  # noqa: E402
+
+
+class FakeRoute:
+    path = "/api/v1/ideas/{idea_id}"
+
+
+async def endpoint(scope, receive, send):
+    # What the router does for a matched route
+    scope["route"] = FakeRoute
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def drive(app, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        scope = {"type": "http", "method": "GET", "path": "/api/v1/ideas/1"}
+        await app(scope, receive, send)
+    return time.perf_counter() - start
+
+
+def best_of(fn, repeat: int) -> float:
+    return min(fn() for _ in range(repeat))
+
+
+def time_queries(engine, queries: int) -> float:
+    with engine.connect() as connection:
+        start = time.perf_counter()
+        for _ in range(queries):
+            connection.execute(text("SELECT 1"))
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-us", type=float, default=50.0)
+    args = parser.parse_args()
+
+    wrapped = MetricsMiddleware(endpoint)
+    bare = best_of(lambda: asyncio.run(drive(endpoint, args.requests)), args.repeat)
+    instrumented = best_of(lambda: asyncio.run(drive(wrapped, args.requests)), args.repeat)
+    request_overhead_us = (instrumented - bare) / args.requests * 1e6
+
+    plain_engine = create_engine("sqlite://")
+    hooked_engine = create_engine("sqlite://")
+    instrument_engine(hooked_engine)
+    plain = best_of(lambda: time_queries(plain_engine, args.queries), args.repeat)
+    hooked = best_of(lambda: time_queries(hooked_engine, args.queries), args.repeat)
+    query_overhead_us = (hooked - plain) / args.queries * 1e6
+
+    print(f"bare ASGI app:        {bare / args.requests * 1e6:8.2f} us/request")
+    print(f"with middleware:      {instrumented / args.requests * 1e6:8.2f} us/request")
+    print(f"middleware overhead:  {request_overhead_us:8.2f} us/request (budget {args.budget_us:.0f} us)")
+    print(f"SQL hook overhead:    {query_overhead_us:8.2f} us/statement")
+
+    if request_overhead_us > args.budget_us:
+        print("FAIL: middleware overhead over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
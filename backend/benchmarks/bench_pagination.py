@@ -0,0 +1,95 @@
+"""
+Per-page latency of GET /ideas: keyset cursor vs OFFSET, shallow vs deep.
+
+Seeds one user with enough ideas to reach page 10,000 (at 10 per page)
+and times fetching page 1 and page 10,000 both with the keyset query used
+by ``DatabaseService.get_user_ideas`` and with the old OFFSET query.
+
+Usage:
+    python -m benchmarks.bench_pagination --pages 10000 --page-size 10
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from benchmarks._common import configure_sqlite_env
+
+configure_sqlite_env()
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.db.database import SessionLocal, engine  # noqa: E402
+from app.db.init_db import init_db  # noqa: E402
+from app.models.models import Idea, User  # noqa: E402
+from app.services.db_service import DatabaseService  # noqa: E402
+
+
+def seed(user_id: int, count: int):
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        for offset in range(0, count, 10000):
+            conn.execute(insert(Idea), [
+                {
+                    "user_id": user_id,
+                    "title": f"Idea {i}",
+                    "description": "Seeded for pagination benchmark",
+                    "industry": "Education",
+                    "created_at": start + timedelta(seconds=i),
+                    "updated_at": start + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + 10000, count))
+            ])
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    user = User(username="bench_pagination", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+
+    total = args.pages * args.page_size
+    print(f"seeding {total:,} ideas...")
+    seed(user_id, total)
+
+    # Cursor of the last row on the page before the deep one
+    skip = (args.pages - 1) * args.page_size
+    anchor = db.query(Idea).filter(Idea.user_id == user_id).order_by(
+        Idea.created_at.desc(), Idea.id.desc()
+    ).offset(skip - 1).limit(1).one()
+    deep_after = (anchor.created_at, anchor.id)
+
+    def offset_page(skip_rows):
+        return lambda: db.query(Idea).filter(Idea.user_id == user_id).order_by(
+            Idea.created_at.desc(), Idea.id.desc()
+        ).offset(skip_rows).limit(args.page_size).all()
+
+    results = {
+        "keyset page 1": timed(lambda: DatabaseService.get_user_ideas(db, user_id, args.page_size), args.repeat),
+        f"keyset page {args.pages:,}": timed(lambda: DatabaseService.get_user_ideas(db, user_id, args.page_size, deep_after), args.repeat),
+        "offset page 1": timed(offset_page(0), args.repeat),
+        f"offset page {args.pages:,}": timed(offset_page(skip), args.repeat),
+    }
+    for label, ms in results.items():
+        print(f"{label:>20}: {ms:8.3f} ms")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
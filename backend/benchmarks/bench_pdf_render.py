@@ -0,0 +1,63 @@
+"""
+PDF exports per second per core, before and after template precompilation.
+
+"before" compiles a fresh template for every export, which is what the
+old ``generate_business_plan_pdf`` did (new stylesheet, styles and
+flowables per call). "after" renders through the registered, precompiled
+templates. Runs single-threaded, so the numbers are per core.
+
+Each export gets a different idea with section lengths from a few words
+to a couple of pages (seeded), so flowables are split across frames and
+pages the way real content is; rendering one fixed idea would hide any
+layout state leaking from one render into the next.
+
+Usage:
+    python -m benchmarks.bench_pdf_render --exports 200
+"""
+import argparse
+import random
+import time
+
+from app.services.ai_service import MockProvider
+from app.services.pdf_service import IDEA_FIELDS, PDFService, PDFTemplate
+
+
+def varied_ideas(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    base = [
+        {**idea, "industry": "Education"}
+        for idea in MockProvider.mock_ideas("ai, automation", "Education")
+    ]
+    ideas = []
+    for i in range(count):
+        idea = dict(base[i % len(base)])
+        for field in IDEA_FIELDS:
+            if field not in ("title", "industry", "keywords"):
+                idea[field] = " ".join([idea[field]] * rng.randint(1, 60))
+        ideas.append(idea)
+    return ideas
+
+
+def run(fn, ideas: list, exports: int) -> float:
+    start = time.perf_counter()
+    for i in range(exports):
+        fn(ideas[i % len(ideas)])
+    return exports / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--exports", type=int, default=200)
+    args = parser.parse_args()
+
+    ideas = varied_ideas(args.exports)
+
+    for name in PDFService.template_names():
+        pagesize = PDFService.get_template(name).pagesize
+        before = run(lambda idea: PDFTemplate(name, pagesize).render(idea), ideas, args.exports)
+        after = run(lambda idea: PDFService.generate_business_plan_pdf(idea, name), ideas, args.exports)
+        print(f"{name:>8}: before {before:7.1f} exports/s   after {after:7.1f} exports/s   ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
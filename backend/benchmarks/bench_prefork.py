@@ -0,0 +1,115 @@
+"""
+Single process vs pre-forked workers (``run.py --workers N``).
+
+Boots the server through ``run.py`` once per worker count and measures:
+
+- the first PDF export and first idea listing right after the server
+  answers (cold paths; prefork workers warm up before accepting);
+- throughput of ``--requests`` idea listings (``limit=100``, CPU-bound
+  serialization) at ``--concurrency``.
+
+One worker runs the plain single-process uvicorn server. The throughput
+gain needs as many free cores as workers.
+
+Usage:
+    python -m benchmarks.bench_prefork --workers 1 4 --requests 2000 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from benchmarks._common import configure_sqlite_env, free_port, percentile, register_and_login, start_process, stop_process
+
+
+def seed_ideas(base_url: str, token: str, count: int) -> int:
+    headers = {"Authorization": f"Bearer {token}"}
+    idea_id = None
+    for i in range(0, count, 10):
+        response = httpx.post(
+            f"{base_url}/api/v1/ideas/generate",
+            json={"keywords": f"prefork {i}", "industry": "Education", "num_ideas": 10},
+            headers=headers,
+            timeout=60,
+        )
+        response.raise_for_status()
+        idea_id = response.json()[0]["id"]
+    return idea_id
+
+
+def timed_get(base_url: str, path: str, token: str) -> float:
+    start = time.perf_counter()
+    httpx.get(f"{base_url}{path}", headers={"Authorization": f"Bearer {token}"}, timeout=60).raise_for_status()
+    return (time.perf_counter() - start) * 1000
+
+
+async def list_load(base_url: str, token: str, requests: int, concurrency: int) -> tuple:
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        queue = asyncio.Queue()
+        for _ in range(requests):
+            queue.put_nowait(None)
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.get("/api/v1/ideas/", params={"limit": 100})
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        wall = time.perf_counter() - start
+    return wall, latencies
+
+
+def run(workers: int, args) -> dict:
+    configure_sqlite_env()
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_process(
+        ["run.py", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env={"AI_PROVIDER": "mock", "LOG_LEVEL": "WARNING", "GENERATION_RATE_PER_MINUTE": "0"},
+        ready_url=f"{base_url}/health",
+    )
+    try:
+        token = register_and_login(base_url, "bench_prefork")
+        first_pdf = timed_get(base_url, f"/api/v1/pdf/export/{seed_ideas(base_url, token, args.ideas)}", token)
+        first_list = timed_get(base_url, "/api/v1/ideas/?limit=100", token)
+        wall, latencies = asyncio.run(list_load(base_url, token, args.requests, args.concurrency))
+    finally:
+        stop_process(server)
+    return {
+        "first_pdf_ms": first_pdf,
+        "first_list_ms": first_list,
+        "rps": len(latencies) / wall,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--ideas", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'1st pdf ms':>11} {'1st list ms':>12} {'list rps':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for workers in dict.fromkeys(args.workers):
+        result = run(workers, args)
+        print(
+            f"{workers:>7} {result['first_pdf_ms']:>11.1f} {result['first_list_ms']:>12.1f} "
+            f"{result['rps']:>9.1f} {result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
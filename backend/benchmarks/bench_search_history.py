@@ -0,0 +1,87 @@
+"""
+Search history logging cost on the request path: inline INSERT vs buffer.
+
+Times ``--records`` calls of ``DatabaseService.create_search_history``
+(one INSERT + commit each, what ``/ideas/generate`` used to do) against
+``SearchHistoryBuffer.record`` (enqueue only), then how long the buffer's
+writer thread takes to get every queued row into the database.
+
+Usage:
+    python -m benchmarks.bench_search_history --records 2000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks._common import configure_sqlite_env, percentile
+
+configure_sqlite_env()
+
+from sqlalchemy import func, select  # noqa: E402
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.db.init_db import init_db  # noqa: E402
+from app.models.models import SearchHistory, User  # noqa: E402
+from app.services.db_service import DatabaseService  # noqa: E402
+from app.services.search_history_buffer import SearchHistoryBuffer  # noqa: E402
+
+
+def timed_calls(fn, count: int) -> list:
+    samples = []
+    for i in range(count):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def report(label: str, samples: list):
+    print(f"{label:<22} median {statistics.median(samples):9.1f} us  p99 {percentile(samples, 99):9.1f} us")
+
+
+def history_count(user_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return db.scalar(select(func.count(SearchHistory.id)).where(SearchHistory.user_id == user_id))
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=2000)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    inline_user = User(username="history_inline", hashed_password="x", is_active=True)
+    buffered_user = User(username="history_buffered", hashed_password="x", is_active=True)
+    db.add_all([inline_user, buffered_user])
+    db.commit()
+    inline_id, buffered_id = inline_user.id, buffered_user.id
+
+    inline = timed_calls(
+        lambda i: DatabaseService.create_search_history(db, inline_id, f"keyword {i}", "Education", 3),
+        args.records
+    )
+    db.close()
+
+    SearchHistoryBuffer.start()
+    start = time.perf_counter()
+    buffered = timed_calls(
+        lambda i: SearchHistoryBuffer.record(buffered_id, f"keyword {i}", "Education", 3),
+        args.records
+    )
+    while history_count(buffered_id) < args.records - SearchHistoryBuffer.dropped:
+        time.sleep(0.01)
+    drained = time.perf_counter() - start
+    stats = SearchHistoryBuffer.stats()
+    SearchHistoryBuffer.shutdown()
+
+    report("inline INSERT+commit", inline)
+    report("buffer record()", buffered)
+    print(f"all rows written after {drained * 1000:.0f} ms in {stats['flushes']} flushes ({stats['dropped']} dropped)")
+
+
+if __name__ == "__main__":
+    main()
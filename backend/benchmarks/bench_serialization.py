@@ -0,0 +1,113 @@
+"""
+Cost of building a large GET /ideas response: ORM + pydantic vs rows + orjson.
+
+Seeds one user with ``--ideas`` ideas and times producing the response
+body for a single page holding all of them, both the old way (ORM objects
+validated into ``IdeaPage`` and rendered by ``JSONResponse``) and the way
+the endpoint does it now (row dicts from ``get_user_idea_rows`` rendered
+by ``ORJSONResponse``). Query time is included in both; the two bodies
+are checked to decode to the same JSON.
+
+Usage:
+    python -m benchmarks.bench_serialization --ideas 1000 --repeat 20
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from benchmarks._common import configure_sqlite_env
+
+configure_sqlite_env()
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.db.database import SessionLocal, engine  # noqa: E402
+from app.db.init_db import init_db  # noqa: E402
+from app.models.models import Idea, User  # noqa: E402
+from app.schemas.schemas import IdeaPage  # noqa: E402
+from app.services.db_service import DatabaseService  # noqa: E402
+
+
+def seed(user_id: int, count: int):
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Idea), [
+            {
+                "user_id": user_id,
+                "title": f"Idea {i}: AI-Powered Education Platform",
+                "description": "An innovative education solution. " * 6,
+                "business_model": "SaaS subscription model with tiered pricing",
+                "target_audience": "Students, teachers and training departments",
+                "swot_analysis": "Strengths: focus. Weaknesses: scale. Opportunities: B2B. Threats: competition.",
+                "market_potential": "Expected market size of 500 billion USD by 2030",
+                "industry": "Education",
+                "keywords": "ai, education, platform",
+                "is_favorite": i % 7 == 0,
+                "created_at": start + timedelta(seconds=i),
+                "updated_at": start + timedelta(seconds=i),
+            }
+            for i in range(count)
+        ])
+
+
+def pydantic_body(db, user_id: int, limit: int, field) -> bytes:
+    # What FastAPI's serialize_response did for the endpoint before:
+    # validate ORM objects through the response_model, dump to JSON-able
+    # Python, then json.dumps in JSONResponse
+    ideas = DatabaseService.get_user_ideas(db, user_id, limit)
+    value, errors = field.validate({"items": ideas, "next_cursor": None}, {}, loc=("response",))
+    assert not errors, errors
+    return JSONResponse(field.serialize(value, mode="json", by_alias=True)).body
+
+
+def orjson_body(db, user_id: int, limit: int) -> bytes:
+    ideas = DatabaseService.get_user_idea_rows(db, user_id, limit)
+    return ORJSONResponse({"items": ideas, "next_cursor": None}).body
+
+
+def timed(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ideas", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    user = User(username="serialization_bench", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    seed(user.id, args.ideas)
+
+    field = create_response_field(name="response", type_=IdeaPage)
+
+    old = pydantic_body(db, user.id, args.ideas, field)
+    new = orjson_body(db, user.id, args.ideas)
+    assert json.loads(old) == json.loads(new), "response bodies differ"
+
+    pydantic_ms = timed(lambda: (db.expunge_all(), pydantic_body(db, user.id, args.ideas, field)), args.repeat)
+    orjson_ms = timed(lambda: orjson_body(db, user.id, args.ideas), args.repeat)
+    db.close()
+
+    old_median = statistics.median(pydantic_ms)
+    new_median = statistics.median(orjson_ms)
+    print(f"{args.ideas} ideas per response, {len(new) / 1024:.0f} KiB body, median of {args.repeat}")
+    print(f"ORM + pydantic + json:   {old_median:8.2f} ms/response")
+    print(f"rows + orjson:           {new_median:8.2f} ms/response")
+    print(f"speedup:                 {old_median / new_median:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Worker startup cost: import time of ``app.main`` and time to first response.
+
+Import time is measured in fresh interpreters (median of ``--runs``),
+which also report whether importing touched the database and which heavy
+optional stacks (ReportLab, jose, passlib) got loaded; all of these
+should be deferred to first use. Time to first response is measured
+from spawning uvicorn until ``/health`` and then ``/ready`` (first DB
+round trip) answer.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks._common import BACKEND_DIR, configure_sqlite_env, free_port, init_database, start_process, stop_process
+
+HEAVY_MODULES = ["reportlab", "jose", "passlib"]
+
+IMPORT_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+from app.db.database import engine
+from app.db.pool import pool_status
+print(json.dumps({{
+    "import_ms": elapsed * 1000,
+    "db_connects": pool_status(engine).get("connects", 0),
+    "heavy_loaded": [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def probe_import() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def time_to_first_response(port: int) -> dict:
+    start = time.perf_counter()
+    proc = start_process(
+        ["-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        ready_url=f"http://127.0.0.1:{port}/health",
+    )
+    try:
+        health = time.perf_counter() - start
+        httpx.get(f"http://127.0.0.1:{port}/ready").raise_for_status()
+        ready = time.perf_counter() - start
+    finally:
+        stop_process(proc)
+    return {"health_ms": health * 1000, "ready_ms": ready * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    configure_sqlite_env()
+    init_database()
+
+    probes = [probe_import() for _ in range(args.runs)]
+    boots = [time_to_first_response(free_port()) for _ in range(args.runs)]
+
+    print(f"import app.main:          {statistics.median(p['import_ms'] for p in probes):8.1f} ms (median of {args.runs})")
+    print(f"DB connections on import: {max(p['db_connects'] for p in probes)}")
+    print(f"heavy modules on import:  {', '.join(probes[0]['heavy_loaded']) or 'none'}")
+    print(f"spawn -> /health:         {statistics.median(b['health_ms'] for b in boots):8.1f} ms")
+    print(f"spawn -> /ready:          {statistics.median(b['ready_ms'] for b in boots):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Load test: GET /api/v1/ideas latency during a login burst.
+
+Boots the app, then keeps a steady stream of authenticated ``GET /ideas``
+requests running while ``--burst`` concurrent logins are fired halfway
+through. p50/p99 of ``/ideas`` are reported for the quiet phase and the
+burst phase; with bcrypt off the request path they should stay flat.
+
+Usage:
+    python -m benchmarks.load_login_burst --burst 200 --duration 10
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks._common import (
+    configure_sqlite_env,
+    free_port,
+    percentile,
+    register_and_login,
+    start_app,
+    stop_process,
+)
+
+
+async def reader(client: httpx.AsyncClient, token: str, stop_at: float, samples: list):
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        response = await client.get("/api/v1/ideas/", headers=headers)
+        response.raise_for_status()
+        samples.append((start, time.perf_counter() - start))
+
+
+async def login_burst(client: httpx.AsyncClient, username: str, burst: int) -> dict:
+    async def one():
+        response = await client.post("/api/v1/auth/login", params={"username": username, "password": "benchmark"})
+        return response.status_code
+
+    codes = await asyncio.gather(*[one() for _ in range(burst)])
+    return {code: codes.count(code) for code in set(codes)}
+
+
+async def run(base_url: str, token: str, username: str, burst: int, duration: float, readers: int):
+    samples = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=httpx.Limits(max_connections=burst + readers)) as client:
+        start = time.perf_counter()
+        stop_at = start + duration
+        reader_tasks = [asyncio.create_task(reader(client, token, stop_at, samples)) for _ in range(readers)]
+
+        await asyncio.sleep(duration / 2)
+        burst_start = time.perf_counter()
+        codes = await login_burst(client, username, burst)
+        burst_end = time.perf_counter()
+
+        await asyncio.gather(*reader_tasks)
+
+    quiet = [latency for started, latency in samples if started < burst_start]
+    during = [latency for started, latency in samples if burst_start <= started <= burst_end]
+    return quiet, during, codes, burst_end - burst_start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--burst", type=int, default=200, help="concurrent logins")
+    parser.add_argument("--readers", type=int, default=8, help="concurrent /ideas readers")
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    configure_sqlite_env()
+    port = free_port()
+    app = start_app(port)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        username = "bench_login"
+        token = register_and_login(base_url, username)
+
+        quiet, during, codes, burst_time = asyncio.run(
+            run(base_url, token, username, args.burst, args.duration, args.readers)
+        )
+
+        print(f"login burst:  {args.burst} logins in {burst_time:.2f} s, status codes {codes}")
+        for label, samples in (("quiet", quiet), ("burst", during)):
+            print(
+                f"/ideas {label}: n={len(samples):>5}  "
+                f"p50={percentile(samples, 50) * 1000:7.1f} ms  "
+                f"p99={percentile(samples, 99) * 1000:7.1f} ms"
+            )
+    finally:
+        stop_process(app)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Stub OpenAI-compatible LLM server for offline load tests.
+
+Answers ``POST /v1/chat/completions`` with a canned idea after a
+configurable delay, so the HTTP provider can be exercised without
+network access or API keys.
+
+Usage:
+    python -m benchmarks.stub_llm_server --port 9100 --latency-ms 500
+"""
+import argparse
+import asyncio
+import itertools
+import json
+
+from fastapi import FastAPI
+
+LATENCY_MS = 500
+_counter = itertools.count(1)
+
+app = FastAPI(title="Stub LLM")
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(payload: dict):
+    await asyncio.sleep(LATENCY_MS / 1000)
+    n = next(_counter)
+    idea = {
+        "title": f"Stub Idea {n}",
+        "description": "A stubbed business idea used for load testing.",
+        "business_model": "Subscription",
+        "target_audience": "Benchmark harnesses",
+        "swot_analysis": "Strengths: fast. Weaknesses: fictional.",
+        "market_potential": "Unlimited, in theory",
+    }
+    return {
+        "id": f"chatcmpl-stub-{n}",
+        "object": "chat.completion",
+        "model": payload.get("model", "stub"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(idea)},
+                "finish_reason": "stop",
+            }
+        ],
+    }
+
+
+def main():
+    global LATENCY_MS
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Stub OpenAI-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=int, default=LATENCY_MS)
+    args = parser.parse_args()
+
+    LATENCY_MS = args.latency_ms
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
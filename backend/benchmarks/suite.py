@@ -0,0 +1,317 @@
+"""
+Endpoint load-test and regression suite.
+
+Seeds a database (a throwaway SQLite file by default, or ``--database-url``
+for a PostgreSQL stand-in), boots ``app.main:app`` under uvicorn with the
+mock AI provider, and drives every router (auth, ideas, pdf, analytics)
+at ``--concurrency``. Reports throughput and p50/p95/p99 per endpoint.
+
+Results are compared with a JSON baseline; the run fails (exit 1) when an
+endpoint's p95 grows, or its throughput drops, by more than
+``--threshold``, or when any request errors. ``--update-baseline`` writes
+the current run as the new baseline. Baselines are machine specific:
+record one per environment (see benchmarks/baselines/).
+
+Usage:
+    python -m benchmarks.suite --concurrency 10 --requests 200
+    python -m benchmarks.suite --only ideas,analytics --threshold 0.25
+    python -m benchmarks.suite --update-baseline
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+from benchmarks._common import BACKEND_DIR, configure_sqlite_env, free_port, percentile, start_app, stop_process
+
+DEFAULT_BASELINE = os.path.join(BACKEND_DIR, "benchmarks", "baselines", "suite_sqlite.json")
+PASSWORD = "benchmark"
+INDUSTRIES = ["Education", "Healthcare", "Finance", "Retail", "Logistics"]
+
+
+class Scenario:
+    """
+    One endpoint under load. ``build(i, ctx)`` returns the request kwargs
+    for the i-th call; ``scale`` shrinks the request count for expensive
+    endpoints (bcrypt, PDF rendering).
+    """
+
+    def __init__(self, name: str, group: str, method: str, build, scale: float = 1.0, auth: bool = True):
+        self.name = name
+        self.group = group
+        self.method = method
+        self.build = build
+        self.scale = scale
+        self.auth = auth
+
+
+def idea_id(i: int, ctx: dict) -> int:
+    ids = ctx["idea_ids"]
+    return ids[i % len(ids)]
+
+
+SCENARIOS = [
+    # auth
+    Scenario("POST /auth/register", "auth", "POST",
+             lambda i, ctx: {"url": "/api/v1/auth/register", "json": {"username": f"suite_new_{ctx['run']}_{i}", "password": PASSWORD}},
+             scale=0.1, auth=False),
+    Scenario("POST /auth/login", "auth", "POST",
+             lambda i, ctx: {"url": "/api/v1/auth/login", "params": {"username": ctx["username"], "password": PASSWORD}},
+             scale=0.1, auth=False),
+    Scenario("POST /auth/verify-token", "auth", "POST",
+             lambda i, ctx: {"url": "/api/v1/auth/verify-token", "params": {"token": ctx["token"]}}, auth=False),
+    # ideas
+    Scenario("POST /ideas/generate", "ideas", "POST",
+             lambda i, ctx: {"url": "/api/v1/ideas/generate", "json": {"keywords": f"suite {ctx['run']} {i}", "industry": INDUSTRIES[i % 5], "num_ideas": 3}},
+             scale=0.5),
+    Scenario("GET /ideas", "ideas", "GET", lambda i, ctx: {"url": "/api/v1/ideas/", "params": {"limit": 20}}),
+    Scenario("GET /ideas/search", "ideas", "GET", lambda i, ctx: {"url": "/api/v1/ideas/search", "params": {"q": "platform subscription"}}),
+    Scenario("GET /ideas/{id}", "ideas", "GET", lambda i, ctx: {"url": f"/api/v1/ideas/{idea_id(i, ctx)}"}),
+    Scenario("PUT /ideas/{id}", "ideas", "PUT",
+             lambda i, ctx: {"url": f"/api/v1/ideas/{idea_id(i, ctx)}", "json": {"market_potential": f"Revised {i}"}}),
+    Scenario("POST /ideas/{id}/favorite", "ideas", "POST", lambda i, ctx: {"url": f"/api/v1/ideas/{idea_id(i, ctx)}/favorite"}),
+    # pdf
+    Scenario("GET /pdf/templates", "pdf", "GET", lambda i, ctx: {"url": "/api/v1/pdf/templates"}),
+    Scenario("GET /pdf/export/{id}", "pdf", "GET", lambda i, ctx: {"url": f"/api/v1/pdf/export/{idea_id(i, ctx)}"}, scale=0.1),
+    Scenario("POST /pdf/export-multiple", "pdf", "POST",
+             lambda i, ctx: {"url": "/api/v1/pdf/export-multiple", "json": ctx["idea_ids"][:10]}, scale=0.05),
+    # analytics
+    Scenario("GET /analytics/user", "analytics", "GET", lambda i, ctx: {"url": "/api/v1/analytics/user"}),
+    Scenario("GET /analytics/platform", "analytics", "GET", lambda i, ctx: {"url": "/api/v1/analytics/platform"}),
+    Scenario("GET /analytics/user/industries", "analytics", "GET", lambda i, ctx: {"url": "/api/v1/analytics/user/industries"}),
+    Scenario("GET /analytics/user/favorites", "analytics", "GET", lambda i, ctx: {"url": "/api/v1/analytics/user/favorites"}),
+    Scenario("GET /analytics/user/trends", "analytics", "GET", lambda i, ctx: {"url": "/api/v1/analytics/user/trends"}),
+]
+
+
+def seed(users: int, ideas_per_user: int):
+    """Create users (sharing one password hash) and their ideas directly in the database"""
+    from sqlalchemy import insert
+
+    from app.db.database import engine
+    from app.db.init_db import init_db
+    from app.models.models import Idea, SearchHistory, User
+    from app.services.auth_service import AuthService
+
+    init_db()
+    hashed = AuthService.hash_password(PASSWORD)
+    start = datetime.utcnow() - timedelta(days=30)
+    with engine.begin() as conn:
+        user_ids = [
+            conn.execute(insert(User).values(username=f"suite_user_{u}", hashed_password=hashed, is_active=True)).inserted_primary_key[0]
+            for u in range(users)
+        ]
+        for user_id in user_ids:
+            conn.execute(insert(Idea), [
+                {
+                    "user_id": user_id,
+                    "title": f"Idea {n}: {INDUSTRIES[n % 5]} platform",
+                    "description": f"A subscription platform for {INDUSTRIES[n % 5].lower()} teams",
+                    "business_model": "Subscription",
+                    "target_audience": "Small businesses",
+                    "swot_analysis": "Strengths: focus. Weaknesses: scale.",
+                    "market_potential": "Large",
+                    "industry": INDUSTRIES[n % 5],
+                    "keywords": "platform, subscription",
+                    "is_favorite": n % 7 == 0,
+                    "created_at": start + timedelta(minutes=n),
+                    "updated_at": start + timedelta(minutes=n),
+                }
+                for n in range(ideas_per_user)
+            ])
+            conn.execute(insert(SearchHistory), [
+                {"user_id": user_id, "keywords": "platform", "industry": INDUSTRIES[n % 5], "num_ideas": 3, "created_at": start + timedelta(hours=n)}
+                for n in range(20)
+            ])
+
+
+async def run_round(client: httpx.AsyncClient, scenario: Scenario, ctx: dict, offset: int, requests: int, concurrency: int) -> dict:
+    headers = {"Authorization": f"Bearer {ctx['token']}"} if scenario.auth else {}
+    latencies, errors = [], {}
+    counter = iter(range(offset, offset + requests))
+
+    async def worker():
+        for i in counter:
+            kwargs = scenario.build(i, ctx)
+            start = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, headers=headers, **kwargs)
+                await response.aread()
+                code = response.status_code
+            except httpx.HTTPError as e:
+                code = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            if not isinstance(code, int) or code >= 400:
+                errors[str(code)] = errors.get(str(code), 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(min(concurrency, requests))])
+    wall = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "throughput_rps": round(requests / wall, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "errors": errors,
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, ctx: dict, requests: int, concurrency: int, rounds: int) -> dict:
+    """
+    One untimed warmup round, then ``rounds`` timed rounds. Each metric is
+    the median over the rounds, which keeps noisy single rounds (GC, other
+    processes on the box) from tripping the regression check.
+    """
+    await run_round(client, scenario, ctx, 0, min(requests, concurrency), concurrency)
+    results = [
+        await run_round(client, scenario, ctx, (n + 1) * requests, requests, concurrency)
+        for n in range(rounds)
+    ]
+    errors = {}
+    for result in results:
+        for code, count in result["errors"].items():
+            errors[code] = errors.get(code, 0) + count
+    return {
+        "requests": requests * rounds,
+        **{key: statistics.median(r[key] for r in results) for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")},
+        "errors": errors,
+    }
+
+
+async def run_suite(base_url: str, scenarios: list, requests: int, concurrency: int, rounds: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as client:
+        response = await client.post("/api/v1/auth/login", params={"username": "suite_user_0", "password": PASSWORD})
+        response.raise_for_status()
+        ctx = {"run": int(time.time()), "username": "suite_user_0", "token": response.json()["access_token"]}
+        page = await client.get("/api/v1/ideas/", params={"limit": 100}, headers={"Authorization": f"Bearer {ctx['token']}"})
+        page.raise_for_status()
+        ctx["idea_ids"] = [idea["id"] for idea in page.json()["items"]]
+
+        results = {}
+        for scenario in scenarios:
+            count = max(1, int(requests * scenario.scale))
+            results[scenario.name] = await run_scenario(client, scenario, ctx, count, concurrency, rounds)
+            print_row(scenario.name, results[scenario.name])
+        return results
+
+
+def print_row(name: str, result: dict):
+    errors = sum(result["errors"].values())
+    print(
+        f"{name:<34} {result['requests']:>6} {result['throughput_rps']:>9.1f} "
+        f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} {errors:>6}"
+    )
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Return human-readable regressions against ``baseline``"""
+    regressions = []
+    for name, result in results.items():
+        if result["errors"]:
+            regressions.append(f"{name}: errors {result['errors']}")
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {result['p95_ms']:.2f} ms vs baseline {base['p95_ms']:.2f} ms")
+        if result["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {result['throughput_rps']:.1f} rps vs baseline {base['throughput_rps']:.1f} rps")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint and round (before per-endpoint scaling)")
+    parser.add_argument("--rounds", type=int, default=3, help="timed rounds per endpoint; metrics are the median")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--ideas-per-user", type=int, default=500)
+    parser.add_argument("--only", help="comma-separated routers: auth,ideas,pdf,analytics")
+    parser.add_argument("--database-url", help="run against this database instead of a fresh SQLite file (must be empty)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative regression (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+        os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+        database = args.database_url.split("@")[-1]
+    else:
+        database = configure_sqlite_env()
+
+    groups = set(args.only.split(",")) if args.only else None
+    scenarios = [s for s in SCENARIOS if groups is None or s.group in groups]
+
+    print(f"seeding {args.users} users x {args.ideas_per_user} ideas ({database})...")
+    seed(args.users, args.ideas_per_user)
+
+    port = free_port()
+    app = start_app(port, env={
+        "AI_PROVIDER": "mock",
+        "LOG_LEVEL": "WARNING",
+        # One user drives all PDF exports; measure rendering, not the per-user cap
+        "PDF_JOBS_PER_USER": str(args.concurrency),
+        # Few users generate back to back; measure generation, not the rate limit
+        "GENERATION_RATE_PER_MINUTE": "0",
+    })
+    try:
+        print(f"{'endpoint':<34} {'reqs':>6} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>6}")
+        results = asyncio.run(run_suite(f"http://127.0.0.1:{port}", scenarios, args.requests, args.concurrency, args.rounds))
+    finally:
+        stop_process(app)
+
+    run = {
+        "meta": {
+            "recorded_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "database": "sqlite" if not args.database_url else args.database_url.split(":")[0],
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "rounds": args.rounds,
+            "users": args.users,
+            "ideas_per_user": args.ideas_per_user,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(run, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --update-baseline to record one")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nREGRESSIONS (threshold {args.threshold:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nno regressions against {args.baseline} (threshold {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
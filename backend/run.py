@@ -1,10 +1,54 @@
+import argparse
+import os
+
 import uvicorn
+from app.core.config import settings
+from app.db.init_db import init_db
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run the API server. With more than one worker (or a request budget per "
+                    "worker) a preloaded master forks the workers; SIGHUP restarts them one "
+                    "at a time, SIGTERM stops them gracefully."
+    )
+    parser.add_argument("--host", default=settings.BACKEND_HOST)
+    parser.add_argument("--port", type=int, default=settings.BACKEND_PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY,
+                        help="worker processes (WEB_CONCURRENCY)")
+    parser.add_argument("--max-requests", type=int, default=settings.WORKER_MAX_REQUESTS,
+                        help="recycle a worker after this many requests, 0 to never (WORKER_MAX_REQUESTS)")
+    parser.add_argument("--max-requests-jitter", type=int, default=settings.WORKER_MAX_REQUESTS_JITTER,
+                        help="random extra requests per worker (WORKER_MAX_REQUESTS_JITTER)")
+    parser.add_argument("--graceful-timeout", type=float, default=settings.WORKER_GRACEFUL_TIMEOUT_SECONDS,
+                        help="seconds in-flight requests get on stop or restart")
+    parser.add_argument("--boot-timeout", type=float, default=settings.WORKER_BOOT_TIMEOUT_SECONDS,
+                        help="seconds a new worker gets to warm up during a rolling restart")
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=False,
-        log_level="info"
-    )
\ No newline at end of file
+    args = parse_args()
+    # Schema creation is an explicit step (python -m app.db.init_db);
+    # the runner does it before serving
+    init_db()
+    if (args.workers > 1 or args.max_requests > 0) and hasattr(os, "fork"):
+        from app.server import PreforkServer
+
+        PreforkServer(
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            max_requests=args.max_requests,
+            max_requests_jitter=args.max_requests_jitter,
+            graceful_timeout=args.graceful_timeout,
+            boot_timeout=args.boot_timeout,
+            log_level=args.log_level,
+        ).run()
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host=args.host,
+            port=args.port,
+            reload=False,
+            log_level=args.log_level
+        )
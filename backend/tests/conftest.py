@@ -0,0 +1,69 @@
+"""
+Tests run against a throwaway SQLite database, so they can be executed
+offline from the ``backend`` directory:
+
+    python -m pytest -q
+
+Settings are read on import, so the database is configured here, before
+any test module imports ``app``.
+"""
+import os
+import tempfile
+
+import pytest
+
+fd, DB_PATH = tempfile.mkstemp(prefix="test_", suffix=".db")
+os.close(fd)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    from app.db.init_db import init_db
+
+    init_db()
+    yield
+    os.remove(DB_PATH)
+
+
+@pytest.fixture
+def user_id() -> int:
+    """A fresh user per test, so tests don't see each other's ideas"""
+    from app.db.database import SessionLocal
+    from app.models.models import User
+
+    db = SessionLocal()
+    try:
+        user = User(username=f"test_{os.urandom(6).hex()}", hashed_password="x", is_active=True)
+        db.add(user)
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client():
+    """API client; startup hooks are not run, so no background jobs start"""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(user_id) -> dict:
+    """Bearer token headers for the ``user_id`` user"""
+    from app.db.database import SessionLocal
+    from app.models.models import User
+    from app.services.auth_service import AuthService
+
+    db = SessionLocal()
+    try:
+        username = db.get(User, user_id).username
+    finally:
+        db.close()
+    token = AuthService.create_access_token(data={"sub": username})
+    return {"Authorization": f"Bearer {token}"}
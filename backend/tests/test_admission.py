@@ -0,0 +1,153 @@
+"""
+Generation admission control: per-user token buckets, the concurrency
+cap with its FIFO queue, queue timeouts and slot hand-over.
+"""
+import asyncio
+from collections import deque
+
+import pytest
+
+from app.core.config import settings
+from app.services.admission import GenerationAdmission, GenerationRejected, MemoryBucketStore
+
+
+@pytest.fixture(autouse=True)
+def admission(monkeypatch):
+    """Fresh admission state with small, test-sized limits"""
+    monkeypatch.setattr(settings, "GENERATION_RATE_PER_MINUTE", 60.0)
+    monkeypatch.setattr(settings, "GENERATION_BURST", 10.0)
+    monkeypatch.setattr(settings, "GENERATION_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "GENERATION_MAX_QUEUE", 1)
+    monkeypatch.setattr(settings, "GENERATION_QUEUE_TIMEOUT_SECONDS", 5.0)
+    monkeypatch.setattr(GenerationAdmission, "_active", 0)
+    monkeypatch.setattr(GenerationAdmission, "_waiters", deque())
+    for counter in ("admitted", "rate_limited", "rejected_busy", "timed_out", "store_errors"):
+        monkeypatch.setattr(GenerationAdmission, counter, 0)
+    monkeypatch.setattr(GenerationAdmission, "_store", MemoryBucketStore())
+    return GenerationAdmission
+
+
+async def settle():
+    """Let queued acquire() calls reach their wait"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_memory_bucket_refills_at_rate():
+    async def run():
+        store = MemoryBucketStore()
+        assert await store.take("user", 10, rate=1.0, capacity=10) == 0
+        # Empty: 4 tokens are 4 seconds away, and nothing is taken
+        assert await store.take("user", 4, rate=1.0, capacity=10) == pytest.approx(4, abs=0.1)
+        await store.refund("user", 3, rate=1.0, capacity=10)
+        assert await store.take("user", 3, rate=1.0, capacity=10) == 0
+
+    asyncio.run(run())
+
+
+def test_rate_limit_is_weighted_by_ideas(admission):
+    async def run():
+        for _ in range(2):
+            (await admission.acquire(1, 5)).release()
+        with pytest.raises(GenerationRejected) as rejected:
+            await admission.acquire(1, 5)
+        assert rejected.value.detail == "Generation rate limit exceeded"
+        assert rejected.value.retry_after >= 1
+        # Buckets are per user
+        (await admission.acquire(2, 5)).release()
+
+    asyncio.run(run())
+    assert admission.stats()["rate_limited"] == 1
+
+
+def test_oversized_request_costs_a_full_bucket(admission):
+    async def run():
+        (await admission.acquire(1, 50)).release()
+        with pytest.raises(GenerationRejected):
+            await admission.acquire(1, 1)
+
+    asyncio.run(run())
+
+
+def test_full_queue_rejects_without_spending_tokens(admission, monkeypatch):
+    monkeypatch.setattr(settings, "GENERATION_BURST", 15.0)
+
+    async def run():
+        running = await admission.acquire(1, 5)
+        queued = asyncio.ensure_future(admission.acquire(2, 5))
+        await settle()
+
+        with pytest.raises(GenerationRejected) as rejected:
+            await admission.acquire(1, 5)
+        assert rejected.value.detail == "Too many generations in progress, please retry"
+
+        running.release()
+        (await queued).release()
+        # Still 10 of 15 tokens: the busy rejection took none
+        (await admission.acquire(1, 10)).release()
+
+    asyncio.run(run())
+    assert admission.stats()["rejected_busy"] == 1
+
+
+def test_queue_timeout_refunds_tokens(admission, monkeypatch):
+    monkeypatch.setattr(settings, "GENERATION_QUEUE_TIMEOUT_SECONDS", 0.05)
+
+    async def run():
+        running = await admission.acquire(1, 5)
+        with pytest.raises(GenerationRejected) as rejected:
+            await admission.acquire(1, 5)
+        assert rejected.value.detail == "Timed out waiting for a generation slot"
+        assert not admission._waiters
+        running.release()
+        # The timed-out request's 5 tokens were given back
+        (await admission.acquire(1, 5)).release()
+
+    asyncio.run(run())
+    assert admission.stats()["timed_out"] == 1
+    assert admission.stats()["rate_limited"] == 0
+
+
+def test_release_hands_the_slot_to_the_next_waiter_in_order(admission, monkeypatch):
+    monkeypatch.setattr(settings, "GENERATION_MAX_QUEUE", 2)
+
+    async def run():
+        first = await admission.acquire(1, 1)
+        second = asyncio.ensure_future(admission.acquire(2, 1))
+        await settle()
+        third = asyncio.ensure_future(admission.acquire(3, 1))
+        await settle()
+        assert admission.stats()["waiting"] == 2
+
+        first.release()
+        second_ticket = await second
+        await settle()
+        assert not third.done()
+        assert admission.stats()["active"] == 1
+
+        # release() is idempotent: a second call must not free another slot
+        second_ticket.release()
+        second_ticket.release()
+        third_ticket = await third
+        assert admission.stats()["active"] == 1
+
+        third_ticket.release()
+        assert admission.stats()["active"] == 0
+
+    asyncio.run(run())
+    assert admission.stats()["admitted"] == 3
+
+
+def test_cancelled_waiter_leaves_the_queue(admission):
+    async def run():
+        running = await admission.acquire(1, 1)
+        queued = asyncio.ensure_future(admission.acquire(2, 1))
+        await settle()
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert admission.stats()["waiting"] == 0
+        running.release()
+        assert admission.stats()["active"] == 0
+
+    asyncio.run(run())
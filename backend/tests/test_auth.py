@@ -0,0 +1,24 @@
+"""
+Account deactivation: the deactivated user's tokens are refused.
+"""
+from app.db.database import SessionLocal
+from app.models.models import User
+
+
+def test_deactivated_user_is_refused(client, auth_headers, user_id):
+    # Resolve the user once so it is in the auth cache
+    assert client.get("/api/v1/ideas/", headers=auth_headers).status_code == 200
+
+    response = client.post("/api/v1/auth/deactivate", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == {"message": "Account deactivated"}
+
+    response = client.get("/api/v1/ideas/", headers=auth_headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Inactive user"
+
+    db = SessionLocal()
+    try:
+        assert db.get(User, user_id).is_active is False
+    finally:
+        db.close()
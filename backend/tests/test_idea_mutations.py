@@ -0,0 +1,130 @@
+"""
+Concurrent single-idea mutations: toggles and updates racing on the same
+idea must not lose each other's writes (the scenario of
+``benchmarks.bench_idea_mutations``, with updates in the mix).
+"""
+import threading
+from collections import Counter
+
+from sqlalchemy import func, select
+
+from app.db.database import SessionLocal
+from app.models.models import Idea, IndustryStats
+from app.schemas.schemas import IdeaCreate
+from app.services.db_service import DatabaseService
+
+THREADS = 4
+CALLS = 25
+INDUSTRIES = ["Finance", "Education", "Social"]
+
+
+def create_idea(user_id: int, industry: str) -> int:
+    db = SessionLocal()
+    try:
+        idea = DatabaseService.create_ideas_bulk(db, user_id, [
+            IdeaCreate(title="Original", description="Original description", industry=industry)
+        ])[0]
+        return idea.id
+    finally:
+        db.close()
+
+
+def run_threads(*targets):
+    """Run every target in its own thread and re-raise the first failure"""
+    errors = []
+
+    def guarded(target):
+        try:
+            target()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=guarded, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def in_session(fn, *args):
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+def industry_counts() -> dict:
+    db = SessionLocal()
+    try:
+        DatabaseService.fold_stats_deltas(db)
+        rollup = dict(db.execute(select(IndustryStats.industry, IndustryStats.idea_count)).all())
+        actual = dict(db.execute(select(Idea.industry, func.count()).group_by(Idea.industry)).all())
+        return {industry: (rollup.get(industry, 0), actual.get(industry, 0)) for industry in INDUSTRIES}
+    finally:
+        db.close()
+
+
+def test_concurrent_toggles_and_updates_keep_every_write(user_id):
+    idea_id = create_idea(user_id, "Finance")
+    results = Counter()
+    written = set()
+    lock = threading.Lock()
+
+    def toggler():
+        for _ in range(CALLS):
+            idea = in_session(DatabaseService.toggle_favorite, idea_id, user_id)
+            with lock:
+                results[idea["is_favorite"]] += 1
+
+    def updater(thread: int):
+        def run():
+            for call in range(CALLS):
+                changes = {
+                    "title": f"Title {thread}-{call}",
+                    "description": f"Description {thread}-{call}",
+                    "industry": INDUSTRIES[(thread + call) % len(INDUSTRIES)]
+                }
+                idea = in_session(DatabaseService.update_idea, idea_id, user_id, changes)
+                assert idea["title"] == changes["title"]
+                with lock:
+                    written.add((changes["title"], changes["description"], changes["industry"]))
+        return run
+
+    run_threads(*[toggler for _ in range(THREADS)], *[updater(thread) for thread in range(THREADS)])
+
+    final = in_session(DatabaseService.get_idea_by_id, idea_id, user_id)
+
+    # Toggles are totally ordered: their results alternate, and no update
+    # wrote back a stale flag
+    toggles = THREADS * CALLS
+    assert results[True] - results[False] == toggles % 2
+    assert final.is_favorite == bool(toggles % 2)
+
+    # The fields come from one update, not a mix of several
+    assert (final.title, final.description, final.industry) in written
+
+    # Every industry move reached the rollups
+    for industry, (rollup, actual) in industry_counts().items():
+        assert rollup == actual, industry
+
+
+def test_concurrent_toggles_of_many_ideas(user_id):
+    idea_ids = [create_idea(user_id, "Education") for _ in range(THREADS)]
+
+    def toggler(offset: int):
+        def run():
+            # Each thread toggles every idea, starting at a different one
+            for call in range(CALLS):
+                idea_id = idea_ids[(offset + call) % len(idea_ids)]
+                in_session(DatabaseService.toggle_favorite, idea_id, user_id)
+        return run
+
+    run_threads(*[toggler(offset) for offset in range(THREADS)])
+
+    # Every idea was toggled THREADS * CALLS / len(idea_ids) times
+    expected = bool(THREADS * CALLS // len(idea_ids) % 2)
+    for idea_id in idea_ids:
+        assert in_session(DatabaseService.get_idea_by_id, idea_id, user_id).is_favorite == expected
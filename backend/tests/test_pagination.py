@@ -0,0 +1,118 @@
+"""
+Keyset pagination of ``GET /api/v1/ideas/``: walking ``next_cursor`` visits
+every idea exactly once, newest first, including ideas that share a
+``created_at`` (bulk inserts), and malformed cursors are a 400.
+"""
+import base64
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.core.pagination import encode_cursor
+from app.db.database import SessionLocal
+from app.models.models import Idea
+from app.schemas.schemas import IdeaCreate
+from app.services.db_service import DatabaseService
+
+
+def insert_ideas(user_id: int, count: int, created_at: datetime = None) -> list:
+    """Insert ideas in one statement, all with ``created_at`` when given"""
+    rows = [{"user_id": user_id, "title": f"Idea {n}"} for n in range(count)]
+    if created_at is not None:
+        for row in rows:
+            row["created_at"] = created_at
+    db = SessionLocal()
+    try:
+        ids = list(db.scalars(insert(Idea).returning(Idea.id, sort_by_parameter_order=True), rows))
+        db.commit()
+        return ids
+    finally:
+        db.close()
+
+
+def expected_order(user_id: int) -> list:
+    db = SessionLocal()
+    try:
+        return list(db.scalars(
+            select(Idea.id).where(Idea.user_id == user_id).order_by(Idea.created_at.desc(), Idea.id.desc())
+        ))
+    finally:
+        db.close()
+
+
+def walk(client, headers, limit: int) -> list:
+    """Follow next_cursor to the end; returns every page's ids"""
+    pages = []
+    cursor = None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/ideas/", params=params, headers=headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert 0 < len(page["items"]) <= limit
+        pages.append([item["id"] for item in page["items"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_walk_visits_every_idea_once_newest_first(client, auth_headers, user_id):
+    db = SessionLocal()
+    try:
+        DatabaseService.create_ideas_bulk(db, user_id, [
+            IdeaCreate(title=f"Bulk {n}", industry="Technology") for n in range(7)
+        ])
+    finally:
+        db.close()
+    # Older ideas, all created in the same instant
+    insert_ideas(user_id, 6, datetime.utcnow() - timedelta(days=1))
+
+    pages = walk(client, auth_headers, limit=4)
+
+    seen = [idea_id for page in pages for idea_id in page]
+    assert len(seen) == len(set(seen)) == 13
+    assert seen == expected_order(user_id)
+    assert [len(page) for page in pages] == [4, 4, 4, 1]
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 5, 6])
+def test_pages_split_ties_on_created_at(client, auth_headers, user_id, limit):
+    now = datetime.utcnow()
+    newer = insert_ideas(user_id, 2, now)
+    tied = insert_ideas(user_id, 5, now - timedelta(hours=1))
+    older = insert_ideas(user_id, 2, now - timedelta(hours=2))
+
+    seen = [idea_id for page in walk(client, auth_headers, limit) for idea_id in page]
+
+    # Ties are ordered by id, newest id first
+    assert seen == sorted(newer, reverse=True) + sorted(tied, reverse=True) + sorted(older, reverse=True)
+
+
+def test_cursor_in_the_middle_of_a_tie(client, auth_headers, user_id):
+    created_at = datetime.utcnow()
+    tied = sorted(insert_ideas(user_id, 4, created_at), reverse=True)
+
+    response = client.get(
+        "/api/v1/ideas/",
+        params={"cursor": encode_cursor(created_at, tied[1])},
+        headers=auth_headers
+    )
+
+    assert [item["id"] for item in response.json()["items"]] == tied[2:]
+    assert response.json()["next_cursor"] is None
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    base64.urlsafe_b64encode(b"[1, 2, 3]").decode(),
+    base64.urlsafe_b64encode(b'["yesterday", 1]').decode(),
+    base64.urlsafe_b64encode(b'{"created_at": 1}').decode(),
+])
+def test_invalid_cursor_is_a_400(client, auth_headers, cursor):
+    response = client.get("/api/v1/ideas/", params={"cursor": cursor}, headers=auth_headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,170 @@
+"""
+In-process search index (SQLite): per-user builds, writes reported while a
+build runs, the DatabaseService write hooks, TTL rebuilds and the
+``next_skip`` pagination of ``/ideas/search``.
+"""
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+
+from app.core import cache
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.models import Idea, User
+from app.schemas.schemas import IdeaCreate
+from app.services.db_service import DatabaseService
+from app.services.search_service import inverted_index
+
+
+def create_ideas(user_id: int, *titles: str) -> list:
+    db = SessionLocal()
+    try:
+        ideas = DatabaseService.create_ideas_bulk(db, user_id, [
+            IdeaCreate(title=title, industry="Technology") for title in titles
+        ])
+        return [idea.id for idea in ideas]
+    finally:
+        db.close()
+
+
+def create_user() -> int:
+    db = SessionLocal()
+    try:
+        user = User(username=f"search_{time.time_ns()}", hashed_password="x", is_active=True)
+        db.add(user)
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def search(user_id: int, query: str) -> list:
+    db = SessionLocal()
+    try:
+        return [idea_id for idea_id, _ in inverted_index.search(db, user_id, query)]
+    finally:
+        db.close()
+
+
+def in_session(fn, *args):
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+class WriteDuringBuild:
+    """Session stand-in that runs ``write`` once the build has read its rows"""
+
+    def __init__(self, db, write):
+        self.db = db
+        self.write = write
+
+    def execute(self, stmt):
+        rows = self.db.execute(stmt).all()
+        self.write()
+        return rows
+
+
+def test_build_ranks_the_users_ideas(user_id):
+    solar, garden, _ = create_ideas(user_id, "Solar garden lights", "Garden planner", "Pet sitter")
+    other_user_ideas = create_ideas(create_user(), "Garden robot")
+
+    # Title matches weigh the same, so the shorter document ranks first
+    assert search(user_id, "garden") == [garden, solar]
+    assert search(user_id, "solar garden") == [solar, garden]
+    assert search(user_id, "the") == []
+    assert not set(search(user_id, "robot")) & set(other_user_ideas)
+
+
+def test_writes_during_a_build_are_replayed(user_id):
+    kept, removed = create_ideas(user_id, "Bike repair", "Bike rental")
+
+    def write():
+        in_session(DatabaseService.update_idea, kept, user_id, {"title": "Zebra crossing"})
+        in_session(DatabaseService.delete_idea, removed, user_id)
+
+    db = SessionLocal()
+    try:
+        # The build's SELECT saw the old rows; the writes came after it
+        inverted_index.search(WriteDuringBuild(db, write), user_id, "bike")
+    finally:
+        db.close()
+
+    assert search(user_id, "zebra") == [kept]
+    assert search(user_id, "bike") == []
+
+
+def test_write_hooks_keep_a_built_index_current(user_id):
+    first, second, third = create_ideas(user_id, "Coffee cart", "Coffee roaster", "Tea shop")
+    assert sorted(search(user_id, "coffee")) == [first, second]
+
+    [fourth] = create_ideas(user_id, "Coffee subscription")
+    assert sorted(search(user_id, "coffee")) == [first, second, fourth]
+
+    in_session(DatabaseService.update_idea, first, user_id, {"title": "Juice bar"})
+    assert sorted(search(user_id, "coffee")) == [second, fourth]
+    assert search(user_id, "juice") == [first]
+
+    in_session(DatabaseService.delete_idea, second, user_id)
+    assert search(user_id, "coffee") == [fourth]
+
+    updated = in_session(DatabaseService.bulk_update_ideas, user_id, [third, fourth], {"keywords": "beverage"})
+    assert sorted(updated) == [third, fourth]
+    assert sorted(search(user_id, "beverage")) == [third, fourth]
+    # Fields that were not changed stay indexed
+    assert search(user_id, "tea") == [third]
+
+    in_session(DatabaseService.bulk_delete_ideas, user_id, [first, third])
+    assert search(user_id, "beverage") == [fourth]
+    assert search(user_id, "juice") == []
+
+
+def test_index_is_rebuilt_after_its_ttl(user_id, monkeypatch):
+    [listed] = create_ideas(user_id, "Kayak tours")
+    assert search(user_id, "kayak") == [listed]
+
+    # Written by another process: no hook reports it to this index
+    db = SessionLocal()
+    try:
+        unreported = db.execute(
+            insert(Idea).values(user_id=user_id, title="Kayak rental").returning(Idea.id)
+        ).scalar_one()
+        db.commit()
+    finally:
+        db.close()
+    assert search(user_id, "kayak") == [listed]
+
+    later = time.time() + settings.SEARCH_INDEX_TTL_SECONDS + 1
+    monkeypatch.setattr(cache, "time", SimpleNamespace(time=lambda: later))
+    assert sorted(search(user_id, "kayak")) == [listed, unreported]
+
+
+def test_search_endpoint_pages_with_next_skip(client, auth_headers, user_id):
+    created = create_ideas(user_id, *[f"Drone idea {n}" for n in range(5)], "Unrelated")
+
+    seen = []
+    skip = 0
+    while skip is not None:
+        response = client.get(
+            "/api/v1/ideas/search",
+            params={"q": "drone", "skip": skip, "limit": 2},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen.extend(item["id"] for item in page["items"])
+        skip = page["next_skip"]
+
+    assert len(seen) == len(set(seen)) == 5
+    assert set(seen) == set(created[:5])
+    # A last page that is exactly full has no next page
+    response = client.get(
+        "/api/v1/ideas/search",
+        params={"q": "drone", "skip": 3, "limit": 2},
+        headers=auth_headers
+    )
+    assert response.json()["next_skip"] is None